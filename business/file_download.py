@@ -0,0 +1,204 @@
+##############################################################################
+#
+#    OSIS stands for Open Student Information System. It's an application
+#    designed to manage the core business of higher education institutions,
+#    such as universities, faculties, institutes and professional schools.
+#    The core business involves the administration of students, teachers,
+#    courses, programs and so on.
+#
+#    Copyright (C) 2015-2018 Université catholique de Louvain (http://www.uclouvain.be)
+#
+#    This program is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    A copy of this license - GNU General Public License - is available
+#    at the root of the source code of this program.  If not,
+#    see http://www.gnu.org/licenses/.
+#
+##############################################################################
+import base64
+import codecs
+import json
+import re
+import tempfile
+
+CHUNK_SIZE = 64 * 1024
+# Content arriving before the file name is kept in memory up to this size, then spooled to disk
+SPOOL_MAX_SIZE = 1024 * 1024
+
+CONTENT_KEY = 'content'
+NAME_KEY = 'name'
+
+_STRING_TOKEN = re.compile(r'\\.|"', re.S)
+_STRING_ESCAPE = re.compile(r'\\(?:u[0-9A-Fa-f]{0,4}|.)?', re.S)
+_NOT_BASE64 = re.compile(r'[^A-Za-z0-9+/]')
+
+
+def _unescape(raw):
+    return json.loads('"' + raw + '"', strict=False)
+
+
+class Base64StreamDecoder:
+    """
+    Decode base64 text received in arbitrary pieces of a raw JSON string. JSON escapes are decoded first,
+    then padding and non-alphabet characters (the line breaks of wrapped base64) are ignored.
+    """
+
+    def __init__(self):
+        # Raw text not decoded yet: the last base64 characters of an incomplete quantum, then an escape
+        # cut by the end of the previous piece
+        self.pending = ''
+
+    def decode(self, raw):
+        raw = self.pending + raw
+        end = len(raw)
+        last_escape = None
+        for last_escape in _STRING_ESCAPE.finditer(raw):
+            pass
+        if last_escape is not None and last_escape.end() == end and _is_incomplete_escape(last_escape.group()):
+            end = last_escape.start()
+        data = _NOT_BASE64.sub('', _unescape(raw[:end]))
+        cut = len(data) - len(data) % 4
+        self.pending = data[cut:] + raw[end:]
+        return base64.b64decode(data[:cut])
+
+    def flush(self):
+        raw, self.pending = self.pending, ''
+        data = _NOT_BASE64.sub('', _unescape(raw))
+        return base64.b64decode(data + '=' * (-len(data) % 4)) if len(data) > 1 else b''
+
+
+def _is_incomplete_escape(escape):
+    return len(escape) == 1 or escape[1] == 'u' and len(escape) < 6
+
+
+def iter_top_level_strings(text_chunks, streamed_key=CONTENT_KEY):
+    """
+    Read a JSON object from text chunks and yield (key, value) for its top-level string values.
+    The value of streamed_key is not buffered: it is yielded as several (key, raw_piece) events,
+    raw pieces still containing JSON escapes. Nested objects and arrays are skipped.
+    """
+    depth = 0
+    expecting_key = False
+    key = None
+    in_string = False
+    string_is_key = False
+    raw = []
+    carry = ''
+    for chunk in text_chunks:
+        chunk = carry + chunk
+        carry = ''
+        i = 0
+        while i < len(chunk):
+            if in_string:
+                start = scan = i
+                match = _STRING_TOKEN.search(chunk, scan)
+                while match is not None and match.group() != '"':
+                    scan = match.end()
+                    match = _STRING_TOKEN.search(chunk, scan)
+                if match is None:
+                    # A backslash left alone at the end of the chunk escapes the first character of the next one
+                    i = len(chunk) - 1 if chunk.endswith('\\') and scan < len(chunk) else len(chunk)
+                    carry = chunk[i:]
+                    piece = chunk[start:i]
+                    i = len(chunk)
+                else:
+                    piece = chunk[start:match.start()]
+                    i = match.end()
+                    in_string = False
+                streamed = depth == 1 and not string_is_key and key == streamed_key
+                if streamed and piece:
+                    yield key, piece
+                elif not streamed:
+                    raw.append(piece)
+                if not in_string:
+                    if string_is_key:
+                        key = json.loads('"' + ''.join(raw) + '"')
+                    elif depth == 1 and key != streamed_key:
+                        yield key, json.loads('"' + ''.join(raw) + '"')
+                    raw = []
+                continue
+            char = chunk[i]
+            i += 1
+            if char == '"':
+                in_string = True
+                string_is_key = depth == 1 and expecting_key
+            elif char in '{[':
+                depth += 1
+                expecting_key = char == '{' and depth == 1
+            elif char in '}]':
+                depth -= 1
+            elif char == ':' and depth == 1:
+                expecting_key = False
+            elif char == ',' and depth == 1:
+                expecting_key = True
+
+
+class FileDownload:
+    """
+    Read an OSIS file document ({"name": ..., "content": <base64>, ...}) from a streamed response
+    without holding the whole file in memory.
+    """
+
+    def __init__(self, response, chunk_size=CHUNK_SIZE):
+        self.response = response
+        decoder = codecs.getincrementaldecoder('utf-8')()
+        self._events = iter_top_level_strings(
+            decoder.decode(chunk) for chunk in response.iter_content(chunk_size=chunk_size)
+        )
+        self._first_piece = None
+        self._spool = None
+        self.name = None
+        self._read_until_content()
+
+    def _read_until_content(self):
+        for key, value in self._events:
+            if key == NAME_KEY:
+                self.name = value
+            elif key == CONTENT_KEY:
+                if self.name is not None:
+                    self._first_piece = value
+                    return
+                self._spool_content(value)
+                return
+
+    def _spool_content(self, first_piece):
+        # The name comes after the content: keep the decoded content aside until the name is known
+        self._spool = tempfile.SpooledTemporaryFile(max_size=SPOOL_MAX_SIZE)
+        decoder = Base64StreamDecoder()
+        self._spool.write(decoder.decode(first_piece))
+        for key, value in self._events:
+            if key == CONTENT_KEY:
+                self._spool.write(decoder.decode(value))
+            elif key == NAME_KEY:
+                self.name = value
+        self._spool.write(decoder.flush())
+        self._spool.seek(0)
+
+    def iter_content(self):
+        try:
+            if self._spool is not None:
+                yield from iter(lambda: self._spool.read(CHUNK_SIZE), b'')
+                return
+            if self._first_piece is None:
+                return
+            decoder = Base64StreamDecoder()
+            yield decoder.decode(self._first_piece)
+            for key, value in self._events:
+                if key == CONTENT_KEY:
+                    yield decoder.decode(value)
+            yield decoder.flush()
+        finally:
+            self.close()
+
+    def close(self):
+        if self._spool is not None:
+            self._spool.close()
+        self.response.close()
@@ -0,0 +1,69 @@
+##############################################################################
+#
+#    OSIS stands for Open Student Information System. It's an application
+#    designed to manage the core business of higher education institutions,
+#    such as universities, faculties, institutes and professional schools.
+#    The core business involves the administration of students, teachers,
+#    courses, programs and so on.
+#
+#    Copyright (C) 2015-2018 Université catholique de Louvain (http://www.uclouvain.be)
+#
+#    This program is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    A copy of this license - GNU General Public License - is available
+#    at the root of the source code of this program.  If not,
+#    see http://www.gnu.org/licenses/.
+#
+##############################################################################
+import functools
+import unicodedata
+
+# Number of distinct user inputs whose folded form is remembered
+FOLD_CACHE_SIZE = 4096
+
+
+def fold(value):
+    """ Lowercase value and strip its accents: 'Théologie' -> 'theologie' """
+    normalized = unicodedata.normalize('NFKD', value or '')
+    return ''.join(c for c in normalized if not unicodedata.combining(c)).lower()
+
+
+@functools.lru_cache(maxsize=FOLD_CACHE_SIZE)
+def fold_input(value):
+    """ fold() for values typed by users, which come back on every validation of the same form """
+    return fold(value).strip()
+
+
+def edit_distance(first, second):
+    """ Levenshtein distance: number of single character insertions, deletions or substitutions """
+    if len(first) < len(second):
+        first, second = second, first
+    previous_row = list(range(len(second) + 1))
+    for i, first_char in enumerate(first, start=1):
+        current_row = [i]
+        for j, second_char in enumerate(second, start=1):
+            current_row.append(min(
+                previous_row[j] + 1,
+                current_row[j - 1] + 1,
+                previous_row[j - 1] + (first_char != second_char),
+            ))
+        previous_row = current_row
+    return previous_row[-1]
+
+
+def rank_by_similarity(value, candidates):
+    """
+    Sort (original, folded) candidates from the closest to the farthest of value, ties kept in their order,
+    and return the originals
+    """
+    folded_value = fold_input(value)
+    ranked = sorted(candidates, key=lambda candidate: edit_distance(folded_value, candidate[1]))
+    return [original for original, folded in ranked]
@@ -0,0 +1,165 @@
+##############################################################################
+#
+#    OSIS stands for Open Student Information System. It's an application
+#    designed to manage the core business of higher education institutions,
+#    such as universities, faculties, institutes and professional schools.
+#    The core business involves the administration of students, teachers,
+#    courses, programs and so on.
+#
+#    Copyright (C) 2015-2018 Université catholique de Louvain (http://www.uclouvain.be)
+#
+#    This program is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    A copy of this license - GNU General Public License - is available
+#    at the root of the source code of this program.  If not,
+#    see http://www.gnu.org/licenses/.
+#
+##############################################################################
+import contextlib
+import logging
+import os
+import time
+import zipfile
+from concurrent.futures import ProcessPoolExecutor, wait, as_completed, FIRST_COMPLETED
+
+from django.conf import settings
+from django.utils.text import get_valid_filename
+
+from continuing_education.business import pdf_filler
+from continuing_education.models.enums.admission_state_choices import REGISTRATION_SUBMITTED
+from continuing_education.services import osis_fetch
+from continuing_education.views import api
+
+logger = logging.getLogger(settings.DEFAULT_LOGGER)
+
+PAGE_SIZE = 100
+# PDFs handed to the workers and not written yet, before the next page is fetched
+MAX_PENDING = 2 * PAGE_SIZE
+
+
+def generate_registration_pdfs(request, output, acronym=None, academic_year=None, processes=None, progress=None):
+    """
+    Render the SIC form of every submitted registration of a training and/or an academic year.
+    output is a path ending with .zip, or a directory the PDFs are written into.
+    progress(done, total) is called after each PDF.
+    Return throughput statistics.
+    """
+    if not acronym and not academic_year:
+        raise ValueError("A training acronym or an academic year is required")
+    started_at = time.time()
+    timings = {'fetch': 0}
+    pages = _timed(iter_submitted_registration_pages(request, acronym=acronym, academic_year=academic_year), timings)
+    done = 0
+    with _output_writer(output) as write, ProcessPoolExecutor(
+            max_workers=processes, initializer=pdf_filler.get_registration_template
+    ) as executor:
+        for name, pdf, total in _render_pages(executor, pages):
+            write(name, pdf)
+            done += 1
+            if progress:
+                progress(done, total)
+    elapsed = time.time() - started_at
+    stats = {
+        'count': done,
+        'seconds': round(elapsed, 3),
+        'fetch_seconds': round(timings['fetch'], 3),
+        'pdfs_per_second': round(done / elapsed, 2) if elapsed else None,
+    }
+    logger.info("Registration PDFs generated in %s: %s", output, stats)
+    return stats
+
+
+def iter_submitted_registration_pages(request, acronym=None, academic_year=None):
+    """
+    Page through the submitted registrations and fetch the details of each page concurrently.
+    Yield (count, registrations) for each page, count being the total number of registrations.
+    """
+    params = {'state': REGISTRATION_SUBMITTED, 'limit': PAGE_SIZE}
+    if acronym:
+        params['formation'] = acronym
+    if academic_year:
+        params['academic_year'] = academic_year
+    offset = 0
+    while True:
+        page = api.get_registrations(request, offset=offset, **params)
+        results = page['results']
+        details = osis_fetch.run([
+            (registration['uuid'], osis_fetch.Fetch(_registration_fetch(request, registration['uuid'])))
+            for registration in results
+        ])
+        yield page['count'], [details[registration['uuid']] for registration in results]
+        offset += len(results)
+        if not results or offset >= page['count']:
+            break
+
+
+def _registration_fetch(request, uuid):
+    return lambda: api.get_registration(request, uuid)
+
+
+def _render_pages(executor, pages):
+    """
+    Submit the registrations of each page to the workers as soon as it arrives,
+    and yield (filename, pdf, total) as the PDFs are rendered, in completion order.
+    """
+    pending = {}
+    total = 0
+    for total, registrations in pages:
+        for registration in registrations:
+            future = executor.submit(pdf_filler.write_fillable_pdf, pdf_filler.get_data(registration))
+            pending[future] = _filename(registration)
+        # Write what is ready, and only wait for the workers when too many PDFs are in flight
+        while pending:
+            ready, _ = wait(pending, timeout=0 if len(pending) <= MAX_PENDING else None, return_when=FIRST_COMPLETED)
+            if not ready:
+                break
+            for future in ready:
+                yield pending.pop(future), future.result(), total
+    for future in as_completed(list(pending)):
+        yield pending.pop(future), future.result(), total
+
+
+def _timed(iterable, timings):
+    """ Add the time spent waiting for each item of iterable to timings['fetch'] """
+    iterator = iter(iterable)
+    while True:
+        started_at = time.time()
+        try:
+            item = next(iterator)
+        except StopIteration:
+            return
+        finally:
+            timings['fetch'] += time.time() - started_at
+        yield item
+
+
+def _filename(registration):
+    # Same name as the single download, suffixed to keep homonyms apart
+    return "{}_{}.pdf".format(get_valid_filename("{}_{}".format(
+        registration['person_information']['person']['last_name'],
+        registration['formation']['education_group']['acronym']
+    )), str(registration['uuid'])[:8])
+
+
+@contextlib.contextmanager
+def _output_writer(output):
+    """ Yield a write(name, pdf) function adding the PDFs to a ZIP file or to a directory """
+    if str(output).endswith('.zip'):
+        with zipfile.ZipFile(output, 'w', compression=zipfile.ZIP_DEFLATED) as zip_file:
+            yield zip_file.writestr
+        return
+    os.makedirs(output, exist_ok=True)
+
+    def write_file(name, pdf):
+        with open(os.path.join(output, name), 'wb') as f:
+            f.write(pdf)
+
+    yield write_file
@@ -25,15 +25,24 @@
 ##############################################################################
 import datetime
 import io
+import re
+import threading
 
-import pypdftk
 from django.conf import settings
+from pdfrw import PdfArray, PdfDict, PdfName, PdfReader, PdfWriter
 
-CHECKBOX_NOT_SELECTED = 'Off'
-CHECKBOX_SELECTED = 'Yes'
+CHECKBOX_NOT_SELECTED = PdfName('Off')
+CHECKBOX_SELECTED = PdfName('Yes')
 
 REGISTRATION_TEMPLATE_PATH = '/continuing_education/business/templates/form_SIC_times.pdf'
 
+# Annotation flag of widgets that must not be displayed nor printed
+HIDDEN_FLAG = 2
+# Space kept between a text field border and its value, and smallest size a value is shrunk to when too long
+TEXT_PADDING = 2
+MIN_FONT_SIZE = 5
+_DEFAULT_APPEARANCE = re.compile(r'^(?P<before>.*?)/(?P<font>[^\s/]+)\s+(?P<size>[\d.]+)\s+Tf(?P<after>.*)$', re.S)
+
 EMPTY_VALUE = '-'
 
 MARITAL_STATUS = ["SINGLE", "MARRIED", "WIDOWED", "DIVORCED", "SEPARATED", "LEGAL_COHABITANT"]
@@ -124,12 +133,136 @@ def _build_empty_address():
 
 
 def write_fillable_pdf(data_dict):
+    """
+    Fill the registration template with data_dict and return the flattened PDF as bytes.
+    Every field is drawn into the page content and the form itself is dropped from the output.
+    """
+    template = get_registration_template()
+    writer = PdfWriter()
+    for page in template.pages:
+        writer.addpage(_flatten_page(page, template, data_dict))
     buf = io.BytesIO()
-    input_pdf_path = "{}{}".format(settings.BASE_DIR, REGISTRATION_TEMPLATE_PATH)
-    pdf = pypdftk.fill_form(input_pdf_path, datas=data_dict, flatten=True)
-    with open(pdf, mode='rb') as f:
-        buf.write(f.read())
-        return buf.getvalue()
+    writer.write(buf)
+    return buf.getvalue()
+
+
+class PdfTemplate:
+    """ A fillable PDF parsed once, with its widgets indexed by field name """
+
+    def __init__(self, path):
+        reader = PdfReader(path)
+        # Resolve every object up front so that concurrent fills only ever read the parsed template
+        reader.read_all()
+        self.pages = reader.pages
+        self.fonts = reader.Root.AcroForm.DR.Font if reader.Root.AcroForm and reader.Root.AcroForm.DR else PdfDict()
+        self.fields = {
+            annot.T.decode(): annot
+            for page in self.pages for annot in page.Annots or []
+            if annot.Subtype == PdfName.Widget and annot.T
+        }
+
+
+_template = None
+_template_lock = threading.Lock()
+
+
+def get_registration_template():
+    global _template
+    if _template is None:
+        with _template_lock:
+            if _template is None:
+                _template = PdfTemplate("{}{}".format(settings.BASE_DIR, REGISTRATION_TEMPLATE_PATH))
+    return _template
+
+
+def _flatten_page(page, template, data_dict):
+    xobjects = PdfDict(page.Resources.XObject or {})
+    drawing = []
+    annots = []
+    for annot in page.Annots or []:
+        if annot.Subtype != PdfName.Widget:
+            annots.append(annot)
+            continue
+        appearance = _field_appearance(annot, template, data_dict)
+        if appearance is None or int(annot.F or 0) & HIDDEN_FLAG:
+            continue
+        name = PdfName('FlattenedField{}'.format(len(drawing)))
+        xobjects[name] = appearance
+        x, y = float(annot.Rect[0]), float(annot.Rect[1])
+        drawing.append('q 1 0 0 1 {:.3f} {:.3f} cm {} Do Q'.format(x, y, name))
+
+    resources = PdfDict(page.Resources)
+    resources.XObject = xobjects
+    contents = page.Contents if isinstance(page.Contents, PdfArray) else PdfArray([page.Contents])
+    overlay = PdfDict(stream='\n'.join(drawing))
+    # The original content may leave the graphics state modified: isolate it before drawing the fields
+    return PdfDict(
+        page,
+        Annots=PdfArray(annots) if annots else None,
+        Resources=resources,
+        Contents=PdfArray([PdfDict(stream='q\n')] + list(contents) + [PdfDict(stream='\nQ\n'), overlay]),
+    )
+
+
+def _field_appearance(annot, template, data_dict):
+    name = annot.T.decode()
+    if annot.FT == PdfName.Btn:
+        states = annot.AP.N if annot.AP else None
+        if name in data_dict:
+            state = PdfName(str(data_dict[name]).lstrip('/'))
+        else:
+            state = annot.AS or annot.V
+        if states is None or not isinstance(states, PdfDict) or states.stream is not None:
+            return states
+        return states[state] if state in states else states[CHECKBOX_NOT_SELECTED]
+    if name not in data_dict:
+        return annot.AP.N if annot.AP else None
+    return _text_appearance(annot, template, data_dict[name])
+
+
+def _text_appearance(annot, template, value):
+    value = '' if value is None else str(value)
+    x1, y1, x2, y2 = (float(coordinate) for coordinate in annot.Rect)
+    width, height = abs(x2 - x1), abs(y2 - y1)
+    default_appearance = annot.DA.decode() if annot.DA else '0 g /Helv 0 Tf'
+    match = _DEFAULT_APPEARANCE.match(default_appearance)
+    font_name = match.group('font')
+    font = template.fonts[PdfName(font_name)]
+    text = value.encode('cp1252', errors='replace')
+    font_size = float(match.group('size')) or height - 2 * TEXT_PADDING
+    text_width = _text_width(font, text) * font_size
+    if text_width > width - 2 * TEXT_PADDING:
+        font_size = max(MIN_FONT_SIZE, font_size * (width - 2 * TEXT_PADDING) / text_width)
+    baseline = (height - font_size * 0.7) / 2
+    content = '/Tx BMC q BT {}/{} {:.2f} Tf{} {} {:.3f} Td ({}) Tj ET Q EMC'.format(
+        match.group('before'), font_name, font_size, match.group('after'), TEXT_PADDING, baseline,
+        _escape(text)
+    )
+    return PdfDict(
+        Type=PdfName.XObject,
+        Subtype=PdfName.Form,
+        BBox=PdfArray([0, 0, width, height]),
+        Resources=PdfDict(Font=PdfDict({PdfName(font_name): font})),
+        stream=content,
+    )
+
+
+def _text_width(font, text):
+    """ Width of text in a simple font, in text space units for a font size of 1 """
+    if font is None or font.Widths is None:
+        return len(text) * 0.5
+    first_char = int(font.FirstChar or 0)
+    widths = font.Widths
+    total = 0
+    for char in text:
+        index = char - first_char
+        total += float(widths[index]) if 0 <= index < len(widths) else 500
+    return total / 1000
+
+
+def _escape(text):
+    # pdfrw writes streams as latin-1 text: keep every byte and escape the string delimiters
+    return text.decode('latin-1').replace('\\', '\\\\').replace('(', '\\(').replace(')', '\\)')
 
 
 def _checkbox_selection_status(value, expected_value):
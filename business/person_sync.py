@@ -0,0 +1,71 @@
+##############################################################################
+#
+#    OSIS stands for Open Student Information System. It's an application
+#    designed to manage the core business of higher education institutions,
+#    such as universities, faculties, institutes and professional schools.
+#    The core business involves the administration of students, teachers,
+#    courses, programs and so on.
+#
+#    Copyright (C) 2015-2018 Université catholique de Louvain (http://www.uclouvain.be)
+#
+#    This program is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    A copy of this license - GNU General Public License - is available
+#    at the root of the source code of this program.  If not,
+#    see http://www.gnu.org/licenses/.
+#
+##############################################################################
+import threading
+from collections import Counter
+
+from django.core.exceptions import ObjectDoesNotExist
+
+from base.models.person import Person
+
+# Fields of the OSIS person payload that do not exist on the local Person
+IGNORED_FIELDS = ('uuid', 'birth_date')
+
+_stats_lock = threading.Lock()
+_counters = Counter()
+
+
+def _count(name):
+    with _stats_lock:
+        _counters[name] += 1
+
+
+def sync_person(user, remote_person):
+    """
+    Copy the OSIS person data onto the local Person of user and return it.
+    The row is only written when one of its values differs from the OSIS ones.
+    """
+    try:
+        person = user.person
+    except ObjectDoesNotExist:
+        return None
+    changes = {
+        field: value for field, value in remote_person.items()
+        if field not in IGNORED_FIELDS and getattr(person, field) != value
+    }
+    if not changes:
+        _count('skipped')
+        return person
+    # A queryset update, as before: saving the instance would also rewrite the fields that did not change
+    Person.objects.filter(pk=person.pk).update(**changes)
+    for field, value in changes.items():
+        setattr(person, field, value)
+    _count('applied')
+    return person
+
+
+def get_stats():
+    with _stats_lock:
+        return dict(_counters)
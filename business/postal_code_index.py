@@ -0,0 +1,170 @@
+##############################################################################
+#
+#    OSIS stands for Open Student Information System. It's an application
+#    designed to manage the core business of higher education institutions,
+#    such as universities, faculties, institutes and professional schools.
+#    The core business involves the administration of students, teachers,
+#    courses, programs and so on.
+#
+#    Copyright (C) 2015-2018 Université catholique de Louvain (http://www.uclouvain.be)
+#
+#    This program is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    A copy of this license - GNU General Public License - is available
+#    at the root of the source code of this program.  If not,
+#    see http://www.gnu.org/licenses/.
+#
+##############################################################################
+import json
+import logging
+import os
+import tempfile
+import threading
+import time
+from collections import defaultdict
+
+from django.conf import settings
+
+from continuing_education.business.normalization import fold, fold_input, rank_by_similarity
+from continuing_education.services.reference import CitiesService
+
+logger = logging.getLogger(settings.DEFAULT_LOGGER)
+
+REFRESH_INTERVAL = getattr(settings, 'CONTINUING_EDUCATION_POSTAL_CODES_REFRESH', 24 * 60 * 60)
+# JSON file of [postal_code, city] pairs used to answer before the first load from the reference API
+SNAPSHOT_PATH = getattr(settings, 'CONTINUING_EDUCATION_POSTAL_CODES_SNAPSHOT', None)
+PAGE_SIZE = 1000
+
+_index = None
+_loaded_at = None
+_refresh_lock = threading.Lock()
+_snapshot_lock = threading.Lock()
+
+
+class PostalCodeIndex:
+    """
+    Belgian postal codes with the names of their cities. Each name is folded (lowercased, accents stripped)
+    once, when the index is built, and kept next to the original.
+    """
+
+    def __init__(self, cities):
+        self.cities = defaultdict(list)
+        self.folded_cities = defaultdict(set)
+        for postal_code, name in cities:
+            postal_code = _normalize_postal_code(postal_code)
+            folded_name = fold(name)
+            self.cities[postal_code].append((name, folded_name))
+            self.folded_cities[postal_code].add(folded_name)
+        for names in self.cities.values():
+            names.sort()
+
+    def __len__(self):
+        return len(self.cities)
+
+    def __iter__(self):
+        for postal_code, names in self.cities.items():
+            for name, folded_name in names:
+                yield postal_code, name
+
+    def get_cities(self, postal_code):
+        return [name for name, folded_name in self.cities.get(_normalize_postal_code(postal_code), [])]
+
+    def is_compatible(self, postal_code, city):
+        return fold_input(city) in self.folded_cities.get(_normalize_postal_code(postal_code), ())
+
+    def suggest(self, postal_code, city):
+        """ City names of postal_code, the closest to city first """
+        return rank_by_similarity(city, self.cities.get(_normalize_postal_code(postal_code), []))
+
+
+def _normalize_postal_code(postal_code):
+    return str(postal_code).strip()
+
+
+def get_index():
+    """
+    Return the postal code index, or None while it is neither loaded nor available from the snapshot.
+    A stale or missing index is (re)loaded from the reference API in the background.
+    """
+    if _index is None and SNAPSHOT_PATH:
+        _load_snapshot()
+    if _index is None or _loaded_at is None or time.time() - _loaded_at > REFRESH_INTERVAL:
+        _refresh_in_background()
+    return _index
+
+
+def is_loaded():
+    return _index is not None
+
+
+def _load_snapshot():
+    global _index
+    with _snapshot_lock:
+        if _index is not None:
+            return
+        try:
+            with open(SNAPSHOT_PATH) as f:
+                _index = PostalCodeIndex(json.load(f))
+        except (OSError, ValueError) as e:
+            logger.warning("Unable to read the postal codes snapshot %s: %s", SNAPSHOT_PATH, e)
+
+
+def _refresh_in_background():
+    if not _refresh_lock.acquire(blocking=False):
+        return
+    threading.Thread(target=_refresh, daemon=True).start()
+
+
+def _refresh():
+    try:
+        refresh()
+    except Exception as e:
+        logger.warning("Unable to load the postal codes index: %s", e)
+    finally:
+        _refresh_lock.release()
+
+
+def refresh():
+    global _index, _loaded_at
+    cities = []
+    count = None
+    while True:
+        # Loaded outside of any request: the postal codes are the same for every user
+        page = CitiesService.get_cities(person=None, limit=PAGE_SIZE, offset=len(cities))
+        results = page.get('results')
+        cities += [(city.zip_code, city.name) for city in results]
+        if count is None:
+            count = page.get('count')
+        if not results or len(cities) >= count:
+            break
+    if not cities or len(cities) < count:
+        # The reference API failed, maybe in the middle of the pages: keep answering from what is already loaded
+        logger.warning("Incomplete postal codes from the reference API: %s of %s cities", len(cities), count)
+        return
+    _index = PostalCodeIndex(cities)
+    _loaded_at = time.time()
+    if SNAPSHOT_PATH:
+        write_snapshot(_index, SNAPSHOT_PATH)
+
+
+def write_snapshot(index, path):
+    # Written aside then renamed, so another process never reads a partial snapshot
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(os.path.abspath(path)), suffix='.tmp')
+    with os.fdopen(fd, 'w') as f:
+        json.dump(list(index), f)
+    os.replace(tmp_path, path)
+
+
+def get_stats():
+    return {
+        'postal_codes': len(_index) if _index is not None else 0,
+        'age': round(time.time() - _loaded_at) if _loaded_at else None,
+    }
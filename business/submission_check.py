@@ -0,0 +1,150 @@
+##############################################################################
+#
+#    OSIS stands for Open Student Information System. It's an application
+#    designed to manage the core business of higher education institutions,
+#    such as universities, faculties, institutes and professional schools.
+#    The core business involves the administration of students, teachers,
+#    courses, programs and so on.
+#
+#    Copyright (C) 2015-2018 Université catholique de Louvain (http://www.uclouvain.be)
+#
+#    This program is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    A copy of this license - GNU General Public License - is available
+#    at the root of the source code of this program.  If not,
+#    see http://www.gnu.org/licenses/.
+#
+##############################################################################
+import hashlib
+import json
+import threading
+import time
+from collections import Counter, OrderedDict
+
+from django.conf import settings
+from django.core.exceptions import ValidationError
+from django.forms.utils import ErrorList
+from django.utils import translation
+
+from continuing_education.business import postal_code_index
+
+_results = OrderedDict()
+_results_lock = threading.Lock()
+_counters = Counter()
+# (form class, required fields variant) -> FormRules
+_rules = {}
+
+
+def _max_results():
+    return getattr(settings, 'CONTINUING_EDUCATION_SUBMISSION_CHECK_CACHE_SIZE', 1000)
+
+
+def _ttl():
+    """ Seconds a result is kept: the address checks also depend on the postal codes of the reference API """
+    return getattr(settings, 'CONTINUING_EDUCATION_SUBMISSION_CHECK_TTL', 5 * 60)
+
+
+def revision(admission, is_registration=False):
+    """ Hash of the admission content: any change made to the dossier gives a new revision """
+    serialized = json.dumps(admission, sort_keys=True, default=str)
+    # Some error messages are translated when they are built
+    return hashlib.sha1(
+        '{}:{}:{}'.format(translation.get_language(), is_registration, serialized).encode()
+    ).hexdigest()
+
+
+def get_or_check(admission, is_registration, check):
+    """
+    Return check() for this revision of the admission, computing it only the first time within the TTL.
+    check() must return (errors, errors_field), as get_submission_errors does.
+    """
+    key = revision(admission, is_registration)
+    now = time.monotonic()
+    with _results_lock:
+        expires_at, result = _results.get(key, (None, None))
+        if result is not None and expires_at <= now:
+            del _results[key]
+            _counters['expired'] += 1
+            result = None
+        if result is not None:
+            _results.move_to_end(key)
+            _counters['hits'] += 1
+    if result is None:
+        # Checked while the postal code index is not loaded, the addresses depend on single calls to
+        # the reference API: a transient failure must not be remembered
+        cacheable = postal_code_index.is_loaded()
+        result = check()
+        with _results_lock:
+            _counters['misses'] += 1
+            if cacheable:
+                _results[key] = (now + _ttl(), result)
+                while len(_results) > _max_results():
+                    _results.popitem(last=False)
+    errors, errors_field = result
+    return OrderedDict(errors), list(errors_field)
+
+
+class FormRules:
+    """
+    The validation rules of a form class, read once from a form instance, to check plain dicts without
+    building a form for each of them. The fields (with their required flags, validators and labels) come
+    from the form, and the checks involving several fields from its get_cross_field_errors(cleaned_data).
+    clean_<field> methods are not run, they only normalize values; neither is the model validation of a
+    ModelForm, which repeats the checks of its fields.
+    """
+
+    def __init__(self, form):
+        self.form_class = type(form)
+        self.fields = list(form.fields.items())
+        self.labels = {name: form[name].label for name in form.fields}
+
+    def check(self, data):
+        """ Return the errors of form_class(data=data), by field name and in the same order """
+        if data is None:
+            # An unbound form has no errors
+            return OrderedDict()
+        errors = OrderedDict()
+        cleaned_data = {}
+        for name, field in self.fields:
+            try:
+                cleaned_data[name] = field.clean(field.widget.value_from_datadict(data, {}, name))
+            except ValidationError as e:
+                errors[name] = ErrorList(e.error_list)
+        get_cross_field_errors = getattr(self.form_class, 'get_cross_field_errors', None)
+        if get_cross_field_errors:
+            for name, error in get_cross_field_errors(cleaned_data):
+                errors.setdefault(name, ErrorList()).extend(ValidationError(error).error_list)
+                cleaned_data.pop(name, None)
+        return errors
+
+
+def get_rules(form_class, data):
+    """
+    Return the FormRules of form_class for data, built once per form class and set of required fields.
+    Forms whose required fields depend on the data tell them with a get_required_fields(data) method.
+    """
+    get_required_fields = getattr(form_class, 'get_required_fields', None)
+    key = (form_class, tuple(get_required_fields(data)) if get_required_fields else None)
+    rules = _rules.get(key)
+    if rules is None:
+        # Some forms format the values of the dict they are given in place
+        rules = _rules[key] = FormRules(form_class(data=dict(data) if data is not None else None))
+    return rules
+
+
+def clear():
+    with _results_lock:
+        _results.clear()
+
+
+def get_stats():
+    with _results_lock:
+        return dict(_counters, results=len(_results))
@@ -0,0 +1,148 @@
+##############################################################################
+#
+#    OSIS stands for Open Student Information System. It's an application
+#    designed to manage the core business of higher education institutions,
+#    such as universities, faculties, institutes and professional schools.
+#    The core business involves the administration of students, teachers,
+#    courses, programs and so on.
+#
+#    Copyright (C) 2015-2018 Université catholique de Louvain (http://www.uclouvain.be)
+#
+#    This program is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    A copy of this license - GNU General Public License - is available
+#    at the root of the source code of this program.  If not,
+#    see http://www.gnu.org/licenses/.
+#
+##############################################################################
+import logging
+import threading
+import time
+from collections import defaultdict
+
+from django.conf import settings
+
+from continuing_education.business.normalization import fold
+from continuing_education.views import api
+
+logger = logging.getLogger(settings.DEFAULT_LOGGER)
+
+REFRESH_INTERVAL = getattr(settings, 'CONTINUING_EDUCATION_TRAINING_INDEX_REFRESH', 15 * 60)
+PAGE_SIZE = 100
+DEFAULT_LIMIT = 20
+
+RANK_ACRONYM_EXACT = 0
+RANK_ACRONYM_PREFIX = 1
+RANK_TOKEN_PREFIX = 2
+RANK_SUBSTRING = 3
+
+_index = None
+_loaded_at = None
+_refresh_lock = threading.Lock()
+
+
+def _tokenize(value):
+    return [token for token in ''.join(c if c.isalnum() else ' ' for c in fold(value)).split() if token]
+
+
+class TrainingIndex:
+    def __init__(self, trainings):
+        self.trainings = []
+        self.acronyms = []
+        self.texts = []
+        self.prefixes = defaultdict(set)
+        for position, training in enumerate(trainings):
+            education_group = training['education_group']
+            acronym = fold(education_group['acronym'])
+            self.trainings.append(training)
+            self.acronyms.append(acronym)
+            self.texts.append(' '.join([acronym, fold(education_group.get('title'))]))
+            for token in set(_tokenize(education_group['acronym']) + _tokenize(education_group.get('title'))):
+                for length in range(1, len(token) + 1):
+                    self.prefixes[token[:length]].add(position)
+
+    def __len__(self):
+        return len(self.trainings)
+
+    def search(self, query, limit=DEFAULT_LIMIT):
+        tokens = _tokenize(query)
+        if not tokens:
+            positions = range(len(self.trainings))
+        else:
+            positions = set.intersection(*(self.prefixes.get(token, set()) for token in tokens))
+            if len(positions) < limit:
+                positions |= {
+                    position for position, text in enumerate(self.texts)
+                    if all(token in text for token in tokens)
+                }
+        folded_query = fold(query).strip()
+        ranked = sorted(
+            positions,
+            key=lambda position: (self._rank(position, folded_query, tokens), self.acronyms[position])
+        )
+        return [self.trainings[position] for position in ranked[:limit]]
+
+    def _rank(self, position, folded_query, tokens):
+        acronym = self.acronyms[position]
+        if acronym == folded_query:
+            return RANK_ACRONYM_EXACT
+        if folded_query and acronym.startswith(folded_query):
+            return RANK_ACRONYM_PREFIX
+        if all(position in self.prefixes.get(token, ()) for token in tokens):
+            return RANK_TOKEN_PREFIX
+        return RANK_SUBSTRING
+
+
+def search(query, limit=DEFAULT_LIMIT):
+    """
+    Return the active trainings matching query from the local index, or None when the index is not loaded yet.
+    A stale or missing index is (re)loaded in the background.
+    """
+    index = _index
+    if index is None or time.time() - _loaded_at > REFRESH_INTERVAL:
+        _refresh_in_background()
+    return index.search(query, limit) if index is not None else None
+
+
+def _refresh_in_background():
+    if not _refresh_lock.acquire(blocking=False):
+        return
+    threading.Thread(target=_refresh, daemon=True).start()
+
+
+def _refresh():
+    try:
+        refresh()
+    except Exception as e:
+        logger.warning("Unable to load the training index: %s", e)
+    finally:
+        _refresh_lock.release()
+
+
+def refresh():
+    global _index, _loaded_at
+    trainings = []
+    while True:
+        # Loaded outside of any request: the trainings are the same for every user. They are read from OSIS,
+        # the training cache may serve lists up to a day old
+        page = api.fetch_continuing_education_training_list(active=True, limit=PAGE_SIZE, offset=len(trainings))
+        trainings += page['results']
+        if not page['results'] or len(trainings) >= page['count']:
+            break
+    _index = TrainingIndex(trainings)
+    _loaded_at = time.time()
+
+
+def get_stats():
+    return {
+        'trainings': len(_index) if _index is not None else 0,
+        'age': round(time.time() - _loaded_at) if _loaded_at else None,
+    }
@@ -1,9 +1,9 @@
-import unicodedata
-
 from dal import autocomplete
 from django import forms
 from django.utils.translation import gettext_lazy as _
 
+from continuing_education.business import postal_code_index
+from continuing_education.business.normalization import fold, fold_input, rank_by_similarity
 from continuing_education.services.reference import CitiesService
 
 BELGIUM_ISO_CODE = "BE"
@@ -34,31 +34,37 @@ class AddressForm(forms.Form):
 
     def clean(self):
         cleaned_data = super().clean()
+        for field, error in self.get_cross_field_errors(cleaned_data, person=self.person):
+            self.add_error(field, error)
+        return cleaned_data
 
+    @classmethod
+    def get_cross_field_errors(cls, cleaned_data, person=None):
+        """ (field, error) of the checks involving several fields, also run on plain dicts by the submission check """
+        errors = []
         if cleaned_data.get('country') == BELGIUM_ISO_CODE:
             if cleaned_data.get('postal_code') and cleaned_data.get('city'):
-                api_results = CitiesService.get_cities(
-                    person=self.person,
-                    zip_code=cleaned_data.get('postal_code'),
+                possible_cities, compatible = _check_belgian_city(
+                    cleaned_data.get('postal_code'),
+                    cleaned_data.get('city'),
+                    person
                 )
-                cities = api_results.get('results')
 
-                if cities:
-                    if not are_postal_code_and_city_compatible(cities, cleaned_data.get('city').lower()):
-                        self.add_error('postal_code',
-                                       _('Cities available for this belgian postal code %(postal_code)s are : '
-                                         '%(possible_cities)s') % {
-                                           'postal_code': str(cleaned_data.get('postal_code')),
-                                           'possible_cities': ', '.join(city.name for city in cities),
-                                       })
+                if possible_cities:
+                    if not compatible:
+                        errors.append(('postal_code', _(
+                            'Cities available for this belgian postal code %(postal_code)s are : '
+                            '%(possible_cities)s'
+                        ) % {
+                            'postal_code': str(cleaned_data.get('postal_code')),
+                            'possible_cities': ', '.join(possible_cities),
+                        }))
 
                 else:
-                    self.add_error('postal_code',
-                                   _('Postal code (%(postal_code)s) not found in Belgium') % {
-                                       'postal_code': str(cleaned_data.get('postal_code'))
-                                   }
-                                   )
-        return cleaned_data
+                    errors.append(('postal_code', _('Postal code (%(postal_code)s) not found in Belgium') % {
+                        'postal_code': str(cleaned_data.get('postal_code'))
+                    }))
+        return errors
 
     def __init__(self, *args, person=None, **kwargs):
         super(AddressForm, self).__init__(*args, **kwargs)
@@ -84,11 +90,19 @@ class StrictAddressForm(AddressForm):
             self.fields[required_field].required = True
 
 
+def _check_belgian_city(postal_code, city, person):
+    """ Return the city names of postal_code, the closest to city first, and whether city is one of them """
+    index = postal_code_index.get_index()
+    if index is not None and index.get_cities(postal_code):
+        return index.suggest(postal_code, city), index.is_compatible(postal_code, city)
+    # The local index is not loaded yet, or does not know this postal code: ask the reference API for it only
+    cities = CitiesService.get_cities(person=person, zip_code=postal_code).get('results') or []
+    return (
+        rank_by_similarity(city, [(c.name, fold(c.name)) for c in cities]),
+        are_postal_code_and_city_compatible(cities, city.lower())
+    )
+
+
 def are_postal_code_and_city_compatible(cities, city_encoded) -> bool:
-    for city in cities:
-        city_name = city.name.lower()
-        if city_name == city_encoded or \
-                unicodedata.normalize('NFKD', city_name).encode('ascii', 'ignore') == \
-                unicodedata.normalize('NFKD', city_encoded).encode('ascii', 'ignore'):
-            return True
-    return False
+    folded_city = fold_input(city_encoded)
+    return any(fold(city.name) == folded_city for city in cities)
@@ -240,6 +240,12 @@ class StrictAdmissionForm(AdmissionForm):
     def __init__(self, data, **kwargs):
         super().__init__(data=data, **kwargs)
 
+        for required_field in self.get_required_fields(data):
+            self.fields[required_field].required = True
+
+    @staticmethod
+    def get_required_fields(data):
+        """ Fields required for the submission, some of them depending on the chosen formation """
         required_fields = [
             'citizenship',
             'phone_mobile',
@@ -262,8 +268,7 @@ class StrictAdmissionForm(AdmissionForm):
         if formation_info and _has_required_additional_information(formation_info):
             required_fields.append('additional_information')
 
-        for required_field in required_fields:
-            self.fields[required_field].required = True
+        return required_fields
 
 
 def _has_required_additional_information(formation):
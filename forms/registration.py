@@ -143,9 +143,16 @@ class StrictRegistrationForm(RegistrationForm):
 
     def clean(self):
         cleaned_data = super().clean()
+        for field, error in self.get_cross_field_errors(cleaned_data):
+            self.add_error(field, error)
+
+        return cleaned_data
+
+    @classmethod
+    def get_cross_field_errors(cls, cleaned_data):
+        """ One of the identity document numbers is needed: (field, error) pairs, as for AddressForm """
         if not cleaned_data.get('national_registry_number') and \
                 not cleaned_data.get('id_card_number') and \
                 not cleaned_data.get('passport_number'):
-            self.add_error('national_registry_number', 'national_registry_number')
-
-        return cleaned_data
+            return [('national_registry_number', 'national_registry_number')]
+        return []
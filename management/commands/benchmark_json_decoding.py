@@ -0,0 +1,83 @@
+##############################################################################
+#
+#    OSIS stands for Open Student Information System. It's an application
+#    designed to manage the core business of higher education institutions,
+#    such as universities, faculties, institutes and professional schools.
+#    The core business involves the administration of students, teachers,
+#    courses, programs and so on.
+#
+#    Copyright (C) 2015-2018 Université catholique de Louvain (http://www.uclouvain.be)
+#
+#    This program is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    A copy of this license - GNU General Public License - is available
+#    at the root of the source code of this program.  If not,
+#    see http://www.gnu.org/licenses/.
+#
+##############################################################################
+import copy
+import glob
+import io
+import json
+import os
+import timeit
+
+from django.core.management.base import BaseCommand, CommandError
+
+from continuing_education.services import json_decoder
+
+SAMPLE_PAYLOADS = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))),
+    'tests', 'ressources', 'osis_payloads', '*.json'
+)
+
+
+class Command(BaseCommand):
+    help = "Time the decoding of OSIS responses (files holding raw response bodies) with each available decoder"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            'payloads', nargs='*',
+            help="Recorded OSIS response bodies, e.g. saved with curl (default: the anonymized samples of the tests)"
+        )
+        parser.add_argument('--number', type=int, default=1000, help="Number of decodings per measure")
+
+    def handle(self, *args, **options):
+        paths = options['payloads'] or sorted(glob.glob(SAMPLE_PAYLOADS))
+        if not paths:
+            raise CommandError("No payload to decode")
+        for path in paths:
+            with open(path, 'rb') as f:
+                content = f.read()
+            self.stdout.write("{} ({} bytes)".format(os.path.basename(path), len(content)))
+            for name, decode in _candidates(content):
+                seconds = min(timeit.repeat(decode, number=options['number'], repeat=3))
+                self.stdout.write("  {:<40} {:>10.1f} µs".format(name, seconds / options['number'] * 1e6))
+
+
+def _candidates(content):
+    data = json.loads(content)
+    candidates = [
+        ('BytesIO + json.load (previous)', lambda: json.load(io.BytesIO(content))),
+        ('json.loads', lambda: json.loads(content)),
+    ]
+    if json_decoder.orjson is not None:
+        candidates.append(('orjson.loads', lambda: json_decoder.orjson.loads(content)))
+    candidates += [
+        ('configured decoder ({})'.format(_name(json_decoder.get_loads())), lambda: json_decoder.loads(content)),
+        # A request reading a resource again used to get a deep copy of the memoized data, it now decodes it again
+        ('copy.deepcopy of decoded data (previous)', lambda: copy.deepcopy(data)),
+    ]
+    return candidates
+
+
+def _name(func):
+    return "{}.{}".format(getattr(func, '__module__', None) or type(func).__module__, func.__name__)
@@ -0,0 +1,67 @@
+##############################################################################
+#
+#    OSIS stands for Open Student Information System. It's an application
+#    designed to manage the core business of higher education institutions,
+#    such as universities, faculties, institutes and professional schools.
+#    The core business involves the administration of students, teachers,
+#    courses, programs and so on.
+#
+#    Copyright (C) 2015-2018 Université catholique de Louvain (http://www.uclouvain.be)
+#
+#    This program is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    A copy of this license - GNU General Public License - is available
+#    at the root of the source code of this program.  If not,
+#    see http://www.gnu.org/licenses/.
+#
+##############################################################################
+from django.contrib.auth.models import AnonymousUser
+from django.core.management.base import BaseCommand, CommandError
+from django.http import HttpRequest
+
+from continuing_education.business import pdf_batch
+
+
+class Command(BaseCommand):
+    help = "Generate the SIC registration form of every submitted registration of a training or an academic year"
+
+    def add_arguments(self, parser):
+        parser.add_argument('output', help="ZIP file (ending with .zip) or directory the PDFs are written to")
+        parser.add_argument('--acronym', help="Acronym of the training")
+        parser.add_argument('--academic-year', type=int, help="Academic year, e.g. 2019 for 2019-2020")
+        parser.add_argument('--processes', type=int, default=None, help="Number of rendering processes")
+
+    def handle(self, *args, **options):
+        if not options['acronym'] and not options['academic_year']:
+            raise CommandError("--acronym or --academic-year is required")
+        stats = pdf_batch.generate_registration_pdfs(
+            _portal_request(),
+            options['output'],
+            acronym=options['acronym'],
+            academic_year=options['academic_year'],
+            processes=options['processes'],
+            progress=self._show_progress if options['verbosity'] > 0 else None,
+        )
+        self.stdout.write(self.style.SUCCESS(
+            "{count} PDF(s) written to {output} in {seconds}s ({pdfs_per_second} PDF/s), "
+            "{fetch_seconds}s spent fetching registrations".format(output=options['output'], **stats)
+        ))
+
+    def _show_progress(self, done, total):
+        self.stdout.write("\r{}/{}".format(done, total), ending='\n' if done == total else '')
+        self.stdout.flush()
+
+
+def _portal_request():
+    # Without a user, OSIS is called with the portal token
+    request = HttpRequest()
+    request.user = AnonymousUser()
+    return request
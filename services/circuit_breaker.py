@@ -0,0 +1,98 @@
+##############################################################################
+#
+#    OSIS stands for Open Student Information System. It's an application
+#    designed to manage the core business of higher education institutions,
+#    such as universities, faculties, institutes and professional schools.
+#    The core business involves the administration of students, teachers,
+#    courses, programs and so on.
+#
+#    Copyright (C) 2015-2018 Université catholique de Louvain (http://www.uclouvain.be)
+#
+#    This program is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    A copy of this license - GNU General Public License - is available
+#    at the root of the source code of this program.  If not,
+#    see http://www.gnu.org/licenses/.
+#
+##############################################################################
+import threading
+import time
+
+CLOSED = 'closed'
+OPEN = 'open'
+HALF_OPEN = 'half_open'
+# Returned by allow_request to the call let through as the trial of a half open circuit
+TRIAL = 'trial'
+
+
+class CircuitBreaker:
+    """
+    Fails fast once `failure_threshold` consecutive calls failed.
+    After `reset_timeout` seconds a single trial call is let through: it closes the circuit on success
+    and opens it again on failure. A trial that ends with neither (e.g. cancelled) must be released.
+    """
+
+    def __init__(self, failure_threshold, reset_timeout):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.consecutive_failures = 0
+        self.opened_at = None
+        self.trips = 0
+        self.rejected = 0
+        self._trial_running = False
+        self._lock = threading.Lock()
+
+    @property
+    def state(self):
+        if self.opened_at is None:
+            return CLOSED
+        if time.monotonic() - self.opened_at >= self.reset_timeout:
+            return HALF_OPEN
+        return OPEN
+
+    def allow_request(self):
+        with self._lock:
+            state = self.state
+            if state == CLOSED:
+                return True
+            if state == HALF_OPEN and not self._trial_running:
+                self._trial_running = True
+                return TRIAL
+            self.rejected += 1
+            return False
+
+    def record_success(self):
+        with self._lock:
+            self.consecutive_failures = 0
+            self.opened_at = None
+            self._trial_running = False
+
+    def release_trial(self):
+        """ Let another trial through: the current one ended without telling whether OSIS is back """
+        with self._lock:
+            self._trial_running = False
+
+    def record_failure(self):
+        with self._lock:
+            self.consecutive_failures += 1
+            if self._trial_running or self.consecutive_failures >= self.failure_threshold:
+                if self.opened_at is None:
+                    self.trips += 1
+                self.opened_at = time.monotonic()
+            self._trial_running = False
+
+    def get_stats(self):
+        return {
+            'state': self.state,
+            'consecutive_failures': self.consecutive_failures,
+            'trips': self.trips,
+            'rejected': self.rejected,
+        }
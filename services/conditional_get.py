@@ -0,0 +1,130 @@
+##############################################################################
+#
+#    OSIS stands for Open Student Information System. It's an application
+#    designed to manage the core business of higher education institutions,
+#    such as universities, faculties, institutes and professional schools.
+#    The core business involves the administration of students, teachers,
+#    courses, programs and so on.
+#
+#    Copyright (C) 2015-2018 Université catholique de Louvain (http://www.uclouvain.be)
+#
+#    This program is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    A copy of this license - GNU General Public License - is available
+#    at the root of the source code of this program.  If not,
+#    see http://www.gnu.org/licenses/.
+#
+##############################################################################
+import threading
+from collections import Counter, OrderedDict, namedtuple
+
+from django.conf import settings
+
+# Total size of the representations kept to revalidate, in bytes
+STORE_MAX_BYTES = getattr(settings, 'OSIS_CONDITIONAL_GET_STORE_BYTES', 10 * 1024 * 1024)
+NOT_MODIFIED = 304
+
+Representation = namedtuple('Representation', ['etag', 'last_modified', 'content'])
+
+_lock = threading.Lock()
+_stats_lock = threading.Lock()
+_counters = Counter()
+_store = OrderedDict()
+_store_size = 0
+
+
+def _count(name, value=1):
+    with _stats_lock:
+        _counters[name] += value
+
+
+def get_content(key, get, read):
+    """
+    Return the content of a GET to OSIS, revalidating the representation stored under key if there is one.
+    get(headers) sends the request with the extra headers given, read(response) returns the content of a
+    response that is not a 304, or raises.
+    """
+    stored = lookup(key)
+    return resolve(key, stored, get(validators(stored)), read)
+
+
+def lookup(key):
+    with _lock:
+        stored = _store.get(key)
+        if stored is not None:
+            _store.move_to_end(key)
+        return stored
+
+
+def validators(stored):
+    headers = {}
+    if stored is not None and stored.etag:
+        headers['If-None-Match'] = stored.etag
+    if stored is not None and stored.last_modified:
+        headers['If-Modified-Since'] = stored.last_modified
+    return headers
+
+
+def resolve(key, stored, response, read):
+    if stored is not None and response.status_code == NOT_MODIFIED:
+        _count('not_modified')
+        _count('bytes_saved', len(stored.content))
+        return stored.content
+    content = read(response)
+    _count('modified' if stored is not None else 'unconditional')
+    etag, last_modified = response.headers.get('ETag'), response.headers.get('Last-Modified')
+    if etag or last_modified:
+        _remember(key, Representation(etag, last_modified, content))
+    elif stored is not None:
+        forget(key)
+    return content
+
+
+def _remember(key, representation):
+    global _store_size
+    if len(representation.content) > STORE_MAX_BYTES:
+        forget(key)
+        return
+    with _lock:
+        previous = _store.pop(key, None)
+        if previous is not None:
+            _store_size -= len(previous.content)
+        _store[key] = representation
+        _store_size += len(representation.content)
+        while _store_size > STORE_MAX_BYTES:
+            _, evicted = _store.popitem(last=False)
+            _store_size -= len(evicted.content)
+            _count('evictions')
+
+
+def forget(key):
+    global _store_size
+    with _lock:
+        previous = _store.pop(key, None)
+        if previous is not None:
+            _store_size -= len(previous.content)
+
+
+def clear():
+    global _store_size
+    with _lock:
+        _store.clear()
+        _store_size = 0
+
+
+def get_stats():
+    with _stats_lock:
+        stats = dict(_counters)
+    revalidations = stats.get('not_modified', 0) + stats.get('modified', 0)
+    stats['revalidation_hit_rate'] = round(stats.get('not_modified', 0) / revalidations, 3) if revalidations else None
+    stats['stored'] = len(_store)
+    stats['stored_bytes'] = _store_size
+    return stats
@@ -0,0 +1,113 @@
+##############################################################################
+#
+#    OSIS stands for Open Student Information System. It's an application
+#    designed to manage the core business of higher education institutions,
+#    such as universities, faculties, institutes and professional schools.
+#    The core business involves the administration of students, teachers,
+#    courses, programs and so on.
+#
+#    Copyright (C) 2015-2018 Université catholique de Louvain (http://www.uclouvain.be)
+#
+#    This program is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    A copy of this license - GNU General Public License - is available
+#    at the root of the source code of this program.  If not,
+#    see http://www.gnu.org/licenses/.
+#
+##############################################################################
+import logging
+import threading
+import time
+
+from django.conf import settings
+from django.core.cache import caches
+from django.utils import translation
+
+from reference.services.country import CountryService
+
+logger = logging.getLogger(settings.DEFAULT_LOGGER)
+
+CACHE_PREFIX = 'continuing_education:countries'
+PAGE_SIZE = 300
+# After a failed load, countries are looked up one by one for this many seconds before loading them all again
+LOAD_RETRY_DELAY = 5 * 60
+
+# language -> (loaded_at, {iso_code: name})
+_tables = {}
+_load_lock = threading.Lock()
+
+
+def _cache():
+    return caches[getattr(settings, 'CONTINUING_EDUCATION_COUNTRY_CACHE', 'default')]
+
+
+def _ttl():
+    return getattr(settings, 'CONTINUING_EDUCATION_COUNTRY_CACHE_TTL', 7 * 24 * 60 * 60)
+
+
+def _language(person):
+    # Country names are translated by the reference API in the language of the person
+    return getattr(person, 'language', None) or translation.get_language() or settings.LANGUAGE_CODE
+
+
+def get_country_name(person, iso_code):
+    """ Name of the country in the language of person, or None when the reference API does not know it """
+    table = get_countries(person)
+    name = table.get(iso_code)
+    if name is None:
+        name = _fetch_country_name(person, iso_code)
+        if name is not None:
+            table[iso_code] = name
+    return name
+
+
+def get_countries(person):
+    """ Return the {iso_code: name} table of every country, loaded once per language and shared between processes """
+    language = _language(person)
+    entry = _tables.get(language)
+    if entry is not None and time.time() - entry[0] < _ttl():
+        return entry[1]
+    with _load_lock:
+        entry = _tables.get(language)
+        if entry is None or time.time() - entry[0] >= _ttl():
+            table, complete = _load(person, language)
+            loaded_at = time.time() if complete else time.time() - _ttl() + LOAD_RETRY_DELAY
+            entry = _tables[language] = (loaded_at, table)
+    return entry[1]
+
+
+def _load(person, language):
+    key = '{}:{}'.format(CACHE_PREFIX, language)
+    table = _cache().get(key)
+    if table is not None:
+        return table, True
+    table = {}
+    try:
+        while True:
+            page = CountryService.get_countries(person=person, limit=PAGE_SIZE, offset=len(table))
+            table.update((country.iso_code, country.name) for country in page.results)
+            if not page.results or len(table) >= page.count:
+                break
+    except Exception as e:
+        # Countries are then looked up one by one until the next load
+        logger.warning("Unable to load the countries: %s", e)
+        return table, False
+    if not table or len(table) < page.count:
+        # A page came back empty before the end: keep what was read without sharing it, and load again later
+        logger.warning("Only %s of the %s countries were loaded", len(table), page.count)
+        return table, False
+    _cache().set(key, table, timeout=_ttl())
+    return table, True
+
+
+def _fetch_country_name(person, iso_code):
+    results = CountryService.get_countries(person=person, iso_code=iso_code).results
+    return results[0].name if results else None
@@ -0,0 +1,61 @@
+##############################################################################
+#
+#    OSIS stands for Open Student Information System. It's an application
+#    designed to manage the core business of higher education institutions,
+#    such as universities, faculties, institutes and professional schools.
+#    The core business involves the administration of students, teachers,
+#    courses, programs and so on.
+#
+#    Copyright (C) 2015-2018 Université catholique de Louvain (http://www.uclouvain.be)
+#
+#    This program is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    A copy of this license - GNU General Public License - is available
+#    at the root of the source code of this program.  If not,
+#    see http://www.gnu.org/licenses/.
+#
+##############################################################################
+import json
+
+from django.conf import settings
+from django.utils.module_loading import import_string
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+_loads = None
+
+
+def get_loads():
+    """
+    Return the function decoding OSIS responses: OSIS_JSON_DECODER (dotted path to a loads(bytes) callable)
+    when it is set, else orjson.loads when orjson is installed, else json.loads.
+    """
+    global _loads
+    if _loads is None:
+        path = getattr(settings, 'OSIS_JSON_DECODER', None)
+        if path:
+            _loads = import_string(path)
+        else:
+            _loads = orjson.loads if orjson is not None else json.loads
+    return _loads
+
+
+def reset():
+    global _loads
+    _loads = None
+
+
+def loads(content):
+    """ Decode a JSON document given as bytes (as received, without copying it) or str """
+    return get_loads()(content)
@@ -0,0 +1,102 @@
+##############################################################################
+#
+#    OSIS stands for Open Student Information System. It's an application
+#    designed to manage the core business of higher education institutions,
+#    such as universities, faculties, institutes and professional schools.
+#    The core business involves the administration of students, teachers,
+#    courses, programs and so on.
+#
+#    Copyright (C) 2015-2018 Université catholique de Louvain (http://www.uclouvain.be)
+#
+#    This program is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    A copy of this license - GNU General Public License - is available
+#    at the root of the source code of this program.  If not,
+#    see http://www.gnu.org/licenses/.
+#
+##############################################################################
+import asyncio
+import weakref
+
+import httpx
+import requests
+
+from continuing_education.services import osis_http
+
+# httpx clients are bound to the event loop they were first used in
+_clients = weakref.WeakKeyDictionary()
+
+
+def get_client():
+    """ Return the pooled client of the running event loop, sharing the limits configured for osis_http """
+    loop = asyncio.get_running_loop()
+    client = _clients.get(loop)
+    if client is None:
+        client = _clients[loop] = httpx.AsyncClient(
+            limits=httpx.Limits(
+                max_connections=osis_http.POOL_MAXSIZE * osis_http.POOL_CONNECTIONS,
+                max_keepalive_connections=osis_http.POOL_MAXSIZE if osis_http.KEEP_ALIVE else 0,
+            ),
+            headers={'Connection': 'keep-alive' if osis_http.KEEP_ALIVE else 'close'},
+        )
+    return client
+
+
+async def close_client():
+    client = _clients.pop(asyncio.get_running_loop(), None)
+    if client is not None:
+        await client.aclose()
+
+
+async def request(method, url, operation=None, **kwargs):
+    """
+    Async counterpart of osis_http.request, following the same osis_http.RequestPolicy.
+    Connection errors and timeouts are raised as their requests equivalents, so that callers
+    handle failures the same way whichever client they use.
+    """
+    policy = osis_http.RequestPolicy(method, url, operation)
+    connect_timeout, read_timeout = policy.timeout
+    kwargs.setdefault('timeout', httpx.Timeout(read_timeout, connect=connect_timeout))
+    for _ in policy:
+        try:
+            response = await get_client().request(policy.method, url, **kwargs)
+        except httpx.TimeoutException as e:
+            if policy.failed('timeouts'):
+                raise requests.exceptions.Timeout(str(e)) from e
+        except httpx.TransportError as e:
+            if policy.failed('connection_errors'):
+                raise requests.exceptions.ConnectionError(str(e)) from e
+        except httpx.HTTPError:
+            policy.failed()
+            raise
+        except BaseException:
+            policy.interrupted()
+            raise
+        else:
+            if policy.is_final(response):
+                return response
+        await asyncio.sleep(policy.backoff())
+
+
+async def get(url, **kwargs):
+    return await request('GET', url, **kwargs)
+
+
+async def post(url, **kwargs):
+    return await request('POST', url, **kwargs)
+
+
+async def patch(url, **kwargs):
+    return await request('PATCH', url, **kwargs)
+
+
+async def delete(url, **kwargs):
+    return await request('DELETE', url, **kwargs)
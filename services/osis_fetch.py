@@ -0,0 +1,126 @@
+##############################################################################
+#
+#    OSIS stands for Open Student Information System. It's an application
+#    designed to manage the core business of higher education institutions,
+#    such as universities, faculties, institutes and professional schools.
+#    The core business involves the administration of students, teachers,
+#    courses, programs and so on.
+#
+#    Copyright (C) 2015-2018 Université catholique de Louvain (http://www.uclouvain.be)
+#
+#    This program is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    A copy of this license - GNU General Public License - is available
+#    at the root of the source code of this program.  If not,
+#    see http://www.gnu.org/licenses/.
+#
+##############################################################################
+import os
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+
+from django.conf import settings
+from django.utils import translation
+
+MAX_WORKERS = getattr(settings, 'OSIS_FETCH_MAX_WORKERS', 8)
+
+_executor = None
+_executor_pid = None
+_executor_lock = threading.Lock()
+_worker = threading.local()
+
+
+class Fetch:
+    """
+    A call to OSIS that may depend on the results of other fetches.
+    The callable receives the results of its dependencies as keyword arguments named after them.
+    """
+
+    def __init__(self, func, depends_on=()):
+        self.func = func
+        self.depends_on = tuple(depends_on)
+
+
+def run(fetches):
+    """
+    Run an ordered mapping of name -> Fetch and return a dict of name -> result.
+    Independent fetches are executed concurrently, each one starting as soon as its dependencies are resolved.
+    If fetches fail, the exception of the first failing fetch (in declaration order) is raised,
+    as it would have been by calling them one after another.
+    """
+    fetches = OrderedDict(fetches)
+    _check_dependencies(fetches)
+    if getattr(_worker, 'active', False) or MAX_WORKERS <= 1:
+        return _run_sequentially(fetches)
+
+    results = {}
+    errors = {}
+    pending = OrderedDict(fetches)
+    running = {}
+    executor = _get_executor()
+    language = translation.get_language()
+    while pending or running:
+        if not errors:
+            for name, fetch in list(pending.items()):
+                if all(dependency in results for dependency in fetch.depends_on):
+                    kwargs = {dependency: results[dependency] for dependency in fetch.depends_on}
+                    running[executor.submit(_call, fetch.func, kwargs, language)] = name
+                    del pending[name]
+        if not running:
+            break
+        done, _ = wait(running, return_when=FIRST_COMPLETED)
+        for future in done:
+            name = running.pop(future)
+            try:
+                results[name] = future.result()
+            except Exception as e:
+                errors[name] = e
+    for name in fetches:
+        if name in errors:
+            raise errors[name]
+    return results
+
+
+def _run_sequentially(fetches):
+    results = {}
+    for name, fetch in fetches.items():
+        results[name] = fetch.func(**{dependency: results[dependency] for dependency in fetch.depends_on})
+    return results
+
+
+def _check_dependencies(fetches):
+    declared = set()
+    for name, fetch in fetches.items():
+        unknown = [dependency for dependency in fetch.depends_on if dependency not in declared]
+        if unknown:
+            raise ValueError("Fetch '{}' depends on undeclared or later fetches: {}".format(name, ', '.join(unknown)))
+        declared.add(name)
+
+
+def _call(func, kwargs, language):
+    _worker.active = True
+    try:
+        with translation.override(language):
+            return func(**kwargs)
+    finally:
+        _worker.active = False
+
+
+def _get_executor():
+    global _executor, _executor_pid
+    pid = os.getpid()
+    if _executor is None or _executor_pid != pid:
+        with _executor_lock:
+            if _executor is None or _executor_pid != pid:
+                _executor = ThreadPoolExecutor(max_workers=MAX_WORKERS, thread_name_prefix='osis-fetch')
+                _executor_pid = pid
+    return _executor
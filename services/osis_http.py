@@ -0,0 +1,250 @@
+##############################################################################
+#
+#    OSIS stands for Open Student Information System. It's an application
+#    designed to manage the core business of higher education institutions,
+#    such as universities, faculties, institutes and professional schools.
+#    The core business involves the administration of students, teachers,
+#    courses, programs and so on.
+#
+#    Copyright (C) 2015-2018 Université catholique de Louvain (http://www.uclouvain.be)
+#
+#    This program is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    A copy of this license - GNU General Public License - is available
+#    at the root of the source code of this program.  If not,
+#    see http://www.gnu.org/licenses/.
+#
+##############################################################################
+import os
+import random
+import threading
+import time
+from collections import Counter
+from urllib.parse import urlsplit
+
+import requests
+from django.conf import settings
+from requests.adapters import HTTPAdapter
+
+from continuing_education.services.circuit_breaker import TRIAL, CircuitBreaker
+
+# Number of distinct hosts for which a connection pool is kept
+POOL_CONNECTIONS = getattr(settings, 'OSIS_HTTP_POOL_CONNECTIONS', 4)
+# Maximum number of connections kept alive per host
+POOL_MAXSIZE = getattr(settings, 'OSIS_HTTP_POOL_MAXSIZE', 20)
+# When True, a request waits for a free connection instead of opening one above POOL_MAXSIZE
+POOL_BLOCK = getattr(settings, 'OSIS_HTTP_POOL_BLOCK', False)
+KEEP_ALIVE = getattr(settings, 'OSIS_HTTP_KEEP_ALIVE', True)
+
+READ = 'read'
+WRITE = 'write'
+FILE = 'file'
+TOKEN = 'token'
+# (connect, read) timeouts in seconds per operation class
+TIMEOUTS = {
+    READ: (3.05, 10),
+    WRITE: (3.05, 20),
+    FILE: (3.05, 60),
+    TOKEN: (3.05, 5),
+}
+TIMEOUTS.update(getattr(settings, 'OSIS_HTTP_TIMEOUTS', {}))
+
+# Retries only apply to GET requests, which are idempotent
+MAX_RETRIES = getattr(settings, 'OSIS_HTTP_MAX_RETRIES', 2)
+BACKOFF_BASE = getattr(settings, 'OSIS_HTTP_BACKOFF_BASE', 0.2)
+BACKOFF_MAX = getattr(settings, 'OSIS_HTTP_BACKOFF_MAX', 2)
+RETRY_STATUSES = (502, 503, 504)
+
+BREAKER_FAILURE_THRESHOLD = getattr(settings, 'OSIS_HTTP_BREAKER_FAILURE_THRESHOLD', 5)
+BREAKER_RESET_TIMEOUT = getattr(settings, 'OSIS_HTTP_BREAKER_RESET_TIMEOUT', 30)
+
+
+class OsisUnavailable(requests.exceptions.ConnectionError):
+    """ Raised without calling OSIS while its circuit breaker is open """
+
+
+_lock = threading.Lock()
+_stats_lock = threading.Lock()
+_session = None
+_session_pid = None
+_counters = Counter()
+_breakers = {}
+
+
+def get_session():
+    """
+    Return the process-wide pooled session used for every call to OSIS.
+    The session is rebuilt after a fork so that workers never share sockets with their parent.
+    """
+    global _session, _session_pid
+    pid = os.getpid()
+    if _session is None or _session_pid != pid:
+        with _lock:
+            if _session is None or _session_pid != pid:
+                _session = _build_session()
+                _session_pid = pid
+    return _session
+
+
+def _build_session():
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=POOL_CONNECTIONS, pool_maxsize=POOL_MAXSIZE, pool_block=POOL_BLOCK)
+    session.mount('http://', adapter)
+    session.mount('https://', adapter)
+    session.headers['Connection'] = 'keep-alive' if KEEP_ALIVE else 'close'
+    return session
+
+
+def close_session():
+    global _session, _session_pid
+    with _lock:
+        if _session is not None:
+            _session.close()
+        _session = None
+        _session_pid = None
+
+
+class RequestPolicy:
+    """
+    Timeout, retries and circuit breaker of one call to OSIS, shared by this client and osis_async.
+    The client makes one attempt per iteration and reports how it ended.
+    """
+
+    def __init__(self, method, url, operation=None):
+        self.method = method.upper()
+        self.timeout = TIMEOUTS[operation or (READ if self.method == 'GET' else WRITE)]
+        self.breaker = get_breaker(url)
+        self.host = urlsplit(url).netloc
+        self.attempts = 1 + (MAX_RETRIES if self.method == 'GET' else 0)
+        self.attempt = None
+        self.allowed = None
+
+    def __iter__(self):
+        for self.attempt in range(self.attempts):
+            self.allowed = self.breaker.allow_request()
+            if not self.allowed:
+                raise OsisUnavailable("Circuit breaker open for {}".format(self.host))
+            if self.attempt:
+                _count('retries')
+            _count(self.method)
+            yield self.attempt
+
+    def is_last_attempt(self):
+        return self.attempt == self.attempts - 1
+
+    def failed(self, counter=None):
+        """ Record an attempt that raised and return whether the error must be raised rather than retried """
+        if counter:
+            _count(counter)
+        self.breaker.record_failure()
+        return self.is_last_attempt()
+
+    def interrupted(self):
+        # Not a failure of OSIS (e.g. an aborted upload body, a cancelled task), but the trial must not be held forever
+        if self.allowed is TRIAL:
+            self.breaker.release_trial()
+
+    def is_final(self, response):
+        """ Record the response of an attempt and return whether it is returned rather than retried """
+        if response.status_code < 500:
+            self.breaker.record_success()
+            return True
+        self.breaker.record_failure()
+        return self.is_last_attempt() or response.status_code not in RETRY_STATUSES
+
+    def backoff(self):
+        return _backoff(self.attempt)
+
+
+def request(method, url, operation=None, **kwargs):
+    policy = RequestPolicy(method, url, operation)
+    kwargs.setdefault('timeout', policy.timeout)
+    for _ in policy:
+        try:
+            response = get_session().request(policy.method, url, **kwargs)
+        except (requests.exceptions.ConnectionError, requests.exceptions.Timeout) as e:
+            if policy.failed('timeouts' if isinstance(e, requests.exceptions.Timeout) else 'connection_errors'):
+                raise
+        except requests.exceptions.RequestException:
+            policy.failed()
+            raise
+        except BaseException:
+            policy.interrupted()
+            raise
+        else:
+            if policy.is_final(response):
+                return response
+        time.sleep(policy.backoff())
+
+
+def _backoff(attempt):
+    # "Full jitter": a random delay up to an exponentially growing cap
+    return random.uniform(0, min(BACKOFF_MAX, BACKOFF_BASE * 2 ** attempt))
+
+
+def _count(name):
+    with _stats_lock:
+        _counters[name] += 1
+
+
+def get_breaker(url):
+    host = urlsplit(url).netloc
+    breaker = _breakers.get(host)
+    if breaker is None:
+        with _lock:
+            breaker = _breakers.setdefault(
+                host, CircuitBreaker(BREAKER_FAILURE_THRESHOLD, BREAKER_RESET_TIMEOUT)
+            )
+    return breaker
+
+
+def get(url, **kwargs):
+    return request('GET', url, **kwargs)
+
+
+def post(url, **kwargs):
+    return request('POST', url, **kwargs)
+
+
+def patch(url, **kwargs):
+    return request('PATCH', url, **kwargs)
+
+
+def delete(url, **kwargs):
+    return request('DELETE', url, **kwargs)
+
+
+def get_pool_stats():
+    stats = {
+        'pool_connections': POOL_CONNECTIONS,
+        'pool_maxsize': POOL_MAXSIZE,
+        'pool_block': POOL_BLOCK,
+        'keep_alive': KEEP_ALIVE,
+        'timeouts': {operation: list(timeout) for operation, timeout in TIMEOUTS.items()},
+        'requests': dict(_counters),
+        'circuit_breakers': {host: breaker.get_stats() for host, breaker in _breakers.items()},
+        'hosts': {},
+    }
+    session = _session
+    if session is None:
+        return stats
+    for adapter in set(session.adapters.values()):
+        pools = adapter.poolmanager.pools
+        for key in pools.keys():
+            pool = pools.get(key)
+            if pool is None:
+                continue
+            stats['hosts']["{}://{}:{}".format(pool.scheme, pool.host, pool.port)] = {
+                'connections_opened': pool.num_connections,
+                'requests_sent': pool.num_requests,
+                'idle_connections': pool.pool.qsize() if pool.pool else 0,
+            }
+    return stats
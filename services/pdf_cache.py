@@ -0,0 +1,197 @@
+##############################################################################
+#
+#    OSIS stands for Open Student Information System. It's an application
+#    designed to manage the core business of higher education institutions,
+#    such as universities, faculties, institutes and professional schools.
+#    The core business involves the administration of students, teachers,
+#    courses, programs and so on.
+#
+#    Copyright (C) 2015-2018 Université catholique de Louvain (http://www.uclouvain.be)
+#
+#    This program is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    A copy of this license - GNU General Public License - is available
+#    at the root of the source code of this program.  If not,
+#    see http://www.gnu.org/licenses/.
+#
+##############################################################################
+import hashlib
+import json
+import logging
+import os
+import tempfile
+import threading
+from collections import Counter
+
+from django.conf import settings
+from django.core.cache import caches
+from django.utils.module_loading import import_string
+
+from continuing_education.business import pdf_filler
+
+logger = logging.getLogger(settings.DEFAULT_LOGGER)
+
+FILESYSTEM_BACKEND = 'continuing_education.services.pdf_cache.FileSystemPdfStorage'
+CACHE_BACKEND = 'continuing_education.services.pdf_cache.CachePdfStorage'
+DEFAULT_MAX_SIZE = 100 * 1024 * 1024
+DEFAULT_TTL = 7 * 24 * 60 * 60
+
+CACHE_PREFIX = 'continuing_education:registration_pdf'
+INDEX_KEY = CACHE_PREFIX + ':index'
+
+_stats_lock = threading.Lock()
+_counters = Counter()
+_template_version = None
+
+
+def _count(name, value=1):
+    with _stats_lock:
+        _counters[name] += value
+
+
+def _ttl():
+    return getattr(settings, 'CONTINUING_EDUCATION_PDF_CACHE_TTL', DEFAULT_TTL)
+
+
+def get_storage():
+    """
+    Build the storage configured by CONTINUING_EDUCATION_PDF_CACHE, e.g.
+    {'BACKEND': FILESYSTEM_BACKEND, 'LOCATION': '/var/cache/iufc_pdf', 'MAX_SIZE': 200 * 1024 * 1024}
+    """
+    config = getattr(settings, 'CONTINUING_EDUCATION_PDF_CACHE', {})
+    storage_class = import_string(config.get('BACKEND', CACHE_BACKEND))
+    return storage_class(location=config.get('LOCATION'), max_size=config.get('MAX_SIZE', DEFAULT_MAX_SIZE))
+
+
+def template_version():
+    """ Hash of the registration template file: a new template makes every rendered PDF stale """
+    global _template_version
+    if _template_version is None:
+        path = "{}{}".format(settings.BASE_DIR, pdf_filler.REGISTRATION_TEMPLATE_PATH)
+        with open(path, 'rb') as template:
+            _template_version = hashlib.sha1(template.read()).hexdigest()
+    return _template_version
+
+
+def content_hash(data_dict):
+    serialized = json.dumps(data_dict, sort_keys=True, default=str)
+    return hashlib.sha256('{}:{}'.format(template_version(), serialized).encode()).hexdigest()
+
+
+def etag(data_dict):
+    return '"{}"'.format(content_hash(data_dict))
+
+
+def get_or_render(data_dict):
+    """ Return the filled registration PDF for data_dict, rendering it only when it is not stored yet """
+    key = content_hash(data_dict)
+    storage = get_storage()
+    pdf = storage.get(key)
+    if pdf is not None:
+        _count('hits')
+        return pdf
+    _count('misses')
+    pdf = pdf_filler.write_fillable_pdf(data_dict)
+    if pdf:
+        _count('evictions', storage.set(key, pdf))
+    return pdf
+
+
+class FileSystemPdfStorage:
+    """
+    One file per rendered PDF. Reading a file refreshes its modification time
+    so that the least recently downloaded files are evicted first.
+    """
+
+    def __init__(self, location=None, max_size=DEFAULT_MAX_SIZE):
+        self.location = location or os.path.join(tempfile.gettempdir(), 'continuing_education_pdf')
+        self.max_size = max_size
+        os.makedirs(self.location, exist_ok=True)
+
+    def _path(self, key):
+        return os.path.join(self.location, '{}.pdf'.format(key))
+
+    def get(self, key):
+        path = self._path(key)
+        try:
+            with open(path, 'rb') as f:
+                pdf = f.read()
+            os.utime(path)
+            return pdf
+        except FileNotFoundError:
+            return None
+
+    def set(self, key, pdf):
+        # Written aside then renamed, so a concurrent reader never sees a partial file
+        fd, tmp_path = tempfile.mkstemp(dir=self.location, suffix='.tmp')
+        with os.fdopen(fd, 'wb') as f:
+            f.write(pdf)
+        os.replace(tmp_path, self._path(key))
+        return self._evict()
+
+    def _evict(self):
+        entries = [entry for entry in os.scandir(self.location) if entry.name.endswith('.pdf')]
+        total_size = sum(entry.stat().st_size for entry in entries)
+        evicted = 0
+        for entry in sorted(entries, key=lambda entry: entry.stat().st_mtime):
+            if total_size <= self.max_size:
+                break
+            try:
+                os.remove(entry.path)
+            except FileNotFoundError:
+                continue
+            # DirEntry.stat() results are cached: the size is still known after the removal
+            total_size -= entry.stat().st_size
+            evicted += 1
+        return evicted
+
+
+class CachePdfStorage:
+    """
+    PDFs stored in a Django cache (LOCATION is the cache alias). An index of the stored
+    sizes is kept in the cache as well and the oldest entries are evicted first. Entries also
+    expire after CONTINUING_EDUCATION_PDF_CACHE_TTL seconds.
+    """
+
+    def __init__(self, location=None, max_size=DEFAULT_MAX_SIZE):
+        self.cache = caches[location or 'default']
+        self.max_size = max_size
+
+    @staticmethod
+    def _key(key):
+        return '{}:{}'.format(CACHE_PREFIX, key)
+
+    def get(self, key):
+        return self.cache.get(self._key(key))
+
+    def set(self, key, pdf):
+        self.cache.set(self._key(key), pdf, timeout=_ttl())
+        # The index is updated without locking: an entry left out of it by a concurrent update is never
+        # evicted, it takes room until it expires
+        index = self.cache.get(INDEX_KEY) or []
+        index = [(stored_key, size) for stored_key, size in index if stored_key != key] + [(key, len(pdf))]
+        total_size = sum(size for _, size in index)
+        evicted = []
+        while total_size > self.max_size and len(index) > 1:
+            stored_key, size = index.pop(0)
+            evicted.append(self._key(stored_key))
+            total_size -= size
+        self.cache.delete_many(evicted)
+        self.cache.set(INDEX_KEY, index, timeout=_ttl())
+        return len(evicted)
+
+
+def get_stats():
+    with _stats_lock:
+        stats = dict(_counters)
+    lookups = stats.get('hits', 0) + stats.get('misses', 0)
+    stats['hit_ratio'] = round(stats.get('hits', 0) / lookups, 4) if lookups else None
+    return stats
@@ -0,0 +1,134 @@
+##############################################################################
+#
+#    OSIS stands for Open Student Information System. It's an application
+#    designed to manage the core business of higher education institutions,
+#    such as universities, faculties, institutes and professional schools.
+#    The core business involves the administration of students, teachers,
+#    courses, programs and so on.
+#
+#    Copyright (C) 2015-2018 Université catholique de Louvain (http://www.uclouvain.be)
+#
+#    This program is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    A copy of this license - GNU General Public License - is available
+#    at the root of the source code of this program.  If not,
+#    see http://www.gnu.org/licenses/.
+#
+##############################################################################
+import copy
+import hashlib
+import json
+import threading
+import time
+from collections import Counter
+
+from django.conf import settings
+from django.core.cache import caches
+
+CACHE_PREFIX = 'continuing_education:single_flight'
+# How often a process waiting for the leader of another process looks for its result, in seconds
+POLL_INTERVAL = 0.05
+
+_stats_lock = threading.Lock()
+_counters = Counter()
+_in_flight = {}
+_in_flight_lock = threading.Lock()
+
+
+class _Call:
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+def _count(name):
+    with _stats_lock:
+        _counters[name] += 1
+
+
+def _shared_cache():
+    """ Cache used to coalesce calls across processes, None to only coalesce within this process """
+    alias = getattr(settings, 'OSIS_SINGLE_FLIGHT_CACHE', None)
+    return caches[alias] if alias else None
+
+
+def _wait_timeout():
+    """ How long a process waits for the result of another one before calling OSIS itself """
+    return getattr(settings, 'OSIS_SINGLE_FLIGHT_WAIT', 10)
+
+
+def build_key(*parts):
+    serialized = json.dumps(parts, sort_keys=True, default=str)
+    return hashlib.sha1(serialized.encode()).hexdigest()
+
+
+def do(key, func):
+    """
+    Call func() unless an identical call (same key) is already in flight, in which case wait for it
+    and share its result. Every caller gets its own copy of the result, which it is free to modify.
+    """
+    with _in_flight_lock:
+        call = _in_flight.get(key)
+        is_leader = call is None
+        if is_leader:
+            call = _in_flight[key] = _Call()
+    if not is_leader:
+        _count('coalesced')
+        call.done.wait()
+        if call.error is not None:
+            raise call.error
+        return copy.deepcopy(call.result)
+    try:
+        call.result = _call_once_across_processes(key, func)
+        return copy.deepcopy(call.result)
+    except Exception as e:
+        call.error = e
+        raise
+    finally:
+        with _in_flight_lock:
+            del _in_flight[key]
+        call.done.set()
+
+
+def _call_once_across_processes(key, func):
+    cache = _shared_cache()
+    if cache is None:
+        _count('calls')
+        return func()
+    lock_key = '{}:{}:lock'.format(CACHE_PREFIX, key)
+    result_key = '{}:{}:result'.format(CACHE_PREFIX, key)
+    wait_timeout = _wait_timeout()
+    deadline = time.time() + wait_timeout
+    has_lock = cache.add(lock_key, True, timeout=wait_timeout)
+    while not has_lock and time.time() < deadline:
+        result = cache.get(result_key)
+        if result is not None:
+            _count('coalesced_across_processes')
+            return result
+        time.sleep(POLL_INTERVAL)
+        has_lock = cache.add(lock_key, True, timeout=wait_timeout)
+    try:
+        _count('calls')
+        result = func()
+        # Kept just long enough for the processes waiting for it to pick it up
+        cache.set(result_key, result, timeout=max(1, int(wait_timeout / 2)))
+        return result
+    finally:
+        if has_lock:
+            cache.delete(lock_key)
+
+
+def get_stats():
+    with _stats_lock:
+        stats = dict(_counters)
+    stats['in_flight'] = len(_in_flight)
+    return stats
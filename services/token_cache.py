@@ -0,0 +1,145 @@
+##############################################################################
+#
+#    OSIS stands for Open Student Information System. It's an application
+#    designed to manage the core business of higher education institutions,
+#    such as universities, faculties, institutes and professional schools.
+#    The core business involves the administration of students, teachers,
+#    courses, programs and so on.
+#
+#    Copyright (C) 2015-2018 Université catholique de Louvain (http://www.uclouvain.be)
+#
+#    This program is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    A copy of this license - GNU General Public License - is available
+#    at the root of the source code of this program.  If not,
+#    see http://www.gnu.org/licenses/.
+#
+##############################################################################
+import hashlib
+import logging
+import threading
+import time
+from collections import Counter
+
+from django.conf import settings
+from django.core.cache import caches
+
+logger = logging.getLogger(settings.DEFAULT_LOGGER)
+
+CACHE_PREFIX = 'continuing_education:token'
+
+_stats_lock = threading.Lock()
+_counters = Counter()
+# username -> Event set once the in-flight fetch for that user is done
+_in_flight = {}
+_in_flight_lock = threading.Lock()
+
+
+def _cache():
+    return caches[getattr(settings, 'CONTINUING_EDUCATION_TOKEN_CACHE', 'default')]
+
+
+def _ttl():
+    return getattr(settings, 'CONTINUING_EDUCATION_TOKEN_TTL', 12 * 60 * 60)
+
+
+def _refresh_margin():
+    """ How long before its expiry a token is fetched again in the background """
+    return getattr(settings, 'CONTINUING_EDUCATION_TOKEN_REFRESH_MARGIN', 30 * 60)
+
+
+def _count(name):
+    with _stats_lock:
+        _counters[name] += 1
+
+
+def _key(username):
+    # Usernames may contain characters that are not valid in memcached keys
+    return '{}:{}'.format(CACHE_PREFIX, hashlib.sha1(username.encode()).hexdigest())
+
+
+def get_token(username, fetch):
+    """
+    Return the OSIS token of username, shared by all its sessions and processes.
+    fetch() is called when no token is cached; concurrent callers for the same user wait for that single call.
+    A token close to its expiry is still returned while it is fetched again in the background.
+    """
+    entry = _cache().get(_key(username))
+    if entry is not None:
+        _count('hits')
+        if entry['refresh_at'] <= time.time():
+            _refresh_in_background(username, fetch)
+        return entry['token']
+    return _fetch_once(username, fetch)
+
+
+def _fetch_once(username, fetch):
+    with _in_flight_lock:
+        done = _in_flight.get(username)
+        is_leader = done is None
+        if is_leader:
+            done = _in_flight[username] = threading.Event()
+    if not is_leader:
+        _count('coalesced')
+        done.wait()
+        entry = _cache().get(_key(username))
+        if entry is not None:
+            return entry['token']
+        # The leader failed or got no token: try on our own rather than failing
+        return fetch()
+    try:
+        _count('misses')
+        token = fetch()
+        _store(username, token)
+        return token
+    finally:
+        with _in_flight_lock:
+            del _in_flight[username]
+        done.set()
+
+
+def _store(username, token):
+    # No token means OSIS refused or failed: it is asked again on the next call
+    if not token:
+        return
+    ttl = _ttl()
+    _cache().set(
+        _key(username),
+        {'token': token, 'refresh_at': time.time() + max(ttl - _refresh_margin(), 0)},
+        timeout=ttl
+    )
+
+
+def _refresh_in_background(username, fetch):
+    lock_key = _key(username) + ':refreshing'
+    if not _cache().add(lock_key, True, timeout=_refresh_margin()):
+        return
+    threading.Thread(target=_refresh, args=(username, lock_key, fetch), daemon=True).start()
+
+
+def _refresh(username, lock_key, fetch):
+    try:
+        _store(username, fetch())
+        _count('refreshes')
+    except Exception as e:
+        _count('refresh_errors')
+        logger.warning("Unable to refresh OSIS token of %s: %s", username, e)
+    finally:
+        _cache().delete(lock_key)
+
+
+def invalidate(username):
+    _cache().delete(_key(username))
+
+
+def get_stats():
+    with _stats_lock:
+        return dict(_counters)
@@ -0,0 +1,173 @@
+##############################################################################
+#
+#    OSIS stands for Open Student Information System. It's an application
+#    designed to manage the core business of higher education institutions,
+#    such as universities, faculties, institutes and professional schools.
+#    The core business involves the administration of students, teachers,
+#    courses, programs and so on.
+#
+#    Copyright (C) 2015-2018 Université catholique de Louvain (http://www.uclouvain.be)
+#
+#    This program is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    A copy of this license - GNU General Public License - is available
+#    at the root of the source code of this program.  If not,
+#    see http://www.gnu.org/licenses/.
+#
+##############################################################################
+import hashlib
+import json
+import logging
+import threading
+import time
+from collections import Counter
+
+from django.conf import settings
+from django.core.cache import caches
+
+from continuing_education.services import osis_fetch
+
+logger = logging.getLogger(settings.DEFAULT_LOGGER)
+
+CACHE_PREFIX = 'continuing_education:training'
+
+_stats_lock = threading.Lock()
+_counters = Counter()
+
+
+def _cache():
+    return caches[getattr(settings, 'CONTINUING_EDUCATION_TRAINING_CACHE', 'default')]
+
+
+def _ttl():
+    return getattr(settings, 'CONTINUING_EDUCATION_TRAINING_CACHE_TTL', 60 * 60)
+
+
+def _stale_ttl():
+    """ How long an expired entry may still be served while it is refreshed in the background """
+    return getattr(settings, 'CONTINUING_EDUCATION_TRAINING_CACHE_STALE_TTL', 24 * 60 * 60)
+
+
+def _count(name):
+    with _stats_lock:
+        _counters[name] += 1
+
+
+def acronym_key(acronym, projection=None):
+    return _training_key('acronym', str(acronym).upper(), projection)
+
+
+def uuid_key(uuid, projection=None):
+    return _training_key('uuid', str(uuid), projection)
+
+
+def _training_key(kind, identifier, projection):
+    if not projection:
+        return _build_key(kind, identifier)
+    # A partial training is cached apart from the full one, which it must never be served for
+    return _build_key(kind, '{}:{}'.format(identifier, projection))
+
+
+def list_key(params):
+    serialized = json.dumps(params or {}, sort_keys=True, default=str)
+    return _build_key('list', hashlib.sha1(serialized.encode()).hexdigest())
+
+
+def _build_key(kind, identifier):
+    return '{}:{}:{}'.format(CACHE_PREFIX, kind, identifier)
+
+
+def get_or_fetch(key, fetch, refresh=None):
+    """
+    Return the training data cached under key, calling fetch() to get it from OSIS when it is missing.
+    Expired entries are served while a single background refresh replaces them with refresh(), which runs
+    after the response is sent and so must not depend on the request. Without refresh, they are fetched again.
+    """
+    entry = _cache().get(key)
+    if entry is None:
+        _count('misses')
+        data = fetch()
+        _store(key, data)
+        return data
+    return _read(key, entry, fetch, refresh)
+
+
+def get_many_or_fetch(fetches, refreshes=None):
+    """
+    Same as get_or_fetch for a dict of key -> fetch (and key -> refresh): cached entries are read at once
+    and missing ones are fetched from OSIS concurrently.
+    """
+    refreshes = refreshes or {}
+    entries = _cache().get_many(list(fetches))
+    results = {
+        key: _read(key, entry, fetches[key], refreshes.get(key)) for key, entry in entries.items() if entry is not None
+    }
+    missing = [key for key in fetches if key not in results]
+    for _ in missing:
+        _count('misses')
+    fetched = osis_fetch.run([(key, osis_fetch.Fetch(fetches[key])) for key in missing])
+    _store_many(fetched)
+    results.update(fetched)
+    return results
+
+
+def _read(key, entry, fetch, refresh):
+    if entry['expires_at'] <= time.time():
+        if refresh is None:
+            _count('misses')
+            data = fetch()
+            _store(key, data)
+            return data
+        _count('stale_hits')
+        _refresh_in_background(key, refresh)
+    else:
+        _count('hits')
+    return entry['data']
+
+
+def _store(key, data):
+    _store_many({key: data})
+
+
+def _store_many(data_by_key):
+    # A training that was not found is not cached, so it shows up as soon as it is created in OSIS
+    ttl = _ttl()
+    expires_at = time.time() + ttl
+    _cache().set_many(
+        {key: {'data': data, 'expires_at': expires_at} for key, data in data_by_key.items() if data is not None},
+        timeout=ttl + _stale_ttl()
+    )
+
+
+def _refresh_in_background(key, refresh):
+    lock_key = key + ':refreshing'
+    if not _cache().add(lock_key, True, timeout=_ttl()):
+        return
+    threading.Thread(target=_refresh, args=(key, lock_key, refresh), daemon=True).start()
+
+
+def _refresh(key, lock_key, refresh):
+    try:
+        _store(key, refresh())
+        _count('refreshes')
+    except Exception as e:
+        _count('refresh_errors')
+        logger.warning("Unable to refresh training cache entry %s: %s", key, e)
+    finally:
+        _cache().delete(lock_key)
+
+
+def get_stats():
+    with _stats_lock:
+        stats = dict(_counters)
+    lookups = stats.get('hits', 0) + stats.get('stale_hits', 0) + stats.get('misses', 0)
+    stats['hit_ratio'] = round((lookups - stats.get('misses', 0)) / lookups, 4) if lookups else None
+    return stats
@@ -0,0 +1,218 @@
+##############################################################################
+#
+#    OSIS stands for Open Student Information System. It's an application
+#    designed to manage the core business of higher education institutions,
+#    such as universities, faculties, institutes and professional schools.
+#    The core business involves the administration of students, teachers,
+#    courses, programs and so on.
+#
+#    Copyright (C) 2015-2018 Université catholique de Louvain (http://www.uclouvain.be)
+#
+#    This program is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    A copy of this license - GNU General Public License - is available
+#    at the root of the source code of this program.  If not,
+#    see http://www.gnu.org/licenses/.
+#
+##############################################################################
+import logging
+import queue
+import threading
+import time
+import uuid
+from collections import Counter
+
+from django.conf import settings
+from django.core.files.uploadhandler import FileUploadHandler, StopFutureHandlers, StopUpload
+
+from continuing_education.services import osis_http
+
+logger = logging.getLogger(settings.DEFAULT_LOGGER)
+
+# Number of received chunks (64 KB each by default) buffered while OSIS reads the previous ones
+QUEUE_SIZE = getattr(settings, 'OSIS_UPLOAD_RELAY_QUEUE_SIZE', 8)
+# Room left in the request Content-Length for the multipart headers and the other form fields
+MULTIPART_OVERHEAD = 16 * 1024
+
+_END = object()
+_ABORT = object()
+
+_stats_lock = threading.Lock()
+_counters = Counter()
+
+
+class UploadAborted(Exception):
+    pass
+
+
+class UploadRelay:
+    """
+    Send a multipart/form-data request to OSIS whose file part is fed chunk by chunk while it is received.
+    The request body is sent with chunked transfer encoding from a background thread.
+    """
+
+    def __init__(self, url, headers, fields, file_field, file_name, content_type):
+        self.url = url
+        self.headers = headers
+        self.fields = fields
+        self.file_field = file_field
+        self.file_name = file_name
+        self.content_type = content_type or 'application/octet-stream'
+        self.boundary = uuid.uuid4().hex
+        self.size = 0
+        self.response = None
+        self.error = None
+        self.elapsed = None
+        self._chunks = queue.Queue(maxsize=QUEUE_SIZE)
+        self._done = threading.Event()
+        self._thread = threading.Thread(target=self._post, daemon=True)
+        self._started_at = None
+
+    def start(self):
+        self._started_at = time.monotonic()
+        self._thread.start()
+
+    def send(self, data):
+        self.size += len(data)
+        self._put(data)
+
+    def finish(self):
+        self._put(_END)
+        self._thread.join()
+        self.elapsed = time.monotonic() - self._started_at
+        _record(self)
+
+    def abort(self):
+        self._put(_ABORT)
+        self._thread.join()
+
+    def _put(self, item):
+        # Once OSIS answered (or the connection failed) nobody reads the queue anymore: drop the data
+        while not self._done.is_set():
+            try:
+                self._chunks.put(item, timeout=0.1)
+                return
+            except queue.Full:
+                continue
+
+    def _post(self):
+        try:
+            self.response = osis_http.post(
+                self.url,
+                headers=dict(self.headers, **{
+                    'Content-Type': 'multipart/form-data; boundary={}'.format(self.boundary)
+                }),
+                data=self._body(),
+                operation=osis_http.FILE
+            )
+        except Exception as e:
+            self.error = e
+        finally:
+            self._done.set()
+
+    def _body(self):
+        for name, value in self.fields.items():
+            yield self._part_header('form-data; name="{}"'.format(name)) + str(value).encode() + b'\r\n'
+        yield self._part_header(
+            'form-data; name="{}"; filename="{}"'.format(self.file_field, self.file_name.replace('"', '')),
+            self.content_type
+        )
+        while True:
+            item = self._chunks.get()
+            if item is _END:
+                break
+            if item is _ABORT:
+                raise UploadAborted()
+            yield item
+        yield '\r\n--{}--\r\n'.format(self.boundary).encode()
+
+    def _part_header(self, disposition, content_type=None):
+        header = '--{}\r\nContent-Disposition: {}\r\n'.format(self.boundary, disposition)
+        if content_type:
+            header += 'Content-Type: {}\r\n'.format(content_type)
+        return (header + '\r\n').encode()
+
+    @property
+    def throughput(self):
+        return self.size / self.elapsed if self.elapsed else None
+
+
+class OsisRelayUploadHandler(FileUploadHandler):
+    """
+    Upload handler relaying the file of `file_field` to OSIS, as its `osis_file_field`, while it is received
+    instead of keeping it in memory or in a temporary file. The end of the file is only sent by complete(),
+    so that OSIS drops the upload of a request refused once its body is parsed, e.g. by the CSRF check.
+    The result is available in `relay` once complete() returns.
+    """
+
+    def __init__(self, request, url, headers, fields, file_field, osis_file_field, max_size):
+        super().__init__(request)
+        self.url = url
+        self.headers = headers
+        self.fields = fields
+        self.file_field = file_field
+        self.osis_file_field = osis_file_field
+        self.max_size = max_size
+        self.relay = None
+        self.too_large = False
+        self.completed = False
+
+    def new_file(self, field_name, file_name, *args, **kwargs):
+        super().new_file(field_name, file_name, *args, **kwargs)
+        if field_name != self.file_field or self.relay:
+            return
+        self.relay = UploadRelay(
+            self.url, self.headers, self.fields, self.osis_file_field, file_name, self.content_type
+        )
+        self.relay.start()
+        raise StopFutureHandlers()
+
+    def receive_data_chunk(self, raw_data, start):
+        if self.field_name != self.file_field or self.relay is None:
+            return None
+        if self.relay.size + len(raw_data) > self.max_size:
+            self.too_large = True
+            self.relay.abort()
+            self.relay = None
+            # The rest of the body is read and dropped, so that the view can still answer with a message
+            raise StopUpload(connection_reset=False)
+        self.relay.send(raw_data)
+        return None
+
+    def file_complete(self, file_size):
+        return None
+
+    def complete(self):
+        if self.relay is not None:
+            self.relay.finish()
+        self.completed = True
+
+    def upload_interrupted(self):
+        if self.relay is not None:
+            self.relay.abort()
+            self.relay = None
+
+
+def _record(relay):
+    with _stats_lock:
+        _counters['uploads'] += 1
+        _counters['bytes'] += relay.size
+        if relay.error or relay.response is None or relay.response.status_code >= 400:
+            _counters['failures'] += 1
+    logger.info(
+        "Relayed upload of %s bytes to OSIS in %.3fs (%s bytes/s)",
+        relay.size, relay.elapsed or 0, int(relay.throughput or 0)
+    )
+
+
+def get_stats():
+    with _stats_lock:
+        return dict(_counters)
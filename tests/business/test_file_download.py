@@ -0,0 +1,100 @@
+##############################################################################
+#
+#    OSIS stands for Open Student Information System. It's an application
+#    designed to manage the core business of higher education institutions,
+#    such as universities, faculties, institutes and professional schools.
+#    The core business involves the administration of students, teachers,
+#    courses, programs and so on.
+#
+#    Copyright (C) 2015-2018 Université catholique de Louvain (http://www.uclouvain.be)
+#
+#    This program is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    A copy of this license - GNU General Public License - is available
+#    at the root of the source code of this program.  If not,
+#    see http://www.gnu.org/licenses/.
+#
+##############################################################################
+import base64
+import io
+import json
+import os
+
+from django.test import SimpleTestCase
+from requests import Response
+
+from continuing_education.business.file_download import FileDownload, Base64StreamDecoder, iter_top_level_strings
+
+
+def _streamed_response(document):
+    response = Response()
+    response.status_code = 200
+    response.raw = io.BytesIO(str.encode(document))
+    return response
+
+
+class FileDownloadTestCase(SimpleTestCase):
+    def setUp(self):
+        self.content = os.urandom(10000)
+        self.encoded_content = base64.b64encode(self.content).decode()
+
+    def test_name_before_content(self):
+        document = json.dumps({'name': 'diplôme.pdf', 'content': self.encoded_content})
+        download = FileDownload(_streamed_response(document), chunk_size=7)
+        self.assertEqual(download.name, 'diplôme.pdf')
+        self.assertEqual(b''.join(download.iter_content()), self.content)
+
+    def test_name_after_content(self):
+        document = json.dumps({'content': self.encoded_content, 'path': 'a/b.pdf', 'name': 'b.pdf'})
+        download = FileDownload(_streamed_response(document), chunk_size=13)
+        self.assertEqual(download.name, 'b.pdf')
+        self.assertEqual(b''.join(download.iter_content()), self.content)
+
+    def test_nested_values_are_skipped(self):
+        document = json.dumps({
+            'uploaded_by': {'name': 'Nested', 'content': 'bm9wZQ=='},
+            'name': 'file.pdf',
+            'content': self.encoded_content,
+        })
+        download = FileDownload(_streamed_response(document), chunk_size=5)
+        self.assertEqual(download.name, 'file.pdf')
+        self.assertEqual(b''.join(download.iter_content()), self.content)
+
+    def test_escaped_slashes_in_content(self):
+        document = '{"name": "file.pdf", "content": "' + self.encoded_content.replace('/', '\\/') + '"}'
+        download = FileDownload(_streamed_response(document), chunk_size=3)
+        self.assertEqual(b''.join(download.iter_content()), self.content)
+
+    def test_escaped_characters_in_name(self):
+        document = json.dumps({'name': 'my "file" é.pdf', 'content': ''}, ensure_ascii=True)
+        strings = dict(iter_top_level_strings([document[i:i + 2] for i in range(0, len(document), 2)]))
+        self.assertEqual(strings['name'], 'my "file" é.pdf')
+
+    def test_base64_decoder_across_pieces(self):
+        decoder = Base64StreamDecoder()
+        pieces = [self.encoded_content[i:i + 5] for i in range(0, len(self.encoded_content), 5)]
+        decoded = b''.join(decoder.decode(piece) for piece in pieces) + decoder.flush()
+        self.assertEqual(decoded, self.content)
+
+    def test_wrapped_base64_content(self):
+        wrapped = base64.encodebytes(self.content).decode()
+        document = json.dumps({'name': 'file.pdf', 'content': wrapped.replace('\n', '\r\n')})
+        for chunk_size in [1, 2, 5, 77]:
+            with self.subTest(chunk_size=chunk_size):
+                download = FileDownload(_streamed_response(document), chunk_size=chunk_size)
+                self.assertEqual(b''.join(download.iter_content()), self.content)
+
+    def test_base64_decoder_with_escapes_across_pieces(self):
+        raw = json.dumps(base64.encodebytes(self.content).decode(), ensure_ascii=True)[1:-1].replace('/', '\\u002F')
+        decoder = Base64StreamDecoder()
+        pieces = [raw[i:i + 3] for i in range(0, len(raw), 3)]
+        decoded = b''.join(decoder.decode(piece) for piece in pieces) + decoder.flush()
+        self.assertEqual(decoded, self.content)
@@ -0,0 +1,52 @@
+##############################################################################
+#
+#    OSIS stands for Open Student Information System. It's an application
+#    designed to manage the core business of higher education institutions,
+#    such as universities, faculties, institutes and professional schools.
+#    The core business involves the administration of students, teachers,
+#    courses, programs and so on.
+#
+#    Copyright (C) 2015-2018 Université catholique de Louvain (http://www.uclouvain.be)
+#
+#    This program is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    A copy of this license - GNU General Public License - is available
+#    at the root of the source code of this program.  If not,
+#    see http://www.gnu.org/licenses/.
+#
+##############################################################################
+from django.test import SimpleTestCase
+
+from continuing_education.business import normalization
+
+
+class NormalizationTestCase(SimpleTestCase):
+    def test_fold(self):
+        self.assertEqual(normalization.fold('Écaussinnes-d\'Enghien'), 'ecaussinnes-d\'enghien')
+        self.assertEqual(normalization.fold(None), '')
+
+    def test_fold_input_strips_and_is_memoized(self):
+        normalization.fold_input.cache_clear()
+        self.assertEqual(normalization.fold_input(' Liège '), 'liege')
+        normalization.fold_input(' Liège ')
+        self.assertEqual(normalization.fold_input.cache_info().hits, 1)
+
+    def test_edit_distance(self):
+        self.assertEqual(normalization.edit_distance('namur', 'namur'), 0)
+        self.assertEqual(normalization.edit_distance('kitten', 'sitting'), 3)
+        self.assertEqual(normalization.edit_distance('', 'jette'), 5)
+
+    def test_rank_by_similarity(self):
+        candidates = [('Jette', 'jette'), ('Ganshoren', 'ganshoren'), ('Jodoigne', 'jodoigne')]
+        self.assertEqual(
+            normalization.rank_by_similarity('Jodoign', candidates),
+            ['Jodoigne', 'Jette', 'Ganshoren']
+        )
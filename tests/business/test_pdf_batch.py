@@ -0,0 +1,106 @@
+##############################################################################
+#
+#    OSIS stands for Open Student Information System. It's an application
+#    designed to manage the core business of higher education institutions,
+#    such as universities, faculties, institutes and professional schools.
+#    The core business involves the administration of students, teachers,
+#    courses, programs and so on.
+#
+#    Copyright (C) 2015-2018 Université catholique de Louvain (http://www.uclouvain.be)
+#
+#    This program is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    A copy of this license - GNU General Public License - is available
+#    at the root of the source code of this program.  If not,
+#    see http://www.gnu.org/licenses/.
+#
+##############################################################################
+import os
+import tempfile
+import zipfile
+from concurrent.futures import ThreadPoolExecutor
+from unittest import mock
+
+from django.contrib.auth.models import AnonymousUser
+from django.test import TestCase, RequestFactory
+
+from base.tests.factories.person import PersonFactory
+from continuing_education.business import pdf_batch
+from continuing_education.models.enums.admission_state_choices import REGISTRATION_SUBMITTED
+from continuing_education.tests.factories.admission import RegistrationDictFactory
+from continuing_education.tests.factories.person import ContinuingEducationPersonDictFactory
+
+
+@mock.patch('continuing_education.business.pdf_batch.ProcessPoolExecutor', ThreadPoolExecutor)
+@mock.patch('continuing_education.business.pdf_filler.write_fillable_pdf', return_value=b'%PDF')
+@mock.patch('continuing_education.business.pdf_filler.get_data', return_value={})
+class GenerateRegistrationPdfsTestCase(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.person_information = ContinuingEducationPersonDictFactory(PersonFactory().uuid)
+
+    def setUp(self):
+        self.request = RequestFactory().get('/')
+        self.request.user = AnonymousUser()
+        self.registrations = [
+            RegistrationDictFactory(self.person_information, state=REGISTRATION_SUBMITTED) for _ in range(3)
+        ]
+        by_uuid = {registration['uuid']: registration for registration in self.registrations}
+        patcher = mock.patch(
+            'continuing_education.views.api.get_registration',
+            side_effect=lambda request, uuid: by_uuid[uuid]
+        )
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        pages = [
+            {'count': 3, 'results': [{'uuid': r['uuid']} for r in self.registrations[:2]]},
+            {'count': 3, 'results': [{'uuid': self.registrations[2]['uuid']}]},
+        ]
+        patcher = mock.patch('continuing_education.views.api.get_registrations', side_effect=pages)
+        self.mock_get_registrations = patcher.start()
+        self.addCleanup(patcher.stop)
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.directory = directory.name
+
+    def test_generate_zip(self, mock_get_data, mock_write):
+        output = os.path.join(self.directory, 'forms.zip')
+        progress = mock.Mock()
+        stats = pdf_batch.generate_registration_pdfs(self.request, output, acronym='ACRO', progress=progress)
+        self.assertEqual(stats['count'], 3)
+        with zipfile.ZipFile(output) as zip_file:
+            self.assertEqual(len(zip_file.namelist()), 3)
+            self.assertEqual(zip_file.read(zip_file.namelist()[0]), b'%PDF')
+        progress.assert_called_with(3, 3)
+        self.assertEqual(self.mock_get_registrations.call_args_list[1][1]['offset'], 2)
+        self.assertEqual(self.mock_get_registrations.call_args_list[0][1]['formation'], 'ACRO')
+
+    def test_generate_directory(self, mock_get_data, mock_write):
+        pdf_batch.generate_registration_pdfs(self.request, self.directory, academic_year=2019)
+        self.assertEqual(len(os.listdir(self.directory)), 3)
+        self.assertEqual(self.mock_get_registrations.call_args_list[0][1]['academic_year'], 2019)
+
+    def test_first_page_is_rendered_while_the_next_one_is_fetched(self, mock_get_data, mock_write):
+        pages = self.mock_get_registrations.side_effect
+        submitted_before_fetch = []
+
+        def get_registrations(request, **kwargs):
+            submitted_before_fetch.append(mock_get_data.call_count)
+            return next(pages)
+
+        self.mock_get_registrations.side_effect = get_registrations
+        pdf_batch.generate_registration_pdfs(self.request, self.directory, acronym='ACRO')
+        self.assertEqual(submitted_before_fetch, [0, 2])
+        self.assertEqual(len(os.listdir(self.directory)), 3)
+
+    def test_training_or_academic_year_required(self, mock_get_data, mock_write):
+        with self.assertRaises(ValueError):
+            pdf_batch.generate_registration_pdfs(self.request, self.directory)
@@ -176,6 +176,8 @@ class PdfFillerFieldsValuesTestCase(TestCase):
         cls.person_information = ContinuingEducationPersonDictFactory(cls.person.uuid)
         cls.registration = RegistrationDictFactory(person_information=cls.person_information,
                                                    state=REGISTRATION_SUBMITTED)
+        # The residence address is only filled in when it is not the postal address
+        cls.registration['use_address_for_post'] = False
         cls.data = pdf_filler.get_data(cls.registration)
 
     def test_get_data_dict_complete(self):
@@ -194,3 +196,47 @@ class PdfFillerFieldsValuesTestCase(TestCase):
         ]
         for key in keys_expected:
             self.assertIsNotNone(self.data[key])
+
+
+class WriteFillablePdfTestCase(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.person = PersonFactory()
+        cls.person_information = ContinuingEducationPersonDictFactory(cls.person.uuid)
+        cls.registration = RegistrationDictFactory(person_information=cls.person_information,
+                                                   state=REGISTRATION_SUBMITTED)
+        cls.data = pdf_filler.get_data(cls.registration)
+        cls.data.update({
+            'last_name': 'Dupont (Élodie)',
+            'first_name': 'Jean',
+            'gender_image_f': pdf_filler.CHECKBOX_SELECTED
+        })
+
+    def test_template_parsed_once(self):
+        self.assertIs(pdf_filler.get_registration_template(), pdf_filler.get_registration_template())
+        self.assertIn('last_name', pdf_filler.get_registration_template().fields)
+
+    def test_write_fillable_pdf_flattens_form(self):
+        pdf = pdfrw.PdfReader(fdata=pdf_filler.write_fillable_pdf(self.data))
+        self.assertEqual(len(pdf.pages), 2)
+        self.assertIsNone(pdf.Root.AcroForm)
+        for page in pdf.pages:
+            self.assertIsNone(page.Annots)
+
+    def test_write_fillable_pdf_draws_values(self):
+        pdf = pdfrw.PdfReader(fdata=pdf_filler.write_fillable_pdf(self.data))
+        streams = [
+            xobject.stream for page in pdf.pages for xobject in page.Resources.XObject.values()
+            if xobject.Subtype == pdfrw.PdfName.Form
+        ]
+        self.assertTrue(any('(Dupont \\(\xc9lodie\\))' in stream for stream in streams))
+        self.assertTrue(any('(Jean)' in stream for stream in streams))
+
+    def test_write_fillable_pdf_selects_checkbox_appearance(self):
+        template = pdf_filler.get_registration_template()
+        checkbox = template.fields['gender_image_f']
+        appearance = pdf_filler._field_appearance(checkbox, template, self.data)
+        self.assertIs(appearance, checkbox.AP.N.Yes)
+        unselected = {'gender_image_f': pdf_filler.CHECKBOX_NOT_SELECTED}
+        appearance = pdf_filler._field_appearance(checkbox, template, unselected)
+        self.assertIs(appearance, checkbox.AP.N.Off)
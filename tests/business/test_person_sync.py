@@ -0,0 +1,61 @@
+##############################################################################
+#
+#    OSIS stands for Open Student Information System. It's an application
+#    designed to manage the core business of higher education institutions,
+#    such as universities, faculties, institutes and professional schools.
+#    The core business involves the administration of students, teachers,
+#    courses, programs and so on.
+#
+#    Copyright (C) 2015-2018 Université catholique de Louvain (http://www.uclouvain.be)
+#
+#    This program is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    A copy of this license - GNU General Public License - is available
+#    at the root of the source code of this program.  If not,
+#    see http://www.gnu.org/licenses/.
+#
+##############################################################################
+from unittest import mock
+
+from django.test import TestCase
+
+from base.models.person import Person
+from base.tests.factories.person import PersonFactory
+from base.tests.factories.user import UserFactory
+from continuing_education.business import person_sync
+from continuing_education.tests.factories.person import PersonDictFactory
+
+
+class SyncPersonTestCase(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = UserFactory()
+        cls.person = PersonFactory(user=cls.user, gender='H')
+
+    def setUp(self):
+        self.remote_person = PersonDictFactory(self.person)
+
+    def test_unchanged_person_is_not_written(self):
+        with mock.patch('continuing_education.business.person_sync.Person.objects') as mock_objects:
+            person = person_sync.sync_person(self.user, self.remote_person)
+        self.assertFalse(mock_objects.filter.called)
+        self.assertEqual(person, self.person)
+
+    def test_changed_fields_are_written(self):
+        applied = person_sync.get_stats().get('applied', 0)
+        self.remote_person['last_name'] = 'Changed'
+        person = person_sync.sync_person(self.user, self.remote_person)
+        self.assertEqual(person.last_name, 'Changed')
+        self.assertEqual(Person.objects.get(pk=self.person.pk).last_name, 'Changed')
+        self.assertEqual(person_sync.get_stats()['applied'], applied + 1)
+
+    def test_user_without_person(self):
+        self.assertIsNone(person_sync.sync_person(UserFactory(), self.remote_person))
@@ -0,0 +1,118 @@
+##############################################################################
+#
+#    OSIS stands for Open Student Information System. It's an application
+#    designed to manage the core business of higher education institutions,
+#    such as universities, faculties, institutes and professional schools.
+#    The core business involves the administration of students, teachers,
+#    courses, programs and so on.
+#
+#    Copyright (C) 2015-2018 Université catholique de Louvain (http://www.uclouvain.be)
+#
+#    This program is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    A copy of this license - GNU General Public License - is available
+#    at the root of the source code of this program.  If not,
+#    see http://www.gnu.org/licenses/.
+#
+##############################################################################
+import json
+import os
+import tempfile
+from types import SimpleNamespace
+from unittest import mock
+
+from django.test import SimpleTestCase
+
+from continuing_education.business import postal_code_index
+from continuing_education.business.postal_code_index import PostalCodeIndex
+
+CITIES = [('1348', 'Louvain-la-Neuve'), ('1348', 'Ottignies'), ('4000', 'Liège'), ('5000', 'Namur')]
+
+
+class PostalCodeIndexTestCase(SimpleTestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.index = PostalCodeIndex(CITIES)
+
+    def test_get_cities(self):
+        self.assertEqual(self.index.get_cities('1348'), ['Louvain-la-Neuve', 'Ottignies'])
+        self.assertEqual(self.index.get_cities(' 1348 '), ['Louvain-la-Neuve', 'Ottignies'])
+        self.assertEqual(self.index.get_cities('9999'), [])
+
+    def test_is_compatible_ignores_case_and_accents(self):
+        self.assertTrue(self.index.is_compatible('4000', 'LIEGE'))
+        self.assertTrue(self.index.is_compatible('1348', 'ottignies'))
+        self.assertFalse(self.index.is_compatible('5000', 'Liège'))
+        self.assertFalse(self.index.is_compatible('9999', 'Namur'))
+
+    def test_suggest_closest_first(self):
+        self.assertEqual(self.index.suggest('1348', 'otigny'), ['Ottignies', 'Louvain-la-Neuve'])
+        self.assertEqual(self.index.suggest('1348', 'louvain la neuve'), ['Louvain-la-Neuve', 'Ottignies'])
+
+    def test_snapshot_round_trip(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        path = os.path.join(directory.name, 'postal_codes.json')
+        postal_code_index.write_snapshot(self.index, path)
+        with open(path) as f:
+            self.assertCountEqual(PostalCodeIndex(json.load(f)), self.index)
+
+
+class PostalCodeIndexLoadingTestCase(SimpleTestCase):
+    def setUp(self):
+        patcher = mock.patch.multiple(postal_code_index, _index=None, _loaded_at=None)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    @mock.patch('continuing_education.business.postal_code_index._refresh_in_background')
+    def test_cold_index_refreshed_in_background(self, mock_refresh):
+        self.assertIsNone(postal_code_index.get_index())
+        self.assertTrue(mock_refresh.called)
+
+    @mock.patch('continuing_education.services.reference.CitiesService.get_cities')
+    def test_refresh_pages_through_cities(self, mock_get_cities):
+        mock_get_cities.side_effect = [
+            {'count': 3, 'results': [SimpleNamespace(zip_code=code, name=name) for code, name in CITIES[:2]]},
+            {'count': 3, 'results': [SimpleNamespace(zip_code=code, name=name) for code, name in CITIES[2:3]]},
+        ]
+        postal_code_index.refresh()
+        self.assertEqual(mock_get_cities.call_args_list[1][1]['offset'], 2)
+        self.assertIsNone(mock_get_cities.call_args_list[1][1]['person'])
+        self.assertTrue(postal_code_index.get_index().is_compatible('4000', 'Liege'))
+
+    @mock.patch('continuing_education.services.reference.CitiesService.get_cities')
+    def test_failed_refresh_keeps_index(self, mock_get_cities):
+        mock_get_cities.return_value = {'results': [], 'count': 0}
+        postal_code_index._index = PostalCodeIndex(CITIES)
+        postal_code_index.refresh()
+        self.assertEqual(len(postal_code_index._index), 3)
+
+    @mock.patch('continuing_education.services.reference.CitiesService.get_cities')
+    def test_refresh_failing_on_a_page_keeps_index(self, mock_get_cities):
+        mock_get_cities.side_effect = [
+            {'count': 3, 'results': [SimpleNamespace(zip_code=code, name=name) for code, name in CITIES[:2]]},
+            {'results': [], 'count': 0},
+        ]
+        postal_code_index._index = PostalCodeIndex(CITIES)
+        postal_code_index.refresh()
+        self.assertEqual(len(postal_code_index._index), 3)
+        self.assertIsNone(postal_code_index._loaded_at)
+
+    @mock.patch('continuing_education.business.postal_code_index._refresh_in_background')
+    def test_cold_start_from_snapshot(self, mock_refresh):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        path = os.path.join(directory.name, 'postal_codes.json')
+        postal_code_index.write_snapshot(PostalCodeIndex(CITIES), path)
+        with mock.patch.object(postal_code_index, 'SNAPSHOT_PATH', path):
+            index = postal_code_index.get_index()
+        self.assertTrue(index.is_compatible('5000', 'namur'))
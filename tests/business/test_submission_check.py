@@ -0,0 +1,178 @@
+##############################################################################
+#
+#    OSIS stands for Open Student Information System. It's an application
+#    designed to manage the core business of higher education institutions,
+#    such as universities, faculties, institutes and professional schools.
+#    The core business involves the administration of students, teachers,
+#    courses, programs and so on.
+#
+#    Copyright (C) 2015-2018 Université catholique de Louvain (http://www.uclouvain.be)
+#
+#    This program is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    A copy of this license - GNU General Public License - is available
+#    at the root of the source code of this program.  If not,
+#    see http://www.gnu.org/licenses/.
+#
+##############################################################################
+import time
+from unittest import mock
+
+from django.test import TestCase
+
+from base.tests.factories.person import PersonFactory
+from continuing_education.business import submission_check
+from continuing_education.business.postal_code_index import PostalCodeIndex
+from continuing_education.forms.account import ContinuingEducationPersonForm
+from continuing_education.forms.address import StrictAddressForm
+from continuing_education.forms.admission import StrictAdmissionForm
+from continuing_education.forms.person import StrictPersonForm
+from continuing_education.forms.registration import StrictRegistrationForm
+from continuing_education.tests.factories.admission import AdmissionDictFactory, RegistrationDictFactory
+from continuing_education.tests.factories.person import ContinuingEducationPersonDictFactory
+
+
+class SubmissionErrorsMemoizationTestCase(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.person = PersonFactory(gender='H')
+
+    def setUp(self):
+        submission_check.clear()
+        patcher = mock.patch('continuing_education.business.postal_code_index.is_loaded', return_value=True)
+        self.mock_is_loaded = patcher.start()
+        self.addCleanup(patcher.stop)
+        self.admission = AdmissionDictFactory(ContinuingEducationPersonDictFactory(self.person.uuid))
+        self.check = mock.Mock(return_value=({'Motivation': ['This field is required.']}, ['motivation']))
+
+    def test_unchanged_admission_is_checked_once(self):
+        hits = submission_check.get_stats().get('hits', 0)
+        for _ in range(3):
+            errors, errors_field = submission_check.get_or_check(self.admission, False, self.check)
+        self.check.assert_called_once_with()
+        self.assertEqual(errors, {'Motivation': ['This field is required.']})
+        self.assertEqual(errors_field, ['motivation'])
+        self.assertEqual(submission_check.get_stats()['hits'], hits + 2)
+
+    def test_changed_admission_is_checked_again(self):
+        submission_check.get_or_check(self.admission, False, self.check)
+        self.admission['motivation'] = 'new motivation'
+        submission_check.get_or_check(self.admission, False, self.check)
+        submission_check.get_or_check(self.admission, True, self.check)
+        self.assertEqual(self.check.call_count, 3)
+
+    def test_results_are_copied(self):
+        errors, errors_field = submission_check.get_or_check(self.admission, False, self.check)
+        errors_field.append('email')
+        errors.clear()
+        self.assertEqual(
+            submission_check.get_or_check(self.admission, False, self.check),
+            ({'Motivation': ['This field is required.']}, ['motivation'])
+        )
+
+    @mock.patch('continuing_education.business.submission_check._max_results', return_value=1)
+    def test_least_recently_checked_revision_is_evicted(self, mock_max_results):
+        other_admission = dict(self.admission, motivation='other motivation')
+        submission_check.get_or_check(self.admission, False, self.check)
+        submission_check.get_or_check(other_admission, False, self.check)
+        submission_check.get_or_check(self.admission, False, self.check)
+        self.assertEqual(self.check.call_count, 3)
+        self.assertEqual(submission_check.get_stats()['results'], 1)
+
+    def test_result_expires(self):
+        submission_check.get_or_check(self.admission, False, self.check)
+        with mock.patch('time.monotonic', return_value=time.monotonic() + submission_check._ttl()):
+            submission_check.get_or_check(self.admission, False, self.check)
+        self.assertEqual(self.check.call_count, 2)
+        self.assertEqual(submission_check.get_stats()['expired'], 1)
+
+    def test_not_kept_while_postal_code_index_is_cold(self):
+        self.mock_is_loaded.return_value = False
+        submission_check.get_or_check(self.admission, False, self.check)
+        submission_check.get_or_check(self.admission, False, self.check)
+        self.assertEqual(self.check.call_count, 2)
+        self.assertEqual(submission_check.get_stats()['results'], 0)
+
+
+class FormRulesTestCase(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.person = PersonFactory(gender='H')
+
+    def setUp(self):
+        self.person_information = ContinuingEducationPersonDictFactory(self.person.uuid)
+        self.admission = AdmissionDictFactory(self.person_information)
+        self.registration = RegistrationDictFactory(self.person_information)
+        patcher = mock.patch(
+            'continuing_education.business.postal_code_index.get_index',
+            return_value=PostalCodeIndex([('1348', 'Louvain-la-Neuve'), ('1000', 'Bruxelles')])
+        )
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        patcher = mock.patch(
+            'continuing_education.forms.address.CitiesService.get_cities',
+            return_value={'results': []}
+        )
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def assertSameErrorsAsForm(self, form_class, data):
+        rules = submission_check.get_rules(form_class, data)
+        form = form_class(data=dict(data) if data is not None else None)
+        self.assertEqual(
+            [(field, list(errors)) for field, errors in rules.check(data).items()],
+            [(field, list(errors)) for field, errors in form.errors.items()]
+        )
+        self.assertEqual(
+            {field: rules.labels[field] for field in form.errors},
+            {field: form[field].label for field in form.errors}
+        )
+
+    def test_complete_dicts(self):
+        self.assertSameErrorsAsForm(StrictPersonForm, self.person_information['person'])
+        self.assertSameErrorsAsForm(ContinuingEducationPersonForm, self.person_information)
+        self.assertSameErrorsAsForm(StrictAddressForm, self.admission['address'])
+        self.assertSameErrorsAsForm(StrictAdmissionForm, self.admission)
+        self.assertSameErrorsAsForm(StrictRegistrationForm, self.registration)
+
+    def test_missing_and_invalid_values(self):
+        self.admission.update(motivation='', citizenship=None, phone_mobile='not a phone')
+        self.assertSameErrorsAsForm(StrictAdmissionForm, self.admission)
+        self.assertSameErrorsAsForm(StrictAddressForm, {'location': '', 'postal_code': '1348'})
+        self.assertSameErrorsAsForm(StrictPersonForm, dict(self.person_information['person'], gender='', email='x'))
+
+    def test_required_additional_information(self):
+        self.admission['formation'] = dict(self.admission['formation'], additional_information_label='Why ?')
+        self.admission['additional_information'] = ''
+        self.assertSameErrorsAsForm(StrictAdmissionForm, self.admission)
+        self.assertIn('additional_information', submission_check.get_rules(StrictAdmissionForm, self.admission).check(
+            self.admission
+        ))
+
+    def test_no_identity_document(self):
+        self.registration.update(national_registry_number='', id_card_number='', passport_number='')
+        self.assertSameErrorsAsForm(StrictRegistrationForm, self.registration)
+
+    def test_belgian_addresses(self):
+        address = dict(self.admission['address'], country='BE')
+        for postal_code, city in [('1348', 'Louvain-la-Neuve'), ('1348', 'Bruxelles'), ('9999', 'Nowhere')]:
+            with self.subTest(postal_code=postal_code, city=city):
+                self.assertSameErrorsAsForm(StrictAddressForm, dict(address, postal_code=postal_code, city=city))
+
+    def test_no_person_data(self):
+        self.assertSameErrorsAsForm(StrictPersonForm, None)
+
+    def test_rules_are_built_once_per_form_class(self):
+        other_admission = AdmissionDictFactory(self.person_information)
+        self.assertIs(
+            submission_check.get_rules(StrictAdmissionForm, self.admission),
+            submission_check.get_rules(StrictAdmissionForm, other_admission)
+        )
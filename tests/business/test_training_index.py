@@ -0,0 +1,111 @@
+##############################################################################
+#
+#    OSIS stands for Open Student Information System. It's an application
+#    designed to manage the core business of higher education institutions,
+#    such as universities, faculties, institutes and professional schools.
+#    The core business involves the administration of students, teachers,
+#    courses, programs and so on.
+#
+#    Copyright (C) 2015-2018 Université catholique de Louvain (http://www.uclouvain.be)
+#
+#    This program is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    A copy of this license - GNU General Public License - is available
+#    at the root of the source code of this program.  If not,
+#    see http://www.gnu.org/licenses/.
+#
+##############################################################################
+from unittest import mock
+
+from django.test import SimpleTestCase
+
+from continuing_education.business import training_index
+from continuing_education.business.training_index import TrainingIndex
+
+
+def _training(acronym, title):
+    return {'education_group': {'acronym': acronym, 'title': title}}
+
+
+class TrainingIndexTestCase(SimpleTestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.index = TrainingIndex([
+            _training('THEO2FC', 'Certificat en théologie'),
+            _training('ECON2FC', 'Certificat en économie sociale'),
+            _training('DROI2FC', 'Droit européen des affaires'),
+            _training('TH2FC', 'Théâtre et mise en scène'),
+        ])
+
+    def _acronyms(self, query, limit=training_index.DEFAULT_LIMIT):
+        return [t['education_group']['acronym'] for t in self.index.search(query, limit)]
+
+    def test_fold(self):
+        self.assertEqual(training_index.fold('Économie Européenne'), 'economie europeenne')
+
+    def test_search_by_acronym_prefix(self):
+        self.assertEqual(self._acronyms('theo'), ['THEO2FC'])
+
+    def test_search_is_accent_insensitive(self):
+        self.assertEqual(self._acronyms('economie'), ['ECON2FC'])
+        self.assertEqual(self._acronyms('EUROPÉEN'), ['DROI2FC'])
+
+    def test_search_by_substring(self):
+        self.assertEqual(self._acronyms('ologie'), ['THEO2FC'])
+
+    def test_all_tokens_must_match(self):
+        self.assertEqual(self._acronyms('certificat sociale'), ['ECON2FC'])
+
+    def test_exact_acronym_is_ranked_first(self):
+        self.assertEqual(self._acronyms('th2fc')[0], 'TH2FC')
+
+    def test_acronym_prefix_is_ranked_before_title_match(self):
+        self.assertEqual(self._acronyms('th'), ['TH2FC', 'THEO2FC'])
+
+    def test_empty_query_returns_everything(self):
+        self.assertEqual(len(self._acronyms('')), 4)
+
+    def test_limit(self):
+        self.assertEqual(len(self._acronyms('certificat', limit=1)), 1)
+
+
+class TrainingIndexLoadingTestCase(SimpleTestCase):
+    def tearDown(self):
+        training_index._index = None
+        training_index._loaded_at = None
+
+    @mock.patch('continuing_education.business.training_index._refresh_in_background')
+    def test_search_returns_none_when_cold(self, mock_refresh):
+        self.assertIsNone(training_index.search('theo'))
+        self.assertTrue(mock_refresh.called)
+
+    @mock.patch('continuing_education.views.api.get_shared_data')
+    def test_refresh_loads_every_page(self, mock_list):
+        mock_list.side_effect = [
+            {'count': 2, 'results': [_training('THEO2FC', 'Théologie')]},
+            {'count': 2, 'results': [_training('ECON2FC', 'Économie')]},
+        ]
+        training_index.refresh()
+        self.assertEqual(mock_list.call_count, 2)
+        self.assertEqual(mock_list.call_args[1]['params']['offset'], 1)
+        with mock.patch('continuing_education.business.training_index._refresh_in_background') as mock_refresh:
+            trainings = training_index.search('eco')
+        self.assertFalse(mock_refresh.called)
+        self.assertEqual(trainings, [_training('ECON2FC', 'Économie')])
+
+    @mock.patch('continuing_education.views.api.get_shared_data')
+    def test_refresh_bypasses_the_training_cache(self, mock_list):
+        mock_list.return_value = {'count': 1, 'results': [_training('THEO2FC', 'Théologie')]}
+        with mock.patch('continuing_education.services.training_cache.get_or_fetch') as mock_get_or_fetch:
+            training_index.refresh()
+        self.assertFalse(mock_get_or_fetch.called)
+        self.assertEqual(training_index.get_stats()['trainings'], 1)
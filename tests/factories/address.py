@@ -24,7 +24,9 @@
 #
 ##############################################################################
 
-import factory
+import string
+
+import factory.fuzzy
 
 
 def AddressDictFactory():
@@ -33,7 +35,7 @@ def AddressDictFactory():
         'postal_code': '1348',
         'country': {
             'name': 'COUNTRY',
-            'iso_code': factory.Sequence(lambda n: str(n)[-2:])
+            'iso_code': factory.fuzzy.FuzzyText(length=2, chars=string.digits).fuzz()
         },
         'city': 'CITY'
     }
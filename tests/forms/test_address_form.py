@@ -0,0 +1,77 @@
+##############################################################################
+#
+#    OSIS stands for Open Student Information System. It's an application
+#    designed to manage the core business of higher education institutions,
+#    such as universities, faculties, institutes and professional schools.
+#    The core business involves the administration of students, teachers,
+#    courses, programs and so on.
+#
+#    Copyright (C) 2015-2018 Université catholique de Louvain (http://www.uclouvain.be)
+#
+#    This program is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    A copy of this license - GNU General Public License - is available
+#    at the root of the source code of this program.  If not,
+#    see http://www.gnu.org/licenses/.
+#
+##############################################################################
+from types import SimpleNamespace
+from unittest import mock
+
+from django.test import SimpleTestCase
+
+from continuing_education.business.postal_code_index import PostalCodeIndex
+from continuing_education.forms.address import AddressForm, BELGIUM_ISO_CODE
+
+INDEX = PostalCodeIndex([('1348', 'Louvain-la-Neuve'), ('1348', 'Ottignies'), ('4000', 'Liège')])
+
+
+class AddressFormTestCase(SimpleTestCase):
+    def _form(self, postal_code, city):
+        form = AddressForm(data={
+            'country': BELGIUM_ISO_CODE, 'postal_code': postal_code, 'city': city, 'location': 'Rue 1'
+        })
+        form.fields['country'].choices = [(BELGIUM_ISO_CODE, 'Belgique')]
+        return form
+
+    @mock.patch('continuing_education.forms.address.CitiesService.get_cities')
+    @mock.patch('continuing_education.business.postal_code_index.get_index', return_value=INDEX)
+    def test_belgian_city_checked_against_local_index(self, mock_index, mock_get_cities):
+        self.assertTrue(self._form('4000', 'liege').is_valid())
+        self.assertFalse(mock_get_cities.called)
+
+    @mock.patch('continuing_education.business.postal_code_index.get_index', return_value=INDEX)
+    def test_belgian_city_not_matching_postal_code_closest_first(self, mock_index):
+        form = self._form('1348', 'Otignie')
+        self.assertFalse(form.is_valid())
+        self.assertIn('Ottignies, Louvain-la-Neuve', form.errors['postal_code'][0])
+
+    @mock.patch('continuing_education.forms.address.CitiesService.get_cities')
+    @mock.patch('continuing_education.business.postal_code_index.get_index', return_value=INDEX)
+    def test_belgian_postal_code_not_found(self, mock_index, mock_get_cities):
+        mock_get_cities.return_value = {'results': [], 'count': 0}
+        form = self._form('9999', 'Liège')
+        self.assertFalse(form.is_valid())
+        self.assertIn('9999', form.errors['postal_code'][0])
+
+    @mock.patch('continuing_education.forms.address.CitiesService.get_cities')
+    @mock.patch('continuing_education.business.postal_code_index.get_index', return_value=INDEX)
+    def test_reference_api_used_for_postal_code_missing_from_index(self, mock_index, mock_get_cities):
+        mock_get_cities.return_value = {'results': [SimpleNamespace(name='Namur')], 'count': 1}
+        self.assertTrue(self._form('5000', 'Namur').is_valid())
+        mock_get_cities.assert_called_once_with(person=None, zip_code='5000')
+
+    @mock.patch('continuing_education.forms.address.CitiesService.get_cities')
+    @mock.patch('continuing_education.business.postal_code_index.get_index', return_value=None)
+    def test_reference_api_used_while_index_cold(self, mock_index, mock_get_cities):
+        mock_get_cities.return_value = {'results': [SimpleNamespace(name='Liège')], 'count': 1}
+        self.assertTrue(self._form('4000', 'Liege').is_valid())
+        mock_get_cities.assert_called_once_with(person=None, zip_code='4000')
@@ -0,0 +1,78 @@
+##############################################################################
+#
+#    OSIS stands for Open Student Information System. It's an application
+#    designed to manage the core business of higher education institutions,
+#    such as universities, faculties, institutes and professional schools.
+#    The core business involves the administration of students, teachers,
+#    courses, programs and so on.
+#
+#    Copyright (C) 2015-2018 Université catholique de Louvain (http://www.uclouvain.be)
+#
+#    This program is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    A copy of this license - GNU General Public License - is available
+#    at the root of the source code of this program.  If not,
+#    see http://www.gnu.org/licenses/.
+#
+##############################################################################
+from unittest import mock
+
+from django.test import SimpleTestCase
+
+from continuing_education.services import circuit_breaker
+from continuing_education.services.circuit_breaker import CircuitBreaker
+
+
+class CircuitBreakerTestCase(SimpleTestCase):
+    def setUp(self):
+        self.breaker = CircuitBreaker(failure_threshold=2, reset_timeout=30)
+
+    def test_opens_after_threshold(self):
+        self.breaker.record_failure()
+        self.assertTrue(self.breaker.allow_request())
+        self.breaker.record_failure()
+        self.assertEqual(self.breaker.state, circuit_breaker.OPEN)
+        self.assertFalse(self.breaker.allow_request())
+        self.assertEqual(self.breaker.get_stats()['trips'], 1)
+        self.assertEqual(self.breaker.get_stats()['rejected'], 1)
+
+    def test_success_resets_failures(self):
+        self.breaker.record_failure()
+        self.breaker.record_success()
+        self.breaker.record_failure()
+        self.assertEqual(self.breaker.state, circuit_breaker.CLOSED)
+
+    def test_single_trial_when_half_open(self):
+        self.breaker.record_failure()
+        self.breaker.record_failure()
+        with mock.patch('time.monotonic', return_value=self.breaker.opened_at + 31):
+            self.assertEqual(self.breaker.state, circuit_breaker.HALF_OPEN)
+            self.assertTrue(self.breaker.allow_request())
+            self.assertFalse(self.breaker.allow_request())
+        self.breaker.record_success()
+        self.assertEqual(self.breaker.state, circuit_breaker.CLOSED)
+
+    def test_failed_trial_opens_again(self):
+        self.breaker.record_failure()
+        self.breaker.record_failure()
+        with mock.patch('time.monotonic', return_value=self.breaker.opened_at + 31):
+            self.assertTrue(self.breaker.allow_request())
+            self.breaker.record_failure()
+            self.assertEqual(self.breaker.state, circuit_breaker.OPEN)
+
+    def test_released_trial_lets_another_one_through(self):
+        self.breaker.record_failure()
+        self.breaker.record_failure()
+        with mock.patch('time.monotonic', return_value=self.breaker.opened_at + 31):
+            self.assertEqual(self.breaker.allow_request(), circuit_breaker.TRIAL)
+            self.breaker.release_trial()
+            self.assertEqual(self.breaker.state, circuit_breaker.HALF_OPEN)
+            self.assertEqual(self.breaker.allow_request(), circuit_breaker.TRIAL)
@@ -0,0 +1,95 @@
+##############################################################################
+#
+#    OSIS stands for Open Student Information System. It's an application
+#    designed to manage the core business of higher education institutions,
+#    such as universities, faculties, institutes and professional schools.
+#    The core business involves the administration of students, teachers,
+#    courses, programs and so on.
+#
+#    Copyright (C) 2015-2018 Université catholique de Louvain (http://www.uclouvain.be)
+#
+#    This program is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    A copy of this license - GNU General Public License - is available
+#    at the root of the source code of this program.  If not,
+#    see http://www.gnu.org/licenses/.
+#
+##############################################################################
+from unittest import mock
+
+from django.http import Http404
+from django.test import SimpleTestCase
+from requests import Response
+
+from continuing_education.services import conditional_get
+
+
+def build_response(status_code, content=b'', **headers):
+    response = Response()
+    response.status_code = status_code
+    response._content = content
+    response.headers.update(headers)
+    return response
+
+
+def read(response):
+    if response.status_code == 404:
+        raise Http404
+    return response.content
+
+
+class ConditionalGetTestCase(SimpleTestCase):
+    def setUp(self):
+        conditional_get.clear()
+        self.addCleanup(conditional_get.clear)
+        self.get = mock.Mock(return_value=build_response(200, b'{"state": "Draft"}', ETag='"v1"'))
+
+    def test_stored_representation_is_revalidated(self):
+        stats = conditional_get.get_stats()
+        conditional_get.get_content('key', self.get, read)
+        self.get.return_value = build_response(304)
+        self.assertEqual(conditional_get.get_content('key', self.get, read), b'{"state": "Draft"}')
+        self.assertEqual(self.get.call_args_list[0][0][0], {})
+        self.assertEqual(self.get.call_args_list[1][0][0], {'If-None-Match': '"v1"'})
+        self.assertEqual(conditional_get.get_stats()['not_modified'], stats.get('not_modified', 0) + 1)
+        self.assertEqual(
+            conditional_get.get_stats()['bytes_saved'], stats.get('bytes_saved', 0) + len(b'{"state": "Draft"}')
+        )
+
+    def test_modified_representation_replaces_the_stored_one(self):
+        conditional_get.get_content('key', self.get, read)
+        self.get.return_value = build_response(
+            200, b'{"state": "Submitted"}', **{'Last-Modified': 'Sun, 18 Oct 2026 10:00:00 GMT'}
+        )
+        self.assertEqual(conditional_get.get_content('key', self.get, read), b'{"state": "Submitted"}')
+        conditional_get.get_content('key', self.get, read)
+        self.assertEqual(self.get.call_args[0][0], {'If-Modified-Since': 'Sun, 18 Oct 2026 10:00:00 GMT'})
+
+    def test_response_without_validator_is_not_stored(self):
+        self.get.return_value = build_response(200, b'{}')
+        conditional_get.get_content('key', self.get, read)
+        conditional_get.get_content('key', self.get, read)
+        self.assertEqual(self.get.call_args[0][0], {})
+        self.assertEqual(conditional_get.get_stats()['stored'], 0)
+
+    def test_errors_are_raised_and_not_stored(self):
+        self.get.return_value = build_response(404, ETag='"v1"')
+        with self.assertRaises(Http404):
+            conditional_get.get_content('key', self.get, read)
+        self.assertEqual(conditional_get.get_stats()['stored'], 0)
+
+    @mock.patch.object(conditional_get, 'STORE_MAX_BYTES', 30)
+    def test_least_recently_used_representations_are_evicted(self):
+        conditional_get.get_content('first', self.get, read)
+        conditional_get.get_content('second', self.get, read)
+        self.assertIsNone(conditional_get.lookup('first'))
+        self.assertIsNotNone(conditional_get.lookup('second'))
+        self.assertEqual(conditional_get.get_stats()['stored_bytes'], len(b'{"state": "Draft"}'))
@@ -0,0 +1,92 @@
+##############################################################################
+#
+#    OSIS stands for Open Student Information System. It's an application
+#    designed to manage the core business of higher education institutions,
+#    such as universities, faculties, institutes and professional schools.
+#    The core business involves the administration of students, teachers,
+#    courses, programs and so on.
+#
+#    Copyright (C) 2015-2018 Université catholique de Louvain (http://www.uclouvain.be)
+#
+#    This program is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    A copy of this license - GNU General Public License - is available
+#    at the root of the source code of this program.  If not,
+#    see http://www.gnu.org/licenses/.
+#
+##############################################################################
+from types import SimpleNamespace
+from unittest import mock
+
+from django.core.cache import cache
+from django.test import SimpleTestCase, override_settings
+
+from continuing_education.services import country_cache
+
+LOCMEM_CACHES = {'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}}
+
+
+def _page(countries, count=None):
+    return SimpleNamespace(
+        results=[SimpleNamespace(iso_code=iso_code, name=name) for iso_code, name in countries],
+        count=len(countries) if count is None else count
+    )
+
+
+@override_settings(CACHES=LOCMEM_CACHES)
+class CountryCacheTestCase(SimpleTestCase):
+    def setUp(self):
+        cache.clear()
+        patcher = mock.patch.dict(country_cache._tables, clear=True)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.person = SimpleNamespace(language='fr-be')
+        patcher = mock.patch('continuing_education.services.country_cache.CountryService.get_countries')
+        self.mock_get_countries = patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_countries_loaded_once(self):
+        self.mock_get_countries.return_value = _page([('BE', 'Belgique'), ('FR', 'France')])
+        self.assertEqual(country_cache.get_country_name(self.person, 'BE'), 'Belgique')
+        self.assertEqual(country_cache.get_country_name(self.person, 'FR'), 'France')
+        self.assertEqual(self.mock_get_countries.call_count, 1)
+
+    def test_countries_loaded_by_pages(self):
+        self.mock_get_countries.side_effect = [_page([('BE', 'Belgique')], count=2), _page([('FR', 'France')], count=2)]
+        self.assertEqual(country_cache.get_countries(self.person), {'BE': 'Belgique', 'FR': 'France'})
+        self.assertEqual(self.mock_get_countries.call_args_list[1][1]['offset'], 1)
+
+    def test_one_table_per_language(self):
+        self.mock_get_countries.side_effect = [_page([('BE', 'Belgique')]), _page([('BE', 'Belgium')])]
+        self.assertEqual(country_cache.get_country_name(self.person, 'BE'), 'Belgique')
+        self.assertEqual(country_cache.get_country_name(SimpleNamespace(language='en'), 'BE'), 'Belgium')
+
+    def test_table_shared_between_processes(self):
+        self.mock_get_countries.return_value = _page([('BE', 'Belgique')])
+        country_cache.get_countries(self.person)
+        country_cache._tables.clear()
+        self.assertEqual(country_cache.get_country_name(self.person, 'BE'), 'Belgique')
+        self.assertEqual(self.mock_get_countries.call_count, 1)
+
+    def test_unknown_country_looked_up_alone(self):
+        self.mock_get_countries.side_effect = [_page([('BE', 'Belgique')]), _page([('XK', 'Kosovo')])]
+        self.assertEqual(country_cache.get_country_name(self.person, 'XK'), 'Kosovo')
+        self.assertEqual(self.mock_get_countries.call_args_list[1][1]['iso_code'], 'XK')
+
+    def test_incomplete_table_not_shared(self):
+        self.mock_get_countries.side_effect = [_page([('BE', 'Belgique')], count=2), _page([], count=2)]
+        self.assertEqual(country_cache.get_countries(self.person), {'BE': 'Belgique'})
+        self.assertIsNone(cache.get('{}:fr-be'.format(country_cache.CACHE_PREFIX)))
+
+    def test_empty_table_not_shared(self):
+        self.mock_get_countries.return_value = _page([])
+        self.assertEqual(country_cache.get_countries(self.person), {})
+        self.assertIsNone(cache.get('{}:fr-be'.format(country_cache.CACHE_PREFIX)))
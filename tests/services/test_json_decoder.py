@@ -0,0 +1,61 @@
+##############################################################################
+#
+#    OSIS stands for Open Student Information System. It's an application
+#    designed to manage the core business of higher education institutions,
+#    such as universities, faculties, institutes and professional schools.
+#    The core business involves the administration of students, teachers,
+#    courses, programs and so on.
+#
+#    Copyright (C) 2015-2018 Université catholique de Louvain (http://www.uclouvain.be)
+#
+#    This program is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    A copy of this license - GNU General Public License - is available
+#    at the root of the source code of this program.  If not,
+#    see http://www.gnu.org/licenses/.
+#
+##############################################################################
+import json
+from unittest import mock
+
+from django.test import SimpleTestCase, override_settings
+from requests import Response
+
+from continuing_education.services import json_decoder
+from continuing_education.views.api import transform_response_to_data
+
+
+def upper_keys_loads(content):
+    return {key.upper(): value for key, value in json.loads(content).items()}
+
+
+class JsonDecoderTestCase(SimpleTestCase):
+    def setUp(self):
+        json_decoder.reset()
+        self.addCleanup(json_decoder.reset)
+
+    def test_loads_bytes_and_str(self):
+        self.assertEqual(json_decoder.loads(b'{"city": "Li\\u00e8ge", "count": 2}'), {'city': 'Liège', 'count': 2})
+        self.assertEqual(json_decoder.loads('{"results": []}'), {'results': []})
+
+    @mock.patch.object(json_decoder, 'orjson', None)
+    def test_stdlib_without_orjson(self):
+        self.assertIs(json_decoder.get_loads(), json.loads)
+
+    @override_settings(OSIS_JSON_DECODER='continuing_education.tests.services.test_json_decoder.upper_keys_loads')
+    def test_configured_decoder(self):
+        self.assertEqual(json_decoder.loads(b'{"uuid": "1"}'), {'UUID': '1'})
+
+    def test_transform_response_to_data(self):
+        response = Response()
+        response.status_code = 200
+        response._content = json.dumps({'results': [{'acronym': 'ACRONYM'}]}).encode()
+        self.assertEqual(transform_response_to_data(response), {'results': [{'acronym': 'ACRONYM'}]})
@@ -0,0 +1,114 @@
+##############################################################################
+#
+#    OSIS stands for Open Student Information System. It's an application
+#    designed to manage the core business of higher education institutions,
+#    such as universities, faculties, institutes and professional schools.
+#    The core business involves the administration of students, teachers,
+#    courses, programs and so on.
+#
+#    Copyright (C) 2015-2018 Université catholique de Louvain (http://www.uclouvain.be)
+#
+#    This program is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    A copy of this license - GNU General Public License - is available
+#    at the root of the source code of this program.  If not,
+#    see http://www.gnu.org/licenses/.
+#
+##############################################################################
+import asyncio
+from unittest import mock
+
+import httpx
+import requests
+from django.test import SimpleTestCase
+
+from continuing_education.services import osis_async, osis_http
+
+URL = 'https://osis.test/api/'
+
+
+class OsisAsyncTestCase(SimpleTestCase):
+    def setUp(self):
+        osis_http._breakers.clear()
+        self.addCleanup(osis_http._breakers.clear)
+        self.requests = []
+        self.responses = []
+        sleep_patcher = mock.patch('asyncio.sleep', new=mock.AsyncMock())
+        sleep_patcher.start()
+        self.addCleanup(sleep_patcher.stop)
+
+    def _handler(self, request):
+        self.requests.append(request)
+        response = self.responses.pop(0)
+        if isinstance(response, BaseException):
+            raise response
+        return httpx.Response(response, json={'status': response})
+
+    def run_request(self, method, **kwargs):
+        async def send():
+            with mock.patch.object(
+                osis_async, 'get_client',
+                return_value=httpx.AsyncClient(transport=httpx.MockTransport(self._handler))
+            ):
+                return await osis_async.request(method, URL, **kwargs)
+        return asyncio.run(send())
+
+    def test_client_is_shared_within_an_event_loop(self):
+        async def clients():
+            client = osis_async.get_client()
+            same_client = osis_async.get_client()
+            await osis_async.close_client()
+            return client, same_client
+        client, same_client = asyncio.run(clients())
+        self.assertIs(client, same_client)
+
+    def test_get(self):
+        self.responses = [200]
+        response = self.run_request('GET', params={'limit': 10})
+        self.assertEqual(response.json(), {'status': 200})
+        self.assertEqual(self.requests[0].url.params['limit'], '10')
+
+    def test_get_is_retried_on_gateway_errors(self):
+        self.responses = [503, 200]
+        self.assertEqual(self.run_request('GET').status_code, 200)
+        self.assertEqual(len(self.requests), 2)
+
+    def test_post_is_not_retried(self):
+        self.responses = [503]
+        self.assertEqual(self.run_request('POST', json={}).status_code, 503)
+        self.assertEqual(len(self.requests), 1)
+
+    def test_errors_are_raised_as_requests_errors(self):
+        self.responses = [httpx.ConnectError('refused')] * (1 + osis_http.MAX_RETRIES)
+        with self.assertRaises(requests.exceptions.ConnectionError):
+            self.run_request('GET')
+        self.responses = [httpx.ReadTimeout('slow')]
+        with self.assertRaises(requests.exceptions.Timeout):
+            self.run_request('POST')
+
+    def test_open_breaker_is_shared_with_sync_client(self):
+        breaker = osis_http.get_breaker(URL)
+        for _ in range(breaker.failure_threshold):
+            breaker.record_failure()
+        with self.assertRaises(osis_http.OsisUnavailable):
+            self.run_request('GET')
+        self.assertEqual(self.requests, [])
+
+    def test_cancelled_trial_is_released(self):
+        breaker = osis_http.get_breaker(URL)
+        for _ in range(breaker.failure_threshold):
+            breaker.record_failure()
+        with mock.patch('time.monotonic', return_value=breaker.opened_at + breaker.reset_timeout):
+            self.responses = [asyncio.CancelledError()]
+            with self.assertRaises(asyncio.CancelledError):
+                self.run_request('GET')
+            self.responses = [200]
+            self.assertEqual(self.run_request('GET').status_code, 200)
@@ -0,0 +1,95 @@
+##############################################################################
+#
+#    OSIS stands for Open Student Information System. It's an application
+#    designed to manage the core business of higher education institutions,
+#    such as universities, faculties, institutes and professional schools.
+#    The core business involves the administration of students, teachers,
+#    courses, programs and so on.
+#
+#    Copyright (C) 2015-2018 Université catholique de Louvain (http://www.uclouvain.be)
+#
+#    This program is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    A copy of this license - GNU General Public License - is available
+#    at the root of the source code of this program.  If not,
+#    see http://www.gnu.org/licenses/.
+#
+##############################################################################
+import threading
+import time
+
+from django.http import Http404
+from django.test import SimpleTestCase
+
+from continuing_education.services import osis_fetch
+from continuing_education.services.osis_fetch import Fetch
+
+
+class OsisFetchTestCase(SimpleTestCase):
+    def test_results_are_passed_to_dependent_fetches(self):
+        results = osis_fetch.run([
+            ('person', Fetch(lambda: {'uuid': 'person-uuid'})),
+            ('admissions', Fetch(lambda person: [person['uuid']], depends_on=['person'])),
+            ('training', Fetch(lambda: 'TRAINING')),
+        ])
+        self.assertEqual(results, {
+            'person': {'uuid': 'person-uuid'},
+            'admissions': ['person-uuid'],
+            'training': 'TRAINING',
+        })
+
+    def test_independent_fetches_run_concurrently(self):
+        barrier = threading.Barrier(2, timeout=5)
+        results = osis_fetch.run([
+            ('first', Fetch(barrier.wait)),
+            ('second', Fetch(barrier.wait)),
+        ])
+        self.assertEqual(set(results), {'first', 'second'})
+
+    def test_first_declared_error_is_raised(self):
+        def slow_not_found():
+            time.sleep(0.05)
+            raise Http404
+
+        def fast_error():
+            raise ValueError
+
+        with self.assertRaises(Http404):
+            osis_fetch.run([
+                ('admission', Fetch(slow_not_found)),
+                ('training', Fetch(fast_error)),
+            ])
+
+    def test_dependents_of_failed_fetch_are_not_called(self):
+        called = []
+
+        def fail():
+            raise Http404
+
+        with self.assertRaises(Http404):
+            osis_fetch.run([
+                ('admission', Fetch(fail)),
+                ('formation', Fetch(lambda admission: called.append(admission), depends_on=['admission'])),
+            ])
+        self.assertEqual(called, [])
+
+    def test_dependency_must_be_declared_before(self):
+        with self.assertRaises(ValueError):
+            osis_fetch.run([
+                ('formation', Fetch(lambda admission: admission, depends_on=['admission'])),
+                ('admission', Fetch(lambda: None)),
+            ])
+
+    def test_nested_run_is_sequential(self):
+        results = osis_fetch.run([
+            ('outer', Fetch(lambda: osis_fetch.run([('inner', Fetch(lambda: 1))])['inner'])),
+        ])
+        self.assertEqual(results['outer'], 1)
@@ -0,0 +1,142 @@
+##############################################################################
+#
+#    OSIS stands for Open Student Information System. It's an application
+#    designed to manage the core business of higher education institutions,
+#    such as universities, faculties, institutes and professional schools.
+#    The core business involves the administration of students, teachers,
+#    courses, programs and so on.
+#
+#    Copyright (C) 2015-2018 Université catholique de Louvain (http://www.uclouvain.be)
+#
+#    This program is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    A copy of this license - GNU General Public License - is available
+#    at the root of the source code of this program.  If not,
+#    see http://www.gnu.org/licenses/.
+#
+##############################################################################
+from unittest import mock
+
+import requests
+from django.test import SimpleTestCase
+from requests import Response
+
+from continuing_education.services import osis_http
+
+
+class OsisHttpTestCase(SimpleTestCase):
+    def setUp(self):
+        osis_http.close_session()
+        osis_http._breakers.clear()
+        self.addCleanup(osis_http.close_session)
+        self.addCleanup(osis_http._breakers.clear)
+
+    def test_session_is_shared(self):
+        self.assertIs(osis_http.get_session(), osis_http.get_session())
+
+    def test_session_is_rebuilt_after_fork(self):
+        session = osis_http.get_session()
+        with mock.patch('os.getpid', return_value=-1):
+            self.assertIsNot(osis_http.get_session(), session)
+
+    def test_session_uses_configured_pool(self):
+        adapter = osis_http.get_session().get_adapter('https://osis.test/')
+        self.assertEqual(adapter._pool_maxsize, osis_http.POOL_MAXSIZE)
+        self.assertEqual(adapter._pool_connections, osis_http.POOL_CONNECTIONS)
+
+    @mock.patch('requests.Session.request')
+    def test_requests_go_through_session(self, mock_request):
+        mock_request.return_value = _response(200)
+        osis_http.get('https://osis.test/api/', headers={})
+        osis_http.post('https://osis.test/api/', json={})
+        self.assertEqual(mock_request.call_count, 2)
+        self.assertEqual(mock_request.call_args_list[0][0], ('GET', 'https://osis.test/api/'))
+        requests_count = osis_http.get_pool_stats()['requests']
+        self.assertGreaterEqual(requests_count['GET'], 1)
+        self.assertGreaterEqual(requests_count['POST'], 1)
+
+    def test_pool_stats_without_session(self):
+        stats = osis_http.get_pool_stats()
+        self.assertEqual(stats['hosts'], {})
+        self.assertEqual(stats['pool_maxsize'], osis_http.POOL_MAXSIZE)
+
+
+def _response(status_code):
+    response = Response()
+    response.status_code = status_code
+    return response
+
+
+@mock.patch('time.sleep')
+@mock.patch('requests.Session.request')
+class OsisHttpResilienceTestCase(SimpleTestCase):
+    url = 'https://osis.test/api/'
+
+    def setUp(self):
+        osis_http._breakers.clear()
+        self.addCleanup(osis_http._breakers.clear)
+
+    def test_timeout_per_operation(self, mock_request, mock_sleep):
+        mock_request.return_value = _response(200)
+        osis_http.get(self.url)
+        self.assertEqual(mock_request.call_args[1]['timeout'], osis_http.TIMEOUTS[osis_http.READ])
+        osis_http.post(self.url, operation=osis_http.TOKEN)
+        self.assertEqual(mock_request.call_args[1]['timeout'], osis_http.TIMEOUTS[osis_http.TOKEN])
+
+    def test_get_is_retried(self, mock_request, mock_sleep):
+        mock_request.side_effect = [requests.exceptions.ConnectTimeout(), _response(503), _response(200)]
+        response = osis_http.get(self.url)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(mock_request.call_count, 3)
+        self.assertEqual(mock_sleep.call_count, 2)
+
+    def test_get_gives_up_after_max_retries(self, mock_request, mock_sleep):
+        mock_request.side_effect = requests.exceptions.ReadTimeout()
+        with self.assertRaises(requests.exceptions.ReadTimeout):
+            osis_http.get(self.url)
+        self.assertEqual(mock_request.call_count, 1 + osis_http.MAX_RETRIES)
+
+    def test_post_is_not_retried(self, mock_request, mock_sleep):
+        mock_request.return_value = _response(503)
+        response = osis_http.post(self.url)
+        self.assertEqual(response.status_code, 503)
+        self.assertEqual(mock_request.call_count, 1)
+
+    def test_client_errors_are_not_retried(self, mock_request, mock_sleep):
+        mock_request.return_value = _response(404)
+        osis_http.get(self.url)
+        self.assertEqual(mock_request.call_count, 1)
+
+    def test_breaker_fails_fast(self, mock_request, mock_sleep):
+        mock_request.side_effect = requests.exceptions.ConnectionError()
+        for _ in range(osis_http.BREAKER_FAILURE_THRESHOLD):
+            with self.assertRaises(requests.exceptions.ConnectionError):
+                osis_http.post(self.url)
+        mock_request.reset_mock()
+        with self.assertRaises(osis_http.OsisUnavailable):
+            osis_http.get(self.url)
+        self.assertFalse(mock_request.called)
+        breaker_stats = osis_http.get_pool_stats()['circuit_breakers']['osis.test']
+        self.assertEqual(breaker_stats['state'], 'open')
+        self.assertEqual(breaker_stats['trips'], 1)
+
+    def test_interrupted_trial_is_released(self, mock_request, mock_sleep):
+        breaker = osis_http.get_breaker(self.url)
+        for _ in range(breaker.failure_threshold):
+            breaker.record_failure()
+        mock_request.side_effect = KeyboardInterrupt()
+        with mock.patch('time.monotonic', return_value=breaker.opened_at + breaker.reset_timeout):
+            with self.assertRaises(KeyboardInterrupt):
+                osis_http.post(self.url)
+            mock_request.side_effect = None
+            mock_request.return_value = _response(200)
+            self.assertEqual(osis_http.post(self.url).status_code, 200)
+        self.assertEqual(breaker.state, 'closed')
@@ -0,0 +1,117 @@
+##############################################################################
+#
+#    OSIS stands for Open Student Information System. It's an application
+#    designed to manage the core business of higher education institutions,
+#    such as universities, faculties, institutes and professional schools.
+#    The core business involves the administration of students, teachers,
+#    courses, programs and so on.
+#
+#    Copyright (C) 2015-2018 Université catholique de Louvain (http://www.uclouvain.be)
+#
+#    This program is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    A copy of this license - GNU General Public License - is available
+#    at the root of the source code of this program.  If not,
+#    see http://www.gnu.org/licenses/.
+#
+##############################################################################
+import os
+import tempfile
+import time
+from unittest import mock
+
+from django.core.cache import cache
+from django.test import SimpleTestCase, override_settings
+
+from continuing_education.services import pdf_cache
+
+LOCMEM_CACHES = {'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}}
+
+
+class ContentHashTestCase(SimpleTestCase):
+    def test_hash_does_not_depend_on_keys_order(self):
+        self.assertEqual(
+            pdf_cache.content_hash({'last_name': 'Dupont', 'first_name': 'Jean'}),
+            pdf_cache.content_hash({'first_name': 'Jean', 'last_name': 'Dupont'})
+        )
+
+    def test_hash_changes_with_data(self):
+        self.assertNotEqual(
+            pdf_cache.content_hash({'last_name': 'Dupont'}),
+            pdf_cache.content_hash({'last_name': 'Dupond'})
+        )
+
+    def test_hash_changes_with_template(self):
+        data = {'last_name': 'Dupont'}
+        content_hash = pdf_cache.content_hash(data)
+        with mock.patch('continuing_education.services.pdf_cache.template_version', return_value='new'):
+            self.assertNotEqual(pdf_cache.content_hash(data), content_hash)
+
+
+class FileSystemPdfStorageTestCase(SimpleTestCase):
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.storage = pdf_cache.FileSystemPdfStorage(location=directory.name, max_size=10)
+
+    def test_get_missing(self):
+        self.assertIsNone(self.storage.get('missing'))
+
+    def test_set_then_get(self):
+        self.storage.set('key', b'pdf')
+        self.assertEqual(self.storage.get('key'), b'pdf')
+
+    def test_least_recently_used_evicted(self):
+        self.storage.set('first', b'12345')
+        self.storage.set('second', b'12345')
+        os.utime(self.storage._path('first'), (0, 0))
+        self.assertEqual(self.storage.set('third', b'12345'), 1)
+        self.assertIsNone(self.storage.get('first'))
+        self.assertEqual(self.storage.get('second'), b'12345')
+        self.assertEqual(self.storage.get('third'), b'12345')
+
+
+@override_settings(CACHES=LOCMEM_CACHES)
+class CachePdfStorageTestCase(SimpleTestCase):
+    def setUp(self):
+        cache.clear()
+        self.storage = pdf_cache.CachePdfStorage(max_size=10)
+
+    def test_set_then_get(self):
+        self.storage.set('key', b'pdf')
+        self.assertEqual(self.storage.get('key'), b'pdf')
+
+    def test_oldest_evicted(self):
+        self.storage.set('first', b'12345')
+        self.storage.set('second', b'12345')
+        self.assertEqual(self.storage.set('third', b'12345'), 1)
+        self.assertIsNone(self.storage.get('first'))
+        self.assertEqual(self.storage.get('third'), b'12345')
+
+    @override_settings(CONTINUING_EDUCATION_PDF_CACHE_TTL=60)
+    def test_entry_left_out_of_the_index_expires(self):
+        self.storage.set('key', b'pdf')
+        cache.delete(pdf_cache.INDEX_KEY)
+        with mock.patch('time.time', return_value=time.time() + 61):
+            self.assertIsNone(self.storage.get('key'))
+
+
+@override_settings(CACHES=LOCMEM_CACHES)
+class GetOrRenderTestCase(SimpleTestCase):
+    def setUp(self):
+        cache.clear()
+
+    @mock.patch('continuing_education.business.pdf_filler.write_fillable_pdf', return_value=b'pdf')
+    def test_rendered_once(self, mock_write):
+        data = {'last_name': 'Dupont'}
+        self.assertEqual(pdf_cache.get_or_render(data), b'pdf')
+        self.assertEqual(pdf_cache.get_or_render(data), b'pdf')
+        mock_write.assert_called_once_with(data)
@@ -0,0 +1,129 @@
+##############################################################################
+#
+#    OSIS stands for Open Student Information System. It's an application
+#    designed to manage the core business of higher education institutions,
+#    such as universities, faculties, institutes and professional schools.
+#    The core business involves the administration of students, teachers,
+#    courses, programs and so on.
+#
+#    Copyright (C) 2015-2018 Université catholique de Louvain (http://www.uclouvain.be)
+#
+#    This program is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    A copy of this license - GNU General Public License - is available
+#    at the root of the source code of this program.  If not,
+#    see http://www.gnu.org/licenses/.
+#
+##############################################################################
+import threading
+from unittest import mock
+
+from django.core.cache import cache
+from django.test import SimpleTestCase, override_settings
+
+from continuing_education.services import single_flight
+
+LOCMEM_CACHES = {'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}}
+
+
+class SingleFlightTestCase(SimpleTestCase):
+    def _run_concurrently(self, func, count=5):
+        started = threading.Event()
+        release = threading.Event()
+        results = []
+        errors = []
+
+        def slow_func():
+            started.set()
+            release.wait(5)
+            return func()
+
+        call = mock.Mock(side_effect=slow_func)
+
+        def target():
+            try:
+                results.append(single_flight.do('key', call))
+            except Exception as e:
+                errors.append(e)
+
+        threads = [threading.Thread(target=target) for _ in range(count)]
+        threads[0].start()
+        started.wait(5)
+        for thread in threads[1:]:
+            thread.start()
+        while single_flight.get_stats().get('coalesced', 0) < self.coalesced_before + count - 1:
+            release.wait(0.01)
+        release.set()
+        for thread in threads:
+            thread.join(5)
+        return call, results, errors
+
+    def setUp(self):
+        self.coalesced_before = single_flight.get_stats().get('coalesced', 0)
+
+    def test_identical_calls_coalesced(self):
+        call, results, errors = self._run_concurrently(lambda: {'count': 1})
+        self.assertEqual(call.call_count, 1)
+        self.assertEqual(results, [{'count': 1}] * 5)
+        self.assertEqual(single_flight.get_stats()['coalesced'], self.coalesced_before + 4)
+
+    def test_each_caller_gets_its_own_copy(self):
+        call, results, errors = self._run_concurrently(lambda: {'results': []}, count=2)
+        results[0]['results'].append('modified')
+        self.assertEqual(results[1], {'results': []})
+
+    def test_error_shared(self):
+        def fail():
+            raise ValueError("OSIS error")
+
+        call, results, errors = self._run_concurrently(fail, count=3)
+        self.assertEqual(call.call_count, 1)
+        self.assertEqual(len(errors), 3)
+
+    def test_sequential_calls_not_coalesced(self):
+        call = mock.Mock(return_value={})
+        single_flight.do('key', call)
+        single_flight.do('key', call)
+        self.assertEqual(call.call_count, 2)
+
+    def test_key_depends_on_every_part(self):
+        self.assertEqual(
+            single_flight.build_key('portal', 'url', {'a': 1, 'b': 2}),
+            single_flight.build_key('portal', 'url', {'b': 2, 'a': 1})
+        )
+        self.assertNotEqual(
+            single_flight.build_key('portal', 'url', {'a': 1}),
+            single_flight.build_key('catalog', 'url', {'a': 1})
+        )
+
+
+@override_settings(CACHES=LOCMEM_CACHES, OSIS_SINGLE_FLIGHT_CACHE='default', OSIS_SINGLE_FLIGHT_WAIT=1)
+class SingleFlightAcrossProcessesTestCase(SimpleTestCase):
+    def setUp(self):
+        cache.clear()
+
+    def test_result_of_other_process_used(self):
+        # Another process holds the lock and has published its result
+        cache.add('{}:key:lock'.format(single_flight.CACHE_PREFIX), True)
+        cache.set('{}:key:result'.format(single_flight.CACHE_PREFIX), {'count': 1})
+        call = mock.Mock()
+        self.assertEqual(single_flight.do('key', call), {'count': 1})
+        self.assertFalse(call.called)
+
+    def test_call_made_when_other_process_does_not_answer(self):
+        cache.add('{}:key:lock'.format(single_flight.CACHE_PREFIX), True)
+        call = mock.Mock(return_value={'count': 1})
+        self.assertEqual(single_flight.do('key', call), {'count': 1})
+        self.assertEqual(call.call_count, 1)
+
+    def test_lock_released(self):
+        single_flight.do('key', mock.Mock(return_value={}))
+        self.assertIsNone(cache.get('{}:key:lock'.format(single_flight.CACHE_PREFIX)))
@@ -0,0 +1,93 @@
+##############################################################################
+#
+#    OSIS stands for Open Student Information System. It's an application
+#    designed to manage the core business of higher education institutions,
+#    such as universities, faculties, institutes and professional schools.
+#    The core business involves the administration of students, teachers,
+#    courses, programs and so on.
+#
+#    Copyright (C) 2015-2018 Université catholique de Louvain (http://www.uclouvain.be)
+#
+#    This program is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    A copy of this license - GNU General Public License - is available
+#    at the root of the source code of this program.  If not,
+#    see http://www.gnu.org/licenses/.
+#
+##############################################################################
+import threading
+import time
+from unittest import mock
+
+from django.core.cache import cache
+from django.test import SimpleTestCase, override_settings
+
+from continuing_education.services import token_cache
+
+LOCMEM_CACHES = {'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}}
+
+
+@override_settings(CACHES=LOCMEM_CACHES)
+class TokenCacheTestCase(SimpleTestCase):
+    def setUp(self):
+        cache.clear()
+        self.fetch = mock.Mock(return_value='token')
+
+    def test_miss_then_hit(self):
+        self.assertEqual(token_cache.get_token('jdupont', self.fetch), 'token')
+        self.assertEqual(token_cache.get_token('jdupont', self.fetch), 'token')
+        self.assertEqual(self.fetch.call_count, 1)
+
+    def test_empty_token_not_cached(self):
+        self.fetch.return_value = ''
+        token_cache.get_token('jdupont', self.fetch)
+        token_cache.get_token('jdupont', self.fetch)
+        self.assertEqual(self.fetch.call_count, 2)
+
+    def test_invalidate(self):
+        token_cache.get_token('jdupont', self.fetch)
+        token_cache.invalidate('jdupont')
+        token_cache.get_token('jdupont', self.fetch)
+        self.assertEqual(self.fetch.call_count, 2)
+
+    def test_concurrent_fetches_coalesced(self):
+        started = threading.Event()
+        release = threading.Event()
+
+        def slow_fetch():
+            started.set()
+            release.wait(5)
+            return 'token'
+
+        fetch = mock.Mock(side_effect=slow_fetch)
+        results = []
+        threads = [
+            threading.Thread(target=lambda: results.append(token_cache.get_token('jdupont', fetch)))
+            for _ in range(5)
+        ]
+        threads[0].start()
+        started.wait(5)
+        for thread in threads[1:]:
+            thread.start()
+        time.sleep(0.05)
+        release.set()
+        for thread in threads:
+            thread.join(5)
+        self.assertEqual(results, ['token'] * 5)
+        self.assertEqual(fetch.call_count, 1)
+
+    @mock.patch('continuing_education.services.token_cache._refresh_in_background')
+    def test_token_close_to_expiry_refreshed_in_background(self, mock_refresh):
+        with self.settings(CONTINUING_EDUCATION_TOKEN_TTL=60, CONTINUING_EDUCATION_TOKEN_REFRESH_MARGIN=60):
+            token_cache.get_token('jdupont', self.fetch)
+            self.assertEqual(token_cache.get_token('jdupont', self.fetch), 'token')
+        mock_refresh.assert_called_once_with('jdupont', self.fetch)
+        self.assertEqual(self.fetch.call_count, 1)
@@ -0,0 +1,101 @@
+##############################################################################
+#
+#    OSIS stands for Open Student Information System. It's an application
+#    designed to manage the core business of higher education institutions,
+#    such as universities, faculties, institutes and professional schools.
+#    The core business involves the administration of students, teachers,
+#    courses, programs and so on.
+#
+#    Copyright (C) 2015-2018 Université catholique de Louvain (http://www.uclouvain.be)
+#
+#    This program is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    A copy of this license - GNU General Public License - is available
+#    at the root of the source code of this program.  If not,
+#    see http://www.gnu.org/licenses/.
+#
+##############################################################################
+import time
+from unittest import mock
+
+from django.core.cache import cache
+from django.test import SimpleTestCase, override_settings
+
+from continuing_education.services import training_cache
+
+LOCMEM_CACHES = {'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}}
+
+
+@override_settings(CACHES=LOCMEM_CACHES)
+class TrainingCacheTestCase(SimpleTestCase):
+    def setUp(self):
+        cache.clear()
+        self.fetch = mock.Mock(return_value={'acronym': 'ACRONYM'})
+
+    def test_miss_then_hit(self):
+        key = training_cache.acronym_key('ACRONYM')
+        self.assertEqual(training_cache.get_or_fetch(key, self.fetch), {'acronym': 'ACRONYM'})
+        self.assertEqual(training_cache.get_or_fetch(key, self.fetch), {'acronym': 'ACRONYM'})
+        self.assertEqual(self.fetch.call_count, 1)
+
+    def test_keys_are_case_insensitive_on_acronym(self):
+        self.assertEqual(training_cache.acronym_key('acronym'), training_cache.acronym_key('ACRONYM'))
+
+    def test_projected_trainings_are_cached_apart(self):
+        self.assertNotEqual(training_cache.acronym_key('ACRONYM'), training_cache.acronym_key('ACRONYM', 'active'))
+        self.assertNotEqual(training_cache.uuid_key('uuid'), training_cache.uuid_key('uuid', 'active'))
+
+    def test_list_key_does_not_depend_on_params_order(self):
+        self.assertEqual(
+            training_cache.list_key({'search': 'a', 'active': True}),
+            training_cache.list_key({'active': True, 'search': 'a'})
+        )
+        self.assertNotEqual(training_cache.list_key({'search': 'a'}), training_cache.list_key({'search': 'b'}))
+
+    @mock.patch('continuing_education.services.training_cache._refresh_in_background')
+    def test_stale_entry_is_served_and_refreshed(self, mock_refresh):
+        key = training_cache.uuid_key('uuid')
+        refresh = mock.Mock()
+        training_cache.get_or_fetch(key, self.fetch, refresh)
+        with mock.patch('time.time', return_value=time.time() + training_cache._ttl() + 1):
+            self.assertEqual(training_cache.get_or_fetch(key, self.fetch, refresh), {'acronym': 'ACRONYM'})
+        self.assertEqual(self.fetch.call_count, 1)
+        mock_refresh.assert_called_once_with(key, refresh)
+
+    @mock.patch('continuing_education.services.training_cache._refresh_in_background')
+    def test_stale_entry_without_refresh_is_fetched_again(self, mock_refresh):
+        key = training_cache.uuid_key('uuid')
+        training_cache.get_or_fetch(key, self.fetch)
+        with mock.patch('time.time', return_value=time.time() + training_cache._ttl() + 1):
+            self.assertEqual(training_cache.get_or_fetch(key, self.fetch), {'acronym': 'ACRONYM'})
+        self.assertEqual(self.fetch.call_count, 2)
+        self.assertFalse(mock_refresh.called)
+
+    def test_refresh_replaces_entry(self):
+        key = training_cache.uuid_key('uuid')
+        training_cache.get_or_fetch(key, self.fetch)
+        training_cache._refresh(key, key + ':refreshing', lambda: {'acronym': 'NEW'})
+        self.assertEqual(training_cache.get_or_fetch(key, self.fetch), {'acronym': 'NEW'})
+
+    def test_errors_are_not_cached(self):
+        key = training_cache.uuid_key('uuid')
+        self.fetch.side_effect = ValueError
+        with self.assertRaises(ValueError):
+            training_cache.get_or_fetch(key, self.fetch)
+        self.assertIsNone(cache.get(key))
+
+    def test_stats(self):
+        key = training_cache.uuid_key('uuid')
+        training_cache.get_or_fetch(key, self.fetch)
+        training_cache.get_or_fetch(key, self.fetch)
+        stats = training_cache.get_stats()
+        self.assertGreaterEqual(stats['hits'], 1)
+        self.assertGreaterEqual(stats['misses'], 1)
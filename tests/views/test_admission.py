@@ -31,6 +31,7 @@ from unittest import mock
 from unittest.mock import patch
 
 from django.contrib import messages
+from django.core.cache import cache
 from django.core.exceptions import PermissionDenied
 from django.http import HttpResponse, HttpResponseForbidden
 from django.test import TestCase
@@ -68,7 +69,7 @@ class ViewStudentAdmissionTestCase(TestCase):
         self.admission_submitted = AdmissionDictFactory(self.person_information, SUBMITTED)
         self.client.force_login(self.user)
         self.patcher = patch(
-            "continuing_education.views.admission._get_files_list",
+            "continuing_education.views.dossier._fetch_files_list",
             return_value={}
         )
         self.get_patcher = patch(
@@ -96,6 +97,8 @@ class ViewStudentAdmissionTestCase(TestCase):
         api_patcher = patch("osis_reference_sdk.api.countries_api.CountriesApi")
         self.mock_api = api_patcher.start()
         self.addCleanup(api_patcher.stop)
+        # Trainings cached by another test must not be served to this one
+        cache.clear()
 
     def test_admission_detail(self):
         url = reverse(admission_detail, args=[self.admission['uuid']])
@@ -369,7 +372,7 @@ class ViewStudentAdmissionTestCase(TestCase):
             fetch_redirect_response=False
         )
 
-    @mock.patch('continuing_education.views.admission._get_files_list')
+    @mock.patch('continuing_education.views.dossier._fetch_files_list')
     def test_admission_detail_files_list(self, mock_get_files_list):
         file = {
             'name': 'file.txt',
@@ -23,22 +23,28 @@
 #    see http://www.gnu.org/licenses/.
 #
 ##############################################################################
+import json
+import time
 import uuid
 from unittest import mock
 
 from django.core.exceptions import PermissionDenied
 from django.http import HttpResponse, Http404
-from django.test import TestCase, RequestFactory
+from django.core.cache import cache
+from django.test import TestCase, RequestFactory, override_settings
+from requests import Response
 
 from base.tests.factories.person import PersonFactory
 from base.tests.factories.user import UserFactory
 from continuing_education.models.enums.admission_state_choices import SUBMITTED
+from continuing_education.services import conditional_get, token_cache, training_cache
 from continuing_education.tests.factories.admission import AdmissionDictFactory
 from continuing_education.tests.factories.continuing_education_training import ContinuingEducationTrainingDictFactory
 from continuing_education.tests.factories.person import ContinuingEducationPersonDictFactory
 from continuing_education.views.api import (
     get_token_from_osis, get_personal_token, get_admission,
     get_registration, get_continuing_education_training, get_continuing_education_person,
+    get_trainings_by_acronyms, get_trainings_by_uuids, update_admission, get_admission_list,
 )
 
 
@@ -57,8 +63,9 @@ class ApiMethodsTestCase(TestCase):
         self.request = RequestFactory()
         self.request.user = self.user
         self.request.session = {}
+        token_cache.invalidate(self.user.username)
 
-    @mock.patch('requests.post')
+    @mock.patch('continuing_education.services.osis_http.post')
     def test_get_token_from_osis(self, mock_post):
         response = HttpResponse(status=200)
         response.json = lambda: {'token': 'token'}
@@ -66,12 +73,12 @@ class ApiMethodsTestCase(TestCase):
         token = get_token_from_osis(self.user.username)
         self.assertEqual(token, "token")
 
-    @mock.patch('requests.post', return_value=HttpResponse(status=404))
+    @mock.patch('continuing_education.services.osis_http.post', return_value=HttpResponse(status=404))
     def test_get_token_from_osis_not_found(self, mock_post):
         token = get_token_from_osis(self.user.username)
         self.assertEqual(token, "")
 
-    @mock.patch('requests.post')
+    @mock.patch('continuing_education.services.osis_http.post')
     def test_get_personal_token_not_in_session(self, mock_post):
         response = HttpResponse(status=200)
         response.json = lambda: {'token': 'token'}
@@ -81,7 +88,18 @@ class ApiMethodsTestCase(TestCase):
         self.assertEqual(self.request.session['personal_token'], "token")
         self.assertTrue(mock_post.called)
 
-    @mock.patch('requests.post')
+    @mock.patch('continuing_education.services.osis_http.post')
+    def test_get_personal_token_shared_between_sessions(self, mock_post):
+        response = HttpResponse(status=200)
+        response.json = lambda: {'token': 'token'}
+        mock_post.return_value = response
+        get_personal_token(self.request)
+        self.request.session = {}
+        token = get_personal_token(self.request)
+        self.assertEqual(token, "token")
+        self.assertEqual(mock_post.call_count, 1)
+
+    @mock.patch('continuing_education.services.osis_http.post')
     def test_get_personal_token_in_session(self, mock_post):
         self.request.session['personal_token'] = 'token'
         token = get_personal_token(self.request)
@@ -90,57 +108,217 @@ class ApiMethodsTestCase(TestCase):
         self.assertFalse(mock_post.called)
 
     @mock.patch('continuing_education.views.api.get_personal_token')
-    @mock.patch('requests.get', return_value=HttpResponse(status=404))
+    @mock.patch('continuing_education.services.osis_http.get', return_value=HttpResponse(status=404))
     def test_get_admission_not_found(self, mock_get, mock_token):
         with self.assertRaises(Http404):
             get_admission(self.request, uuid.uuid4())
         self.assertTrue(mock_get.called)
 
     @mock.patch('continuing_education.views.api.get_personal_token')
-    @mock.patch('requests.get', return_value=HttpResponse(status=403))
+    @mock.patch('continuing_education.services.osis_http.get', return_value=HttpResponse(status=403))
     def test_get_admission_denied(self, mock_get, mock_token):
         with self.assertRaises(PermissionDenied):
             get_admission(self.request, uuid.uuid4())
         self.assertTrue(mock_get.called)
 
     @mock.patch('continuing_education.views.api.get_personal_token')
-    @mock.patch('requests.get', return_value=HttpResponse(status=404))
+    @mock.patch('continuing_education.services.osis_http.get', return_value=HttpResponse(status=404))
     def test_get_registration_not_found(self, mock_get, mock_token):
         with self.assertRaises(Http404):
             get_registration(self.request, uuid.uuid4())
         self.assertTrue(mock_get.called)
 
     @mock.patch('continuing_education.views.api.get_personal_token')
-    @mock.patch('requests.get', return_value=HttpResponse(status=403))
+    @mock.patch('continuing_education.services.osis_http.get', return_value=HttpResponse(status=403))
     def test_get_registration_denied(self, mock_get, mock_token):
         with self.assertRaises(PermissionDenied):
             get_registration(self.request, uuid.uuid4())
         self.assertTrue(mock_get.called)
 
     @mock.patch('continuing_education.views.api.get_personal_token')
-    @mock.patch('requests.get', return_value=HttpResponse(status=404))
+    @mock.patch('continuing_education.services.osis_http.get', return_value=HttpResponse(status=404))
     def test_get_continuing_education_training_not_found(self, mock_get, mock_token):
         with self.assertRaises(Http404):
             get_continuing_education_training(self.request, uuid.uuid4())
         self.assertTrue(mock_get.called)
 
     @mock.patch('continuing_education.views.api.get_personal_token')
-    @mock.patch('requests.get', return_value=HttpResponse(status=403))
+    @mock.patch('continuing_education.services.osis_http.get', return_value=HttpResponse(status=403))
     def test_get_continuing_education_training_denied(self, mock_get, mock_token):
         with self.assertRaises(PermissionDenied):
             get_continuing_education_training(self.request, uuid.uuid4())
         self.assertTrue(mock_get.called)
 
     @mock.patch('continuing_education.views.api.get_personal_token')
-    @mock.patch('requests.get', return_value=HttpResponse(status=404))
+    @mock.patch('continuing_education.services.osis_http.get', return_value=HttpResponse(status=404))
     def test_get_continuing_education_person_not_found(self, mock_get, mock_token):
         with self.assertRaises(Http404):
             get_continuing_education_person(self.request)
         self.assertTrue(mock_get.called)
 
     @mock.patch('continuing_education.views.api.get_personal_token')
-    @mock.patch('requests.get', return_value=HttpResponse(status=403))
+    @mock.patch('continuing_education.services.osis_http.get', return_value=HttpResponse(status=403))
     def test_get_continuing_education_person_denied(self, mock_get, mock_token):
         with self.assertRaises(PermissionDenied):
             get_continuing_education_person(self.request)
         self.assertTrue(mock_get.called)
+
+
+class ConditionalGetTestCase(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = UserFactory()
+        cls.other_user = UserFactory()
+
+    def setUp(self):
+        conditional_get.clear()
+        self.addCleanup(conditional_get.clear)
+
+    def _request(self, user):
+        request = RequestFactory().get('/')
+        request.user = user
+        request.session = {'personal_token': 'token'}
+        return request
+
+    @staticmethod
+    def _response(status_code, content=b'', **headers):
+        response = Response()
+        response.status_code = status_code
+        response._content = content
+        response.headers.update(headers)
+        return response
+
+    @mock.patch('continuing_education.services.osis_http.get')
+    def test_admission_is_revalidated_within_the_user_scope(self, mock_get):
+        admission_uuid = uuid.uuid4()
+        mock_get.return_value = self._response(200, json.dumps({'uuid': str(admission_uuid)}).encode(), ETag='"v1"')
+        get_admission(self._request(self.user), admission_uuid)
+        get_admission(self._request(self.other_user), admission_uuid)
+        self.assertNotIn('If-None-Match', mock_get.call_args[1]['headers'])
+
+        mock_get.return_value = self._response(304)
+        admission = get_admission(self._request(self.user), admission_uuid)
+        self.assertEqual(mock_get.call_args[1]['headers']['If-None-Match'], '"v1"')
+        self.assertEqual(admission, {'uuid': str(admission_uuid)})
+
+
+@override_settings(CACHES={'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}})
+class BulkTrainingLookupTestCase(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = UserFactory()
+        cls.formation = ContinuingEducationTrainingDictFactory()
+
+    def setUp(self):
+        cache.clear()
+        self.request = RequestFactory()
+        self.request.user = self.user
+        self.request.session = {}
+
+    @mock.patch('continuing_education.views.api.get_data_from_osis')
+    def test_get_trainings_by_acronyms(self, mock_get):
+        mock_get.side_effect = lambda request, **kwargs: {
+            'results': [] if kwargs['params']['acronym'] == 'UNKNOWN' else [self.formation]
+        }
+        trainings = get_trainings_by_acronyms(self.request, ['ACRONYM', 'ACRONYM', 'UNKNOWN'])
+        self.assertEqual(trainings, {'ACRONYM': self.formation, 'UNKNOWN': None})
+        self.assertEqual(mock_get.call_count, 2)
+
+    @mock.patch('continuing_education.views.api.get_data_from_osis')
+    def test_get_trainings_by_acronyms_uses_cache(self, mock_get):
+        mock_get.return_value = {'results': [self.formation]}
+        get_continuing_education_training(self.request, 'ACRONYM')
+        trainings = get_trainings_by_acronyms(self.request, ['ACRONYM'])
+        self.assertEqual(trainings, {'ACRONYM': self.formation})
+        self.assertEqual(mock_get.call_count, 1)
+
+    @mock.patch('continuing_education.views.api.get_data_from_osis')
+    def test_get_trainings_by_uuids(self, mock_get):
+        unknown_uuid = str(uuid.uuid4())
+
+        def get_training(request, **kwargs):
+            if kwargs['uuid'] == unknown_uuid:
+                raise Http404
+            return self.formation
+
+        mock_get.side_effect = get_training
+        trainings = get_trainings_by_uuids(self.request, [self.formation['uuid'], unknown_uuid])
+        self.assertEqual(trainings, {self.formation['uuid']: self.formation, unknown_uuid: None})
+
+    @mock.patch('continuing_education.views.api.get_shared_data')
+    @mock.patch('continuing_education.views.api.get_data_from_osis')
+    def test_expired_training_is_refreshed_without_the_request(self, mock_get, mock_get_shared):
+        mock_get.return_value = {'results': [self.formation]}
+        mock_get_shared.return_value = {'results': [dict(self.formation, active=False)]}
+        get_continuing_education_training(self.request, 'ACRONYM')
+        with mock.patch('time.time', return_value=time.time() + training_cache._ttl() + 1), \
+                mock.patch('continuing_education.services.training_cache._refresh_in_background') as mock_refresh:
+            self.assertEqual(get_continuing_education_training(self.request, 'ACRONYM'), self.formation)
+        key, refresh = mock_refresh.call_args[0]
+        self.assertEqual(refresh(), dict(self.formation, active=False))
+        self.assertEqual(mock_get.call_count, 1)
+        mock_get_shared.assert_called_once_with(object_name='training', params={'acronym': 'ACRONYM'}, fields=None)
+
+    @mock.patch('continuing_education.views.api.get_data_from_osis')
+    def test_projected_training_does_not_replace_full_training(self, mock_get):
+        mock_get.side_effect = lambda request, **kwargs: {
+            'results': [{'active': True}] if kwargs['fields'] else [self.formation]
+        }
+        projected = get_continuing_education_training(self.request, 'ACRONYM', fields=('active',))
+        self.assertEqual(get_continuing_education_training(self.request, 'ACRONYM'), self.formation)
+        self.assertEqual(projected, {'active': True})
+        self.assertEqual(get_continuing_education_training(self.request, 'ACRONYM', fields=('active',)), projected)
+        self.assertEqual(mock_get.call_count, 2)
+
+
+class RequestMemoTestCase(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = UserFactory()
+        cls.person = PersonFactory(user=cls.user)
+        cls.person_information = ContinuingEducationPersonDictFactory(cls.person.uuid)
+
+    def setUp(self):
+        self.request = RequestFactory().get('/')
+        self.request.user = self.user
+        self.request.session = {'personal_token': 'token'}
+        patcher = mock.patch(
+            'continuing_education.views.api.fetch_content_from_osis',
+            side_effect=lambda read: json.dumps({
+                'url': read.url, 'person': self.person_information['person']
+            })
+        )
+        self.mock_fetch = patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_same_resource_fetched_once_per_request(self):
+        person_information = get_continuing_education_person(self.request)
+        person_information['person'].pop('uuid')
+        other_person_information = get_continuing_education_person(self.request)
+        self.assertEqual(self.mock_fetch.call_count, 1)
+        self.assertIn('uuid', other_person_information['person'])
+
+    def test_other_resources_and_requests_are_fetched(self):
+        get_continuing_education_person(self.request)
+        get_admission(self.request, uuid.uuid4())
+        other_request = RequestFactory().get('/')
+        other_request.user = self.user
+        other_request.session = {'personal_token': 'token'}
+        get_continuing_education_person(other_request)
+        self.assertEqual(self.mock_fetch.call_count, 3)
+
+    def test_projection_is_sent_to_osis_and_memoized_apart(self):
+        get_admission_list(self.request, 'uuid', fields=('state', 'uuid'))
+        get_admission_list(self.request, 'uuid', fields=('uuid', 'state'))
+        get_admission_list(self.request, 'uuid')
+        self.assertEqual(self.mock_fetch.call_count, 2)
+        self.assertEqual(self.mock_fetch.call_args_list[0][0][0].params, {'fields': 'state,uuid'})
+        self.assertIsNone(self.mock_fetch.call_args_list[1][0][0].params)
+
+    @mock.patch('continuing_education.services.osis_http.patch', return_value=HttpResponse(status=200))
+    def test_responses_are_forgotten_after_an_update(self, mock_patch):
+        admission_uuid = uuid.uuid4()
+        get_admission(self.request, admission_uuid)
+        update_admission(self.request, {'uuid': str(admission_uuid)})
+        get_admission(self.request, admission_uuid)
+        self.assertEqual(self.mock_fetch.call_count, 2)
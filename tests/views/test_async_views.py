@@ -0,0 +1,101 @@
+##############################################################################
+#
+#    OSIS stands for Open Student Information System. It's an application
+#    designed to manage the core business of higher education institutions,
+#    such as universities, faculties, institutes and professional schools.
+#    The core business involves the administration of students, teachers,
+#    courses, programs and so on.
+#
+#    Copyright (C) 2015-2018 Université catholique de Louvain (http://www.uclouvain.be)
+#
+#    This program is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    A copy of this license - GNU General Public License - is available
+#    at the root of the source code of this program.  If not,
+#    see http://www.gnu.org/licenses/.
+#
+##############################################################################
+import asyncio
+from unittest import mock
+
+import requests
+from asgiref.sync import async_to_sync
+from django.contrib.auth.models import AnonymousUser
+from django.core.exceptions import PermissionDenied
+from django.http import HttpResponse, Http404
+from django.test import TestCase, RequestFactory
+
+from base.tests.factories.person import PersonFactory
+from base.tests.factories.user import UserFactory
+from continuing_education.models.enums.admission_state_choices import ACCEPTED, SUBMITTED
+from continuing_education.tests.factories.admission import AdmissionDictFactory, RegistrationDictFactory
+from continuing_education.tests.factories.person import ContinuingEducationPersonDictFactory
+from continuing_education.views import async_views
+
+
+class AsyncViewsTestCase(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = UserFactory()
+        cls.person = PersonFactory(user=cls.user)
+
+    def setUp(self):
+        self.person_information = ContinuingEducationPersonDictFactory(self.person.uuid)
+        self.admission = AdmissionDictFactory(self.person_information)
+        self.registration = RegistrationDictFactory(self.person_information, state=ACCEPTED)
+        self.request = RequestFactory().get('/')
+        self.request.user = self.user
+        self.request.session = {}
+
+    def test_anonymous_user_is_redirected_to_login(self):
+        self.request.user = AnonymousUser()
+        response = async_to_sync(async_views.admission_detail)(self.request, admission_uuid=self.admission['uuid'])
+        self.assertEqual(response.status_code, 302)
+
+    @mock.patch('continuing_education.views.registration.handle_registration_edit', return_value=HttpResponse())
+    @mock.patch('continuing_education.views.api_async.get_continuing_education_person')
+    @mock.patch('continuing_education.views.api_async.get_registration')
+    def test_registration_edit(self, mock_registration, mock_person, mock_handle):
+        mock_registration.return_value = self.registration
+        mock_person.return_value = self.person_information
+        response = async_to_sync(async_views.registration_edit)(
+            self.request, admission_uuid=self.registration['uuid']
+        )
+        self.assertEqual(response.status_code, 200)
+        mock_handle.assert_called_once_with(
+            self.request, self.registration['uuid'], self.registration, self.person_information
+        )
+
+    @mock.patch('continuing_education.views.api_async.get_continuing_education_person')
+    @mock.patch('continuing_education.views.api_async.get_registration')
+    def test_registration_edit_denied(self, mock_registration, mock_person):
+        mock_registration.return_value = RegistrationDictFactory(self.person_information, state=SUBMITTED)
+        mock_person.return_value = self.person_information
+        with self.assertRaises(PermissionDenied):
+            async_to_sync(async_views.registration_edit)(self.request, admission_uuid=self.registration['uuid'])
+
+    def test_gather_raises_the_first_error_in_order(self):
+        async def fail_later():
+            await asyncio.sleep(0.01)
+            raise Http404
+
+        async def fail_now():
+            raise PermissionDenied
+
+        with self.assertRaises(Http404):
+            async_to_sync(async_views.gather)(fail_later(), fail_now())
+
+    @mock.patch('continuing_education.services.osis_async.get')
+    def test_files_unavailable(self, mock_get):
+        for error in [requests.exceptions.ConnectionError, requests.exceptions.ReadTimeout]:
+            with self.subTest(error=error):
+                mock_get.side_effect = error
+                self.assertIsNone(async_to_sync(async_views._fetch_files_list_or_none)(self.admission['uuid']))
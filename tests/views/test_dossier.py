@@ -0,0 +1,101 @@
+##############################################################################
+#
+#    OSIS stands for Open Student Information System. It's an application
+#    designed to manage the core business of higher education institutions,
+#    such as universities, faculties, institutes and professional schools.
+#    The core business involves the administration of students, teachers,
+#    courses, programs and so on.
+#
+#    Copyright (C) 2015-2018 Université catholique de Louvain (http://www.uclouvain.be)
+#
+#    This program is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    A copy of this license - GNU General Public License - is available
+#    at the root of the source code of this program.  If not,
+#    see http://www.gnu.org/licenses/.
+#
+##############################################################################
+from unittest import mock
+
+import requests
+from django.http import Http404
+from django.test import TestCase, RequestFactory
+
+from base.tests.factories.person import PersonFactory
+from base.tests.factories.user import UserFactory
+from continuing_education.models.enums.admission_state_choices import ACCEPTED
+from continuing_education.tests.factories.admission import AdmissionDictFactory, RegistrationDictFactory
+from continuing_education.tests.factories.person import ContinuingEducationPersonDictFactory
+from continuing_education.views.dossier import load_dossier
+
+
+@mock.patch('continuing_education.views.dossier._fetch_files_list', return_value=[])
+class LoadDossierTestCase(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = UserFactory()
+        cls.person = PersonFactory(user=cls.user)
+        cls.person_information = ContinuingEducationPersonDictFactory(cls.person.uuid)
+
+    def setUp(self):
+        self.admission = AdmissionDictFactory(self.person_information)
+        self.registration = RegistrationDictFactory(self.person_information, state=ACCEPTED)
+        self.request = RequestFactory().get('/')
+        self.request.user = self.user
+        self.request.session = {}
+
+    @mock.patch('continuing_education.views.api.get_registration')
+    @mock.patch('continuing_education.views.api.get_admission')
+    def test_load_dossier(self, mock_get_admission, mock_get_registration, mock_files):
+        mock_get_admission.return_value = self.admission
+        mock_get_registration.return_value = self.registration
+        dossier = load_dossier(self.request, self.admission['uuid'])
+        self.assertEqual(dossier['admission'], self.admission)
+        self.assertEqual(dossier['registration'], self.registration)
+        self.assertEqual(dossier['files'], [])
+
+    @mock.patch('continuing_education.views.api.get_registration')
+    @mock.patch('continuing_education.views.api.get_admission', side_effect=Http404)
+    def test_load_dossier_without_admission(self, mock_get_admission, mock_get_registration, mock_files):
+        mock_get_registration.return_value = self.registration
+        dossier = load_dossier(self.request, self.registration['uuid'])
+        self.assertIsNone(dossier['admission'])
+        self.assertEqual(dossier['registration'], self.registration)
+        self.assertEqual(dossier['files'], [])
+        self.assertFalse(mock_files.called)
+
+    @mock.patch('continuing_education.views.api.get_registration', side_effect=Http404)
+    @mock.patch('continuing_education.views.api.get_admission')
+    def test_load_dossier_without_registration(self, mock_get_admission, mock_get_registration, mock_files):
+        mock_get_admission.return_value = self.admission
+        with self.assertRaises(Http404):
+            load_dossier(self.request, self.admission['uuid'])
+
+    @mock.patch('continuing_education.views.api.get_registration')
+    @mock.patch('continuing_education.views.api.get_admission')
+    def test_load_registration_dossier(self, mock_get_admission, mock_get_registration, mock_files):
+        mock_get_registration.return_value = self.registration
+        dossier = load_dossier(self.request, self.registration['uuid'], with_admission=False)
+        self.assertFalse(mock_get_admission.called)
+        self.assertNotIn('admission', dossier)
+
+    @mock.patch('continuing_education.views.dossier.display_error_messages')
+    @mock.patch('continuing_education.views.api.get_registration')
+    @mock.patch('continuing_education.views.api.get_admission')
+    def test_load_dossier_files_unavailable(self, mock_get_admission, mock_get_registration, mock_display, mock_files):
+        mock_get_admission.return_value = self.admission
+        mock_get_registration.return_value = self.registration
+        for error in [requests.exceptions.ConnectionError, requests.exceptions.ReadTimeout]:
+            with self.subTest(error=error):
+                mock_files.side_effect = error
+                dossier = load_dossier(self.request, self.admission['uuid'])
+                self.assertEqual(dossier['files'], [])
+                self.assertTrue(mock_display.called)
@@ -24,6 +24,7 @@
 #
 ##############################################################################
 import base64
+import io
 import uuid
 from unittest import mock
 from unittest.mock import patch
@@ -31,13 +32,15 @@ from unittest.mock import patch
 from django.contrib import messages
 from django.core.files.uploadedfile import SimpleUploadedFile
 from django.http import HttpResponse
-from django.test import TestCase
+from django.template.defaultfilters import filesizeformat
+from django.test import Client, TestCase
 from django.urls import reverse
 from django.utils.translation import gettext
 from requests import Response
 
 from base.tests.factories.person import PersonFactory
 from base.tests.factories.user import UserFactory
+from continuing_education.services.upload_relay import UploadAborted
 from continuing_education.tests.factories.admission import AdmissionDictFactory
 from continuing_education.tests.factories.person import ContinuingEducationPersonDictFactory
 
@@ -58,7 +61,7 @@ class AdmissionFileTestCase(TestCase):
     def setUp(self):
         self.client.force_login(self.user)
         self.patcher = patch(
-            "continuing_education.views.admission._get_files_list",
+            "continuing_education.views.dossier._fetch_files_list",
             return_value={}
         )
         self.mocked_called_api_function = self.patcher.start()
@@ -88,7 +91,7 @@ class AdmissionFileTestCase(TestCase):
         response.json = lambda *args, **kwargs: "NAME TOO LONG"
         return response
 
-    @mock.patch('requests.post', side_effect=mocked_success_post_request)
+    @mock.patch('continuing_education.services.osis_http.post', side_effect=mocked_success_post_request)
     def test_upload_file_success(self, mock_post):
         url = reverse('upload_file', args=[self.admission['uuid']])
         redirect_url = reverse('admission_detail', kwargs={'admission_uuid': self.admission['uuid']})
@@ -101,7 +104,7 @@ class AdmissionFileTestCase(TestCase):
         )
         self.assertRedirects(response, reverse('admission_detail', args=[self.admission['uuid']]) + '#documents')
 
-    @mock.patch('requests.post', side_effect=mocked_failed_post_request)
+    @mock.patch('continuing_education.services.osis_http.post', side_effect=mocked_failed_post_request)
     def test_upload_file_error(self, mock_post):
         url = reverse('upload_file', args=[self.admission['uuid']])
         redirect_url = reverse('admission_detail', kwargs={'admission_uuid': self.admission['uuid']})
@@ -112,7 +115,83 @@ class AdmissionFileTestCase(TestCase):
         self.assertIn("BAD REQUEST", messages_list)
         self.assertRedirects(response, reverse('admission_detail', args=[self.admission['uuid']]) + '#documents')
 
-    @mock.patch('requests.post', side_effect=mocked_failed_post_request_name_too_long)
+    @mock.patch('continuing_education.services.osis_http.post')
+    def test_upload_file_is_relayed_as_multipart_stream(self, mock_post):
+        bodies = []
+
+        def consume_body(url, data, **kwargs):
+            bodies.append(b''.join(data))
+            return self.mocked_success_post_request()
+
+        mock_post.side_effect = consume_body
+        url = reverse('upload_file', args=[self.admission['uuid']])
+        redirect_url = reverse('admission_detail', kwargs={'admission_uuid': self.admission['uuid']})
+        self.client.post(url, {'myfile': self.admission_file}, headers={"referer": redirect_url})
+        self.assertIn(b'name="path"; filename="upload_test.pdf"', bodies[0])
+        self.assertIn(b'test_content', bodies[0])
+        self.assertIn(str.encode(str(self.person_information['person']['uuid'])), bodies[0])
+        self.assertIn('multipart/form-data; boundary=', mock_post.call_args[1]['headers']['Content-Type'])
+
+    @mock.patch('continuing_education.services.osis_http.post', side_effect=mocked_success_post_request)
+    def test_upload_file_with_csrf_checks(self, mock_post):
+        client = Client(enforce_csrf_checks=True)
+        client.force_login(self.user)
+        csrf_token = 'a' * 32
+        client.cookies['csrftoken'] = csrf_token
+        url = reverse('upload_file', args=[self.admission['uuid']])
+        redirect_url = reverse('admission_detail', kwargs={'admission_uuid': self.admission['uuid']})
+        response = client.post(
+            url, {'csrfmiddlewaretoken': csrf_token, 'myfile': self.admission_file}, headers={"referer": redirect_url}
+        )
+        messages_list = [item.message for item in messages.get_messages(response.wsgi_request)]
+        self.assertRedirects(response, reverse('admission_detail', args=[self.admission['uuid']]) + '#documents')
+        self.assertIn(gettext("The document is uploaded correctly"), messages_list)
+
+    @mock.patch('continuing_education.services.osis_http.post')
+    def test_upload_file_without_csrf_token_is_forbidden(self, mock_post):
+        aborted = []
+
+        def consume_body(url, data, **kwargs):
+            try:
+                b''.join(data)
+            except UploadAborted:
+                aborted.append(url)
+            return self.mocked_success_post_request()
+
+        mock_post.side_effect = consume_body
+        client = Client(enforce_csrf_checks=True)
+        client.force_login(self.user)
+        client.cookies['csrftoken'] = 'a' * 32
+        url = reverse('upload_file', args=[self.admission['uuid']])
+        # The token is only checked once the body, and so the file, has been read
+        response = client.post(url, {'csrfmiddlewaretoken': 'b' * 32, 'myfile': self.admission_file})
+        self.assertEqual(response.status_code, 403)
+        # The file part is never completed, so OSIS does not store the upload
+        self.assertEqual(len(aborted), 1)
+
+    @mock.patch('continuing_education.services.osis_http.post')
+    def test_upload_file_without_csrf_cookie_is_not_relayed(self, mock_post):
+        client = Client(enforce_csrf_checks=True)
+        client.force_login(self.user)
+        url = reverse('upload_file', args=[self.admission['uuid']])
+        response = client.post(url, {'myfile': self.admission_file})
+        self.assertEqual(response.status_code, 403)
+        self.assertFalse(mock_post.called)
+
+    @mock.patch('continuing_education.views.file.MAX_UPLOAD_SIZE', 4)
+    @mock.patch('continuing_education.services.osis_http.post')
+    def test_upload_file_too_large(self, mock_post):
+        url = reverse('upload_file', args=[self.admission['uuid']])
+        redirect_url = reverse('admission_detail', kwargs={'admission_uuid': self.admission['uuid']})
+        response = self.client.post(url, {'myfile': self.admission_file}, headers={"referer": redirect_url})
+        messages_list = [str(item.message) for item in messages.get_messages(response.wsgi_request)]
+        self.assertEqual(response.status_code, 302)
+        expected_message = gettext("File is too large: maximum upload size allowed is %(max_size)s.") % {
+            'max_size': filesizeformat(4)
+        }
+        self.assertIn(expected_message, messages_list)
+
+    @mock.patch('continuing_education.services.osis_http.post', side_effect=mocked_failed_post_request_name_too_long)
     def test_upload_file_error_name_too_long(self, mock_fail):
         url = reverse('upload_file', args=[self.admission['uuid']])
         redirect_url = reverse('admission_detail', kwargs={'admission_uuid': self.admission['uuid']})
@@ -138,7 +217,7 @@ class AdmissionFileTestCase(TestCase):
         response.status_code = 500
         return response
 
-    @mock.patch('requests.delete', side_effect=mocked_success_delete_request)
+    @mock.patch('continuing_education.services.osis_http.delete', side_effect=mocked_success_delete_request)
     def test_delete_file_success(self, mock_delete):
         url = reverse('remove_file', args=[self.admission['uuid'], "1452"])
         redirect_url = reverse('admission_detail', kwargs={'admission_uuid': self.admission['uuid']})
@@ -156,7 +235,7 @@ class AdmissionFileTestCase(TestCase):
         )
         self.assertRedirects(response, reverse('admission_detail', args=[self.admission['uuid']]) + '#documents')
 
-    @mock.patch('requests.delete', side_effect=mocked_failed_delete_request)
+    @mock.patch('continuing_education.services.osis_http.delete', side_effect=mocked_failed_delete_request)
     def test_delete_file_error(self, mock_delete):
         url = reverse('remove_file', args=[self.admission['uuid'], "5478"])
         redirect_url = reverse('admission_detail', kwargs={'admission_uuid': self.admission['uuid']})
@@ -175,21 +254,26 @@ class AdmissionFileTestCase(TestCase):
         )
         self.assertRedirects(response, reverse('admission_detail', args=[self.admission['uuid']]) + '#documents')
 
-    def get_mocked_file_response(self, headers):
-        response = HttpResponse(status=200)
-        response.content = '{"content": "' + str(base64.b64encode(b'test')) + \
-                           '", "path":"test_name.pdf", "name":"test_name.pdf"}'
+    def get_mocked_file_response(self, headers, **kwargs):
+        response = Response()
+        response.status_code = 200
+        response.raw = io.BytesIO(str.encode(
+            '{"content": "' + base64.b64encode(b'test').decode() + '", "path":"test_name.pdf", "name":"test_name.pdf"}'
+        ))
         return response
 
-    @mock.patch('requests.get', side_effect=get_mocked_file_response)
+    @mock.patch('continuing_education.services.osis_http.get', side_effect=get_mocked_file_response)
     def test_download_file_success(self, mock_get):
         url = reverse('download_file', args=[uuid.uuid4(), self.admission['uuid']])
         response = self.client.get(url)
         self.assertEqual(response.status_code, 200)
         for value in ['attachment', 'test_name']:
             self.assertIn(value, response['Content-Disposition'])
+        self.assertEqual(response['Content-Type'], 'application/pdf')
+        self.assertEqual(b''.join(response.streaming_content), b'test')
+        self.assertTrue(mock_get.call_args[1]['stream'])
 
-    @mock.patch('requests.get', return_value=HttpResponse(status=404))
+    @mock.patch('continuing_education.services.osis_http.get', return_value=HttpResponse(status=404))
     def test_download_file_error(self, mock_get):
         url = reverse('download_file', args=[uuid.uuid4(), self.admission['uuid']])
         response = self.client.get(url)
@@ -28,6 +28,7 @@ from string import ascii_lowercase
 from unittest import mock
 from unittest.mock import patch
 
+from django.core.cache import cache
 from django.test import TestCase
 from django.urls import reverse
 from mock import patch
@@ -54,11 +55,13 @@ class ViewHomeTestCase(TestCase):
         self.mocked_called_api_function = self.patcher.start()
 
         self.addCleanup(self.patcher.stop)
+        # Trainings cached by another test must not be served to this one
+        cache.clear()
 
-    @mock.patch('requests.get')
+    @mock.patch('continuing_education.services.osis_http.get')
     @mock.patch('continuing_education.views.api.get_personal_token')
-    @mock.patch('continuing_education.views.api.transform_response_to_data')
-    def test_main_view(self, mock_transform, mock_token, mock_get):
+    @mock.patch('continuing_education.services.json_decoder.loads')
+    def test_main_view(self, mock_loads, mock_token, mock_get):
         url = reverse('continuing_education_home')
         response = self.client.get(url)
         self.assertEqual(response.status_code, 200)
@@ -100,10 +103,10 @@ class FormationsListTestCase(TestCase):
         self.assertEqual(response.context['formations'], formations['results'])
         self.assertTemplateUsed(response, 'continuing_education/formations.html')
 
-    @mock.patch('requests.get')
+    @mock.patch('continuing_education.services.osis_http.get')
     @mock.patch('continuing_education.views.api.get_personal_token')
-    @mock.patch('continuing_education.views.api.transform_response_to_data')
-    def test_bypass_formations_list_when_logged_in(self, mock_get, mock_token, mock_transform):
+    @mock.patch('continuing_education.services.json_decoder.loads')
+    def test_bypass_formations_list_when_logged_in(self, mock_loads, mock_token, mock_get):
         self.client.force_login(self.user)
         url = reverse('formations_list')
         response = self.client.get(url)
@@ -0,0 +1,47 @@
+##############################################################################
+#
+#    OSIS stands for Open Student Information System. It's an application
+#    designed to manage the core business of higher education institutions,
+#    such as universities, faculties, institutes and professional schools.
+#    The core business involves the administration of students, teachers,
+#    courses, programs and so on.
+#
+#    Copyright (C) 2015-2018 Université catholique de Louvain (http://www.uclouvain.be)
+#
+#    This program is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    A copy of this license - GNU General Public License - is available
+#    at the root of the source code of this program.  If not,
+#    see http://www.gnu.org/licenses/.
+#
+##############################################################################
+from django.test import TestCase
+from django.urls import reverse
+
+from base.tests.factories.user import UserFactory
+
+
+class OsisStatsViewTestCase(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.staff = UserFactory(is_staff=True)
+        cls.user = UserFactory()
+
+    def test_osis_stats_for_staff(self):
+        self.client.force_login(self.staff)
+        response = self.client.get(reverse('osis_stats'))
+        self.assertEqual(response.status_code, 200)
+        self.assertIn('http_pool', response.json())
+
+    def test_osis_stats_refused_for_students(self):
+        self.client.force_login(self.user)
+        response = self.client.get(reverse('osis_stats'))
+        self.assertEqual(response.status_code, 302)
@@ -26,6 +26,7 @@
 from unittest.mock import patch
 
 from django.contrib import messages
+from django.core.cache import cache
 from django.http import HttpResponse
 from django.test import TestCase
 from django.urls import reverse
@@ -56,6 +57,8 @@ class ProspectTestCase(TestCase):
             'formation': self.training['uuid']
         }
         self.client.force_login(self.user)
+        # Trainings cached by another test must not be served to this one
+        cache.clear()
 
     def test_post_prospect_with_missing_information(self):
         self.prospect['name'] = ''
@@ -72,10 +75,11 @@ class ProspectTestCase(TestCase):
     def mocked_failed_post_request(*args, **kwargs):
         return {}, 400
 
-    @patch('continuing_education.views.api.transform_response_to_data')
-    @patch('requests.get')
-    @patch('requests.post', return_value=HttpResponse(status=201))
-    def test_post_valid_prospect(self, mock_post, mock_get, mock_transform):
+    @patch('continuing_education.services.json_decoder.loads')
+    @patch('continuing_education.services.osis_http.get')
+    @patch('continuing_education.services.osis_http.post', return_value=HttpResponse(status=201))
+    def test_post_valid_prospect(self, mock_post, mock_get, mock_loads):
+        mock_loads.return_value = {'results': [self.training]}
         response = self.client.post(reverse('prospect_form', args=['ACRONYM']), data=self.prospect)
         self.assertEqual(response.status_code, 200)
         messages_list = [item.message for item in messages.get_messages(response.wsgi_request)]
@@ -23,6 +23,7 @@
 #    see http://www.gnu.org/licenses/.
 #
 ##############################################################################
+import tempfile
 from unittest.mock import patch
 
 import mock
@@ -38,6 +39,7 @@ from base.tests.factories.person import PersonFactory
 from base.tests.factories.user import SuperUserFactory, UserFactory
 from continuing_education.models.enums import admission_state_choices
 from continuing_education.models.enums.admission_state_choices import REGISTRATION_SUBMITTED, ACCEPTED, REJECTED
+from continuing_education.services import pdf_cache
 from continuing_education.tests.factories.admission import RegistrationDictFactory
 from continuing_education.tests.factories.person import ContinuingEducationPersonDictFactory
 from continuing_education.views.common import get_submission_errors, _get_managers_mails
@@ -63,7 +65,7 @@ class ViewStudentRegistrationTestCase(TestCase):
         self.registration_submitted = RegistrationDictFactory(self.person_information, state=REGISTRATION_SUBMITTED)
         self.client.force_login(self.user)
         self.patcher = patch(
-            "continuing_education.views.registration._get_files_list",
+            "continuing_education.views.dossier._fetch_files_list",
             return_value={}
         )
         self.mocked_called_api_function = self.patcher.start()
@@ -254,17 +256,45 @@ class ViewStudentRegistrationTestCase(TestCase):
         self.assertEqual(post_response.status_code, HttpResponseForbidden.status_code)
         self.assertTemplateUsed(post_response, 'access_denied.html')
 
-    @mock.patch('continuing_education.views.registration.write_fillable_pdf', return_value='test')
+    @mock.patch('continuing_education.business.pdf_filler.write_fillable_pdf', return_value=b'test')
     def test_pdf_content(self, mock_pdf):
         self.mocked_called_api_function_get.return_value = self.registration_submitted
         self.mocked_called_api_function_get.return_value['person_information']['birth_date'] = "2019-10-17"
         a_superuser = SuperUserFactory()
         self.client.force_login(a_superuser)
         url = reverse('registration_pdf', args=[self.registration_submitted['uuid']])
-        response = self.client.get(url)
+        with self.settings(CONTINUING_EDUCATION_PDF_CACHE=self._pdf_cache_settings()):
+            response = self.client.get(url)
         self.assertEqual(response.__getitem__('content-type'), 'application/pdf;')
         self.assertEqual(response.status_code, 200)
 
+    @mock.patch('continuing_education.business.pdf_filler.write_fillable_pdf', return_value=b'test')
+    def test_pdf_rendered_once(self, mock_pdf):
+        self.mocked_called_api_function_get.return_value = self.registration_submitted
+        url = reverse('registration_pdf', args=[self.registration_submitted['uuid']])
+        with self.settings(CONTINUING_EDUCATION_PDF_CACHE=self._pdf_cache_settings()):
+            first_response = self.client.get(url)
+            second_response = self.client.get(url)
+        self.assertEqual(mock_pdf.call_count, 1)
+        self.assertEqual(second_response.content, b'test')
+        self.assertEqual(first_response['ETag'], second_response['ETag'])
+
+    @mock.patch('continuing_education.business.pdf_filler.write_fillable_pdf', return_value=b'test')
+    def test_pdf_not_modified(self, mock_pdf):
+        self.mocked_called_api_function_get.return_value = self.registration_submitted
+        url = reverse('registration_pdf', args=[self.registration_submitted['uuid']])
+        with self.settings(CONTINUING_EDUCATION_PDF_CACHE=self._pdf_cache_settings()):
+            etag = self.client.get(url)['ETag']
+            response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response['ETag'], etag)
+        self.assertEqual(mock_pdf.call_count, 1)
+
+    def _pdf_cache_settings(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        return {'BACKEND': pdf_cache.FILESYSTEM_BACKEND, 'LOCATION': directory.name}
+
 
 class RegistrationSubmissionErrorsTestCase(TestCase):
     @classmethod
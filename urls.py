@@ -23,11 +23,12 @@
 #    see http://www.gnu.org/licenses/.
 #
 ##############################################################################
+from django.conf import settings
 from django.urls import include, path, re_path
 
 from continuing_education.forms.account import ContinuingEducationRegistrationForm
 from continuing_education.views import account_activation, prospect
-from continuing_education.views import (home, admission, registration, common, file)
+from continuing_education.views import (home, admission, registration, common, file, monitoring)
 from continuing_education.views.account_activation import (
     ContinuingEducationPasswordResetView,
     ContinuingEducationPasswordResetConfirmView,
@@ -35,11 +36,24 @@ from continuing_education.views.account_activation import (
 from continuing_education.views.autocomplete.continuing_education_training import \
     ContinuingEducationTrainingAutocomplete
 
+if getattr(settings, 'CONTINUING_EDUCATION_ASYNC_VIEWS', False):
+    # Under ASGI, the views spending their time waiting for OSIS are served by their async versions
+    from continuing_education.views import async_views
+    main_view = async_views.main_view
+    admission_detail = async_views.admission_detail
+    registration_edit = async_views.registration_edit
+    registration_detail = async_views.registration_detail
+else:
+    main_view = home.main_view
+    admission_detail = admission.admission_detail
+    registration_edit = registration.registration_edit
+    registration_detail = registration.registration_detail
+
 urlpatterns = [
     path('', home.formations_list, name='formations_list'),
     re_path(r'^set_lang/([A-Za-z-]+)/$', home.set_language, name='set_language'),
-    path('home/', home.main_view, name='continuing_education_home'),
-    re_path(r'^home/(?P<acronym>[\w]+)/$', home.main_view, name='continuing_education_home'),
+    path('home/', main_view, name='continuing_education_home'),
+    re_path(r'^home/(?P<acronym>[\w]+)/$', main_view, name='continuing_education_home'),
     path('authentication/', include([
         path('login', common.login, name='continuing_education_login'),
         path('logout', common.log_out, name='continuing_education_logout'),
@@ -67,14 +81,14 @@ urlpatterns = [
         path('', include('django_registration.backends.activation.urls'))])),
     re_path(r'^admission_new/', admission.admission_form, name='admission_new'),
     re_path(r'^admission_edit/(?P<admission_uuid>[0-9a-f-]+)$', admission.admission_form, name='admission_edit'),
-    re_path(r'^admission_detail/(?P<admission_uuid>[0-9a-f-]+)$', admission.admission_detail, name='admission_detail'),
+    re_path(r'^admission_detail/(?P<admission_uuid>[0-9a-f-]+)$', admission_detail, name='admission_detail'),
     re_path(r'^admission_submit/', admission.admission_submit, name='admission_submit'),
     re_path(
         r'^registration_edit/(?P<admission_uuid>[0-9a-f-]+)$',
-        registration.registration_edit,
+        registration_edit,
         name='registration_edit'
     ),
-    re_path(r'^registration_detail/(?P<admission_uuid>[0-9a-f-]+)$', registration.registration_detail,
+    re_path(r'^registration_detail/(?P<admission_uuid>[0-9a-f-]+)$', registration_detail,
         name='registration_detail'),
     re_path(r'^registration_pdf/(?P<admission_uuid>[0-9a-f-]+)$', registration.generate_pdf_registration,
         name='registration_pdf'),
@@ -101,5 +115,6 @@ urlpatterns = [
         ContinuingEducationTrainingAutocomplete.as_view(),
         name='cetraining-autocomplete',
     ),
-    re_path(r'^ajax/formation/', admission.get_formation_information, name='get_formation_information')
+    re_path(r'^ajax/formation/', admission.get_formation_information, name='get_formation_information'),
+    path('monitoring/osis/', monitoring.osis_stats, name='osis_stats'),
 ]
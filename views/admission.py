@@ -35,21 +35,21 @@ from django.utils.safestring import mark_safe
 from django.utils.translation import gettext_lazy as _
 from django.views.decorators.http import require_http_methods, require_GET
 
-from base.models.person import Person
+from continuing_education.business import person_sync
 from continuing_education.forms.account import ContinuingEducationPersonForm
 from continuing_education.forms.address import AddressForm
 from continuing_education.forms.admission import AdmissionForm
 from continuing_education.forms.person import PersonForm
 from continuing_education.forms.registration import RegistrationForm
 from continuing_education.models.enums import admission_state_choices
+from continuing_education.services import country_cache, osis_fetch
 from continuing_education.views import api
 from continuing_education.views.api import get_continuing_education_training
 from continuing_education.views.common import display_errors, get_submission_errors, _show_submit_warning, \
     add_informations_message_on_submittable_file, add_contact_for_edit_message, display_info_messages
-from continuing_education.views.file import _get_files_list, FILES_URL
+from continuing_education.views.dossier import load_dossier
 from frontoffice.settings.base import MAX_UPLOAD_SIZE
 from osis_common.decorators.ajax import ajax_required
-from reference.services.country import CountryService
 
 STATES_CAN_UPLOAD_FILE = [
     admission_state_choices.DRAFT,
@@ -60,11 +60,13 @@ STATES_CAN_UPLOAD_FILE = [
 
 @login_required
 def admission_detail(request, admission_uuid):
-    try:
-        admission = api.get_admission(request, admission_uuid)
-        registration = api.get_registration(request, admission_uuid)
-    except Http404:
-        registration = api.get_registration(request, admission_uuid)
+    return render_admission_detail(request, admission_uuid, load_dossier(request, admission_uuid))
+
+
+def render_admission_detail(request, admission_uuid, dossier):
+    admission = dossier['admission']
+    registration = dossier['registration']
+    if admission is None:
         if registration and registration['state'] == admission_state_choices.ACCEPTED:
             return redirect(reverse('registration_detail',
                                     kwargs={'admission_uuid': admission_uuid if registration else ''}),
@@ -108,11 +110,7 @@ def admission_detail(request, admission_uuid):
             message=mark_safe(msg)
         )
 
-    list_files = _get_files_list(
-        request,
-        admission,
-        FILES_URL % {'admission_uuid': str(admission_uuid)}
-    )
+    list_files = dossier['files']
     return render(
         request,
         "admission_detail.html",
@@ -172,20 +170,26 @@ def _has_instance_with_values(instance):
 
 @login_required
 def admission_form(request, admission_uuid=None):
-    admission = _get_admission_or_403(admission_uuid, request)
-    formation = _get_formation(request, admission)
-    registration_required = formation.get('registration_required', False) if formation else True
-    address_form, adm_form, id_form, person_form = _fill_forms_with_existing_data(admission, formation, request)
+    return handle_admission_form(request, _load_admission_form_data(request, admission_uuid))
+
+
+def handle_admission_form(request, data):
+    admission = data['admission']
+    formation = data['formation']
+    registration_required = _is_registration_required(formation)
+    address_form, adm_form, id_form, person_form = _fill_forms_with_existing_data(
+        admission, formation, request, data['person_information'], data['old_admission']
+    )
     forms_valid = all([adm_form.is_valid(), person_form.is_valid(), address_form.is_valid(), id_form.is_valid()])
     billing_address_form, registration, registration_form, forms_valid = _get_billing_datas(
-        request, admission_uuid, forms_valid, registration_required
+        request, data['registration'], forms_valid
     )
 
     errors_fields = []
     if not admission and not request.POST:
         _show_save_before_submit(request)
 
-    errors_fields = _is_admission_submittable_and_show_errors(admission, errors_fields, request)
+    errors_fields = _is_admission_submittable_and_show_errors(admission, formation, errors_fields, request)
     if forms_valid:
         api.prepare_admission_data(
             request,
@@ -259,12 +263,47 @@ def _update_billing_informations(request, forms, registration, registration_requ
         api.update_registration(request, forms['registration'].cleaned_data)
 
 
-def _get_billing_datas(request, admission_uuid, forms_valid, registration_required):
-    registration = None
+def _load_admission_form_data(request, admission_uuid):
+    """
+    Fetch everything admission_form needs from OSIS, running independent calls concurrently:
+    admission -> formation -> registration on one side, person -> admissions -> old admission on the other.
+    """
+    return osis_fetch.run([
+        ('admission', osis_fetch.Fetch(lambda: _get_admission_or_403(admission_uuid, request))),
+        ('formation', osis_fetch.Fetch(
+            lambda admission: _get_formation(request, admission),
+            depends_on=['admission']
+        )),
+        ('person_information', osis_fetch.Fetch(lambda: api.get_continuing_education_person(request))),
+        ('old_admission', osis_fetch.Fetch(
+            lambda person_information: _get_old_admission_if_exists(
+                api.get_admission_list(request, person_information['uuid'], fields=('uuid',))['results'],
+                person_information,
+                request
+            ),
+            depends_on=['person_information']
+        )),
+        ('registration', osis_fetch.Fetch(
+            lambda formation: _get_billing_registration(request, admission_uuid, _is_registration_required(formation)),
+            depends_on=['formation']
+        )),
+    ])
+
+
+def _is_registration_required(formation):
+    return formation.get('registration_required', False) if formation else True
+
+
+def _get_billing_registration(request, admission_uuid, registration_required):
+    if not registration_required and admission_uuid:
+        return api.get_registration(request, admission_uuid)
+    return None
+
+
+def _get_billing_datas(request, registration, forms_valid):
     registration_form = RegistrationForm(request.POST or None, only_billing=True)
     billing_address_form = AddressForm(request.POST or None, prefix='billing')
-    if not registration_required and admission_uuid:
-        registration = api.get_registration(request, admission_uuid)
+    if registration:
         registration_form = RegistrationForm(request.POST or None, initial=registration, only_billing=True)
         billing_address_form = AddressForm(
             request.POST or None,
@@ -277,9 +316,13 @@ def _get_billing_datas(request, admission_uuid, forms_valid, registration_requir
 
 def _get_admission_or_403(admission_uuid, request):
     admission = api.get_admission(request, admission_uuid) if admission_uuid else None
+    check_admission_editable(admission)
+    return admission
+
+
+def check_admission_editable(admission):
     if admission and admission['state'] != admission_state_choices.DRAFT:
         raise PermissionDenied
-    return admission
 
 
 def _get_formation(request, admission=None):
@@ -294,9 +337,9 @@ def _get_formation(request, admission=None):
         return api.get_continuing_education_training(request, acronym)
 
 
-def _is_admission_submittable_and_show_errors(admission, errors_fields, request):
+def _is_admission_submittable_and_show_errors(admission, formation, errors_fields, request):
     if admission and not request.POST:
-        admission['formation_info'] = _get_formation(request, admission)
+        admission['formation_info'] = formation
         admission_submission_errors, errors_fields = get_submission_errors(admission)
         admission_is_submittable = not admission_submission_errors
         if not admission_is_submittable:
@@ -304,13 +347,8 @@ def _is_admission_submittable_and_show_errors(admission, errors_fields, request)
     return errors_fields
 
 
-def _fill_forms_with_existing_data(admission, formation, request):
-    person_information = api.get_continuing_education_person(request)
-    person_information.get('person').pop('uuid')
-    # exclude person birth_date field as it is not in osis-portal Person model
-    person_information.get('person').pop('birth_date')
-    Person.objects.filter(user=request.user).update(**person_information.get('person'))
-    base_person = Person.objects.get(user=request.user)
+def _fill_forms_with_existing_data(admission, formation, request, person_information, old_admission):
+    base_person = person_sync.sync_person(request.user, person_information.get('person'))
     person_form = ContinuingEducationPersonForm(
         request.POST or None,
         initial=person_information if _has_instance_with_values(person_information) else None
@@ -324,8 +362,6 @@ def _fill_forms_with_existing_data(admission, formation, request):
         instance=base_person,
         no_first_name_checked=request.POST.get('no_first_name', False)
     )
-    admissions = api.get_admission_list(request, person_information['uuid'])['results']
-    old_admission = _get_old_admission_if_exists(admissions, person_information, request)
     current_address = admission['address'] if admission else None
     address = current_address if current_address else (old_admission['address'] if old_admission else None)
     address_form = AddressForm(request.POST or None, initial=address, person=request.user.person)
@@ -335,17 +371,15 @@ def _fill_forms_with_existing_data(admission, formation, request):
 def _keep_posted_data_in_form(adm_form, person_form, request):
     birth_country = request.POST.get('birth_country')
     if birth_country:
-        country = CountryService.get_countries(person=request.user.person, iso_code=birth_country).results[0]
         person_form.fields['birth_country'].initial = birth_country
         person_form.fields['birth_country'].choices = [
-            (country.iso_code, country.name)
+            (birth_country, country_cache.get_country_name(request.user.person, birth_country) or birth_country)
         ]
     citizenship = request.POST.get('citizenship')
     if citizenship:
-        country = CountryService.get_countries(person=request.user.person, iso_code=citizenship).results[0]
         adm_form.fields['citizenship'].initial = citizenship
         adm_form.fields['citizenship'].choices = [
-            (country.iso_code, country.name)
+            (citizenship, country_cache.get_country_name(request.user.person, citizenship) or citizenship)
         ]
     training = request.POST.get('formation')
     if training:
@@ -357,7 +391,7 @@ def _keep_posted_data_in_form(adm_form, person_form, request):
 
 def _get_old_admission_if_exists(admissions, person_information, request):
     old_admission = admissions[0] if admissions \
-        else api.get_registration_list(request, person_information['uuid'])['results']
+        else api.get_registration_list(request, person_information['uuid'], fields=('uuid',))['results']
     if old_admission:
         if admissions:
             old_admission = api.get_admission(request, old_admission['uuid'])
@@ -379,7 +413,9 @@ def _update_or_create_admission(adm_form, admission, request):
 @require_GET
 def get_formation_information(request):
     formation_acronym = request.GET.get('formation_acronym')
-    training = get_continuing_education_training(request, acronym=formation_acronym)
+    training = get_continuing_education_training(
+        request, acronym=formation_acronym, fields=('additional_information_label', 'registration_required')
+    )
     return JsonResponse(data={
         'additional_information_label': linebreaks(training.get('additional_information_label', '')),
         'registration_required': training.get('registration_required', True)
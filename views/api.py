@@ -23,32 +23,148 @@
 #    see http://www.gnu.org/licenses/.
 #
 ##############################################################################
-import io
-import json
+import functools
+from collections import OrderedDict
 
-import requests
 from django.conf import settings
 from django.core.exceptions import PermissionDenied
 from django.http import Http404
 
+from continuing_education.services import conditional_get, json_decoder, osis_http, single_flight, token_cache, \
+    training_cache
+
 REQUEST_HEADER = {'Authorization': 'Token ' + settings.OSIS_PORTAL_TOKEN}
 API_URL = settings.URL_CONTINUING_EDUCATION_FILE_API
 API_OBJECT_URL = API_URL + "%(object_name)s/%(object_uuid)s"
+# Objects that are the same for every user
+SHARED_OBJECTS = ('training',)
+# Responses kept on the request, so that a view reading the same resource twice only fetches it once
+REQUEST_MEMO_ATTRIBUTE = '_osis_responses'
+REQUEST_MEMO_SIZE = 50
+
+
+def get_data_from_osis(request, custom_path=None, fields=None, **kwargs):
+    """ Return the decoded response of OSIS, restricted to fields when they are given """
+    read = OsisRead(request, custom_path, fields, **kwargs)
+    data = read.remembered_data()
+    if data is None:
+        return read.remember(fetch_content_from_osis(read))
+    return data
 
 
-def get_data_from_osis(request, custom_path=None, **kwargs):
+class OsisRead:
+    """
+    A GET to OSIS made for a request: its url and params, the scope its response is shared in,
+    and the request memo keeping the responses already read. Used by the sync and async clients.
+    """
+
+    def __init__(self, request, custom_path=None, fields=None, **kwargs):
+        kwargs['params'] = with_projection(kwargs.get('params'), fields)
+        self.request = request
+        self.url = _build_api_request_url(custom_path, **kwargs)
+        self.params = kwargs['params']
+        # Set when the response does not depend on the user, who then shares it with other requests
+        self.shared_scope = _shared_response_scope(request, kwargs.get('object_name'))
+        self.store_key = response_store_key(
+            self.shared_scope or 'user:{}'.format(request.user.username), self.url, self.params
+        )
+        self._memo = request.__dict__.setdefault(REQUEST_MEMO_ATTRIBUTE, OrderedDict())
+        self._memo_key = single_flight.build_key(self.url, self.params)
+
+    def remembered_data(self):
+        """ The data already read during this request, or None """
+        content = self._memo.get(self._memo_key)
+        # The raw content is memoized: each caller decodes its own copy, which it is free to modify
+        return json_decoder.loads(content) if content is not None else None
+
+    def remember(self, content):
+        """ Decode content and keep it for the next identical read of this request """
+        # Decoded before being memoized, so that an invalid response is not kept
+        data = json_decoder.loads(content)
+        self._memo[self._memo_key] = content
+        while len(self._memo) > REQUEST_MEMO_SIZE:
+            self._memo.popitem(last=False)
+        return data
+
+
+def with_projection(params, fields):
+    if not fields:
+        return params
+    # Sorted, so that the same projection always gives the same query, hence the same cache entries
+    return dict(params or {}, fields=projection(fields))
+
+
+def projection(fields):
+    return ','.join(sorted(set(fields))) if fields else None
+
+
+def get_shared_data(custom_path=None, fields=None, **kwargs):
+    """
+    Same as get_data_from_osis for objects that are the same for every user, read with the portal token
+    and outside of any request: e.g. to refresh a cache once the response is sent.
+    """
+    kwargs['params'] = with_projection(kwargs.get('params'), fields)
     url = _build_api_request_url(custom_path, **kwargs)
-    response = requests.get(
-        url=url,
-        headers={'Authorization': 'Token ' + get_personal_token(request)} if request.user.is_authenticated
-        else REQUEST_HEADER,
-        params=kwargs.get('params')
+    params = kwargs['params']
+    return json_decoder.loads(single_flight.do(
+        single_flight.build_key('catalog', url, params),
+        lambda: _get_content_with_headers(url, params, response_store_key('catalog', url, params), REQUEST_HEADER)
+    ))
+
+
+def forget_request_data(request):
+    """ Drop the responses read during this request, e.g. once it changed data in OSIS """
+    request.__dict__.pop(REQUEST_MEMO_ATTRIBUTE, None)
+
+
+def fetch_content_from_osis(read):
+    if read.shared_scope is None:
+        return _get_content(read)
+    # Identical requests whose response does not depend on the user share a single call to OSIS
+    return single_flight.do(
+        single_flight.build_key(read.shared_scope, read.url, read.params),
+        lambda: _get_content(read)
+    )
+
+
+def _shared_response_scope(request, object_name):
+    if object_name in SHARED_OBJECTS:
+        return 'catalog'
+    if not request.user.is_authenticated:
+        return 'portal'
+    return None
+
+
+def response_store_key(scope, url, params):
+    """ Key of the representation kept to revalidate a GET, which is never shared across auth scopes """
+    return single_flight.build_key('conditional_get', scope, url, params)
+
+
+def _get_content(read):
+    return _get_content_with_headers(read.url, read.params, read.store_key, get_request_header(read.request))
+
+
+def get_request_header(request):
+    if request.user.is_authenticated:
+        return {'Authorization': 'Token ' + get_personal_token(request)}
+    return REQUEST_HEADER
+
+
+def _get_content_with_headers(url, params, store_key, headers):
+    return conditional_get.get_content(
+        store_key,
+        lambda validators: osis_http.get(url=url, headers=dict(headers, **validators), params=params),
+        content_from_response
     )
+
+
+def content_from_response(response):
+    """ Content of a response to a GET, or the error it stands for """
     if response.status_code == 404:
         raise Http404
     elif response.status_code == 403:
         raise PermissionDenied(response.json()['detail'] if response.content else '')
-    return transform_response_to_data(response)
+    return response.content
 
 
 def _build_api_request_url(custom_path, **kwargs):
@@ -63,34 +179,91 @@ def _build_api_request_url(custom_path, **kwargs):
 
 
 def transform_response_to_data(response):
-    stream = io.BytesIO(response.content)
-    data = json.load(stream)
-    return data
+    return json_decoder.loads(response.content)
 
 
-def get_admission_list(request, person_uuid):
-    return get_data_from_osis(request, custom_path="persons/{}/admissions/".format(person_uuid))
+def get_admission_list(request, person_uuid, fields=None):
+    return get_data_from_osis(request, custom_path="persons/{}/admissions/".format(person_uuid), fields=fields)
 
 
-def get_registration_list(request, person_uuid):
-    return get_data_from_osis(request, custom_path="persons/{}/registrations/".format(person_uuid))
+def get_registration_list(request, person_uuid, fields=None):
+    return get_data_from_osis(request, custom_path="persons/{}/registrations/".format(person_uuid), fields=fields)
 
 
-def get_continuing_education_training_list(request, **kwargs):
-    return get_data_from_osis(request, object_name="training", params=kwargs)
+def get_registrations(request, **kwargs):
+    return get_data_from_osis(request, object_name="registrations", params=kwargs)
+
+
+def get_continuing_education_training_list(request, fields=None, **kwargs):
+    return training_cache.get_or_fetch(
+        training_cache.list_key(with_projection(kwargs, fields)),
+        lambda: _get_training_data(request, params=kwargs, fields=fields),
+        lambda: _get_training_data(None, params=kwargs, fields=fields)
+    )
+
+
+def fetch_continuing_education_training_list(**kwargs):
+    """ The trainings read from OSIS as shared data, bypassing the training cache """
+    return _get_training_data(None, params=kwargs)
 
 
 def get_continuing_education_person(request):
     return get_data_from_osis(request, custom_path="persons/details")
 
 
-def get_continuing_education_training_by_uuid(request, uuid):
-    return get_data_from_osis(request, object_name="training", uuid=uuid)
+def get_continuing_education_training_by_uuid(request, uuid, fields=None):
+    return training_cache.get_or_fetch(
+        training_cache.uuid_key(uuid, projection(fields)),
+        lambda: _get_training_data(request, uuid=uuid, fields=fields),
+        lambda: _get_training_data(None, uuid=uuid, fields=fields)
+    )
+
+
+def get_continuing_education_training(request, acronym, fields=None):
+    return training_cache.get_or_fetch(
+        training_cache.acronym_key(acronym, projection(fields)),
+        lambda: _get_first_training_with_acronym(request, acronym, fields),
+        lambda: _get_first_training_with_acronym(None, acronym, fields)
+    )
+
+
+def get_trainings_by_acronyms(request, acronyms):
+    """ Return a dict acronym -> training (None when not found), fetching only what is not cached yet """
+    keys = {acronym: training_cache.acronym_key(acronym) for acronym in acronyms}
+    trainings = training_cache.get_many_or_fetch(
+        {key: functools.partial(_get_first_training_with_acronym, request, acronym) for acronym, key in keys.items()},
+        {key: functools.partial(_get_first_training_with_acronym, None, acronym) for acronym, key in keys.items()}
+    )
+    return {acronym: trainings[key] for acronym, key in keys.items()}
+
+
+def get_trainings_by_uuids(request, uuids):
+    """ Return a dict uuid -> training (None when not found), fetching only what is not cached yet """
+    keys = {uuid: training_cache.uuid_key(uuid) for uuid in uuids}
+    trainings = training_cache.get_many_or_fetch(
+        {key: functools.partial(_get_training_by_uuid_or_none, request, uuid) for uuid, key in keys.items()},
+        {key: functools.partial(_get_training_by_uuid_or_none, None, uuid) for uuid, key in keys.items()}
+    )
+    return {uuid: trainings[key] for uuid, key in keys.items()}
+
+
+def _get_training_data(request, **kwargs):
+    # Without a request (a cache refreshed in the background), trainings are read as shared data
+    if request is None:
+        return get_shared_data(object_name="training", **kwargs)
+    return get_data_from_osis(request, object_name="training", **kwargs)
+
+
+def _get_training_by_uuid_or_none(request, uuid):
+    try:
+        return _get_training_data(request, uuid=uuid)
+    except Http404:
+        return None
 
 
-def get_continuing_education_training(request, acronym):
+def _get_first_training_with_acronym(request, acronym, fields=None):
     # get first filtered value when requesting training with its acronym
-    response = get_continuing_education_training_list(request, acronym=acronym)
+    response = _get_training_data(request, params={'acronym': acronym}, fields=fields)
     results = response.get('results')
     return results[0] if results else None
 
@@ -105,7 +278,8 @@ def get_registration(request, uuid):
 
 def post_data_to_osis(request, object_name, object_to_post):
     token = get_personal_token(request)
-    response = requests.post(
+    forget_request_data(request)
+    response = osis_http.post(
         url=API_OBJECT_URL % {'object_name': object_name, 'object_uuid': ''},
         headers=REQUEST_HEADER if object_name == 'prospects' else {'Authorization': 'Token ' + token},
         json=object_to_post
@@ -128,7 +302,8 @@ def post_admission(request, object_to_post):
 
 def update_data_to_osis(request, object_name, object_to_update):
     token = get_personal_token(request)
-    response = requests.patch(
+    forget_request_data(request)
+    response = osis_http.patch(
         url=API_OBJECT_URL % {'object_name': object_name, 'object_uuid': object_to_update['uuid']},
         headers={'Authorization': 'Token ' + token},
         json=object_to_update,
@@ -194,13 +369,14 @@ def prepare_registration_for_submit(registration):
 
 
 def get_token_from_osis(username, force_user_creation=False):
-    response = requests.post(
+    response = osis_http.post(
         url=settings.URL_AUTH_API,
         headers=REQUEST_HEADER,
         data={
             'username': username,
             'force_user_creation': force_user_creation
-        }
+        },
+        operation=osis_http.TOKEN
     )
     if response.status_code == 200:
         return response.json()['token']
@@ -210,5 +386,9 @@ def get_token_from_osis(username, force_user_creation=False):
 
 def get_personal_token(request):
     if not request.session.get('personal_token'):
-        request.session['personal_token'] = get_token_from_osis(request.user.username, force_user_creation=True)
+        username = request.user.username
+        request.session['personal_token'] = token_cache.get_token(
+            username,
+            lambda: get_token_from_osis(username, force_user_creation=True)
+        )
     return request.session['personal_token']
@@ -0,0 +1,83 @@
+##############################################################################
+#
+#    OSIS stands for Open Student Information System. It's an application
+#    designed to manage the core business of higher education institutions,
+#    such as universities, faculties, institutes and professional schools.
+#    The core business involves the administration of students, teachers,
+#    courses, programs and so on.
+#
+#    Copyright (C) 2015-2018 Université catholique de Louvain (http://www.uclouvain.be)
+#
+#    This program is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    A copy of this license - GNU General Public License - is available
+#    at the root of the source code of this program.  If not,
+#    see http://www.gnu.org/licenses/.
+#
+##############################################################################
+from asgiref.sync import sync_to_async
+
+from continuing_education.services import conditional_get, osis_async
+from continuing_education.views import api
+
+
+async def get_data_from_osis(request, custom_path=None, fields=None, **kwargs):
+    """ Async counterpart of api.get_data_from_osis, sharing its request memo """
+    read = api.OsisRead(request, custom_path, fields, **kwargs)
+    data = read.remembered_data()
+    if data is None:
+        return read.remember(await _fetch_content(read))
+    return data
+
+
+async def _fetch_content(read):
+    if read.shared_scope is not None:
+        # Coalesced with the identical reads of other requests, sync ones included, by the sync client
+        return await sync_to_async(api.fetch_content_from_osis)(read)
+    stored = conditional_get.lookup(read.store_key)
+    response = await osis_async.get(
+        url=read.url,
+        headers=dict(await get_request_header(read.request), **conditional_get.validators(stored)),
+        params=read.params
+    )
+    return conditional_get.resolve(read.store_key, stored, response, api.content_from_response)
+
+
+async def get_request_header(request):
+    # The token may have to be read from the session or fetched from OSIS: both are blocking
+    return await sync_to_async(api.get_request_header)(request)
+
+
+async def get_admission(request, uuid):
+    return await get_data_from_osis(request, object_name="admissions", uuid=uuid)
+
+
+async def get_registration(request, uuid):
+    return await get_data_from_osis(request, object_name="registrations", uuid=uuid)
+
+
+async def get_admission_list(request, person_uuid, fields=None):
+    return await get_data_from_osis(request, custom_path="persons/{}/admissions/".format(person_uuid), fields=fields)
+
+
+async def get_registration_list(request, person_uuid, fields=None):
+    return await get_data_from_osis(
+        request, custom_path="persons/{}/registrations/".format(person_uuid), fields=fields
+    )
+
+
+async def get_continuing_education_person(request):
+    return await get_data_from_osis(request, custom_path="persons/details")
+
+
+# Trainings are served from the shared training cache, whose misses are rare: they keep the sync client
+get_continuing_education_training = sync_to_async(api.get_continuing_education_training)
+get_continuing_education_training_list = sync_to_async(api.get_continuing_education_training_list)
@@ -0,0 +1,154 @@
+##############################################################################
+#
+#    OSIS stands for Open Student Information System. It's an application
+#    designed to manage the core business of higher education institutions,
+#    such as universities, faculties, institutes and professional schools.
+#    The core business involves the administration of students, teachers,
+#    courses, programs and so on.
+#
+#    Copyright (C) 2015-2018 Université catholique de Louvain (http://www.uclouvain.be)
+#
+#    This program is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    A copy of this license - GNU General Public License - is available
+#    at the root of the source code of this program.  If not,
+#    see http://www.gnu.org/licenses/.
+#
+##############################################################################
+import asyncio
+import functools
+
+import requests
+from asgiref.sync import sync_to_async
+from django.contrib.auth.views import redirect_to_login
+from django.http import Http404
+
+from continuing_education.services import osis_async
+from continuing_education.views import admission as admission_views, api_async, home, \
+    registration as registration_views
+from continuing_education.views.api import REQUEST_HEADER
+from continuing_education.views.dossier import complete_dossier
+from continuing_education.views.file import FILES_URL, _files_list_from_response
+
+# Async versions of the views that mostly wait for OSIS, served instead of the sync ones under ASGI
+# (CONTINUING_EDUCATION_ASYNC_VIEWS). Independent OSIS calls are awaited together; forms, database
+# and session work is left to the sync views, run in a thread. The admission form keeps its sync view,
+# whose chained OSIS calls already run concurrently (osis_fetch), so that they are defined only once.
+
+
+def login_required(view):
+    @functools.wraps(view)
+    async def wrapper(request, *args, **kwargs):
+        if not await _is_authenticated(request):
+            return redirect_to_login(request.get_full_path())
+        return await view(request, *args, **kwargs)
+    return wrapper
+
+
+@sync_to_async
+def _is_authenticated(request):
+    # The user is loaded from the database here, once: the event loop can then read it
+    return request.user.is_authenticated
+
+
+async def gather(*aws):
+    """
+    Await aws concurrently and return their results.
+    If several fail, the error of the first one (in order) is raised, as osis_fetch.run does.
+    """
+    results = await asyncio.gather(*aws, return_exceptions=True)
+    for result in results:
+        if isinstance(result, Exception):
+            raise result
+    return results
+
+
+async def load_dossier(request, admission_uuid, with_admission=True):
+    if not with_admission:
+        registration, files = await gather(
+            api_async.get_registration(request, admission_uuid),
+            _fetch_files_list_or_none(admission_uuid),
+        )
+        return complete_dossier(request, {'registration': registration, 'files': files})
+    (admission, files), registration = await gather(
+        _get_admission_and_files(request, admission_uuid),
+        api_async.get_registration(request, admission_uuid),
+    )
+    return complete_dossier(request, {'admission': admission, 'registration': registration, 'files': files})
+
+
+async def _get_admission_and_files(request, admission_uuid):
+    # The files are only rendered with an admission
+    admission = await _get_admission_or_none(request, admission_uuid)
+    if admission is None:
+        return None, []
+    return admission, await _fetch_files_list_or_none(admission_uuid)
+
+
+async def _get_admission_or_none(request, admission_uuid):
+    try:
+        return await api_async.get_admission(request, admission_uuid)
+    except Http404:
+        return None
+
+
+async def _fetch_files_list_or_none(admission_uuid):
+    try:
+        response = await osis_async.get(
+            url=FILES_URL % {'admission_uuid': str(admission_uuid)},
+            headers=REQUEST_HEADER,
+        )
+    except (requests.exceptions.ConnectionError, requests.exceptions.Timeout):
+        return None
+    return _files_list_from_response(response)
+
+
+@login_required
+async def admission_detail(request, admission_uuid):
+    dossier = await load_dossier(request, admission_uuid)
+    return await sync_to_async(admission_views.render_admission_detail)(request, admission_uuid, dossier)
+
+
+@login_required
+async def registration_detail(request, admission_uuid):
+    dossier = await load_dossier(request, admission_uuid, with_admission=False)
+    return await sync_to_async(registration_views.render_registration_detail)(request, admission_uuid, dossier)
+
+
+@login_required
+async def registration_edit(request, admission_uuid):
+    registration, person_information = await gather(
+        api_async.get_registration(request, admission_uuid),
+        api_async.get_continuing_education_person(request),
+    )
+    registration_views.check_registration_editable(registration)
+    return await sync_to_async(registration_views.handle_registration_edit)(
+        request, admission_uuid, registration, person_information
+    )
+
+
+async def main_view(request, acronym=None):
+    if not await _is_authenticated(request):
+        return await sync_to_async(home.main_view)(request, acronym)
+    person_information = await api_async.get_continuing_education_person(request)
+    admissions, registrations = await gather(
+        api_async.get_admission_list(request, person_information['uuid'], fields=home.DOSSIER_LIST_FIELDS),
+        api_async.get_registration_list(request, person_information['uuid'], fields=home.DOSSIER_LIST_FIELDS),
+    )
+    return await sync_to_async(_render_home)(
+        request, acronym, person_information, admissions['results'], registrations['results']
+    )
+
+
+def _render_home(request, acronym, *args):
+    if acronym:
+        request.session['acronym'] = acronym
+    return home.render_home(request, acronym, *args)
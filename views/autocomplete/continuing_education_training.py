@@ -3,24 +3,32 @@ import json
 from dal import autocomplete
 from django import http
 
+from continuing_education.business import training_index
 from continuing_education.views.api import get_continuing_education_training_list
 
 
 class ContinuingEducationTrainingAutocomplete(autocomplete.Select2ListView):
 
     def get(self, request, *args, **kwargs):
-        return http.HttpResponse(json.dumps({
-            'results': [
-                {
-                    'id': training['education_group']['acronym'],
-                    'text': "{} - {}".format(
-                        training['education_group']['acronym'], training['education_group']['title']
-                    )
-                }
-                for training in get_continuing_education_training_list(
-                    request,
-                    search=self.q,
-                    active=True
-                )['results']
-            ]
-        }), content_type='application/json')
+        trainings = training_index.search(self.q)
+        if trainings is None:
+            trainings = get_continuing_education_training_list(
+                request,
+                search=self.q,
+                active=True
+            )['results']
+        return trainings_response(trainings)
+
+
+def trainings_response(trainings):
+    return http.HttpResponse(json.dumps({
+        'results': [
+            {
+                'id': training['education_group']['acronym'],
+                'text': "{} - {}".format(
+                    training['education_group']['acronym'], training['education_group']['title']
+                )
+            }
+            for training in trainings
+        ]
+    }), content_type='application/json')
@@ -36,6 +36,7 @@ from django.utils.translation import gettext, gettext_lazy as _
 from base.models.person import Person
 from base.views import layout
 from base.views.layout import render
+from continuing_education.business import submission_check
 from continuing_education.forms.account import ContinuingEducationPersonForm
 from continuing_education.forms.address import StrictAddressForm
 from continuing_education.forms.admission import StrictAdmissionForm
@@ -120,51 +121,44 @@ def display_messages(request, messages_to_display, level, extra_tags=None):
 
 
 def get_submission_errors(admission, is_registration=False):
+    return submission_check.get_or_check(
+        admission,
+        is_registration,
+        lambda: _check_submission(admission, is_registration)
+    )
+
+
+def _check_submission(admission, is_registration):
     errors_field = []
     errors = OrderedDict()
 
     if is_registration:
-
-        address_form = StrictAddressForm(
-            data=admission['billing_address']
-        )
-        adm_form = StrictRegistrationForm(
-            data=admission
-        )
-
-        _update_errors([address_form, adm_form], errors, errors_field)
-
+        checks = [
+            (StrictAddressForm, admission['billing_address']),
+            (StrictRegistrationForm, admission),
+        ]
         if not admission['use_address_for_post']:
-            residence_address_form = StrictAddressForm(
-                data=admission['residence_address']
-            )
-            _update_errors([residence_address_form], errors, errors_field)
+            checks.append((StrictAddressForm, admission['residence_address']))
     else:
-        person_form = StrictPersonForm(
-            data=admission['person_information']['person'] if 'person' in admission['person_information'] else None
-        )
-        person_information_form = ContinuingEducationPersonForm(
-            data=admission['person_information']
-        )
-        address_form = StrictAddressForm(
-            data=admission['address']
-        )
-        adm_form = StrictAdmissionForm(
-            data=admission,
-        )
-        forms = [person_form, person_information_form, address_form, adm_form]
-        _update_errors(forms, errors, errors_field)
+        checks = [
+            (
+                StrictPersonForm,
+                admission['person_information']['person'] if 'person' in admission['person_information'] else None
+            ),
+            (ContinuingEducationPersonForm, admission['person_information']),
+            (StrictAddressForm, admission['address']),
+            (StrictAdmissionForm, admission),
+        ]
+    for form_class, data in checks:
+        # The rules of the Strict* forms, checked against the dict without building a form each time
+        rules = submission_check.get_rules(form_class, data)
+        for field, field_errors in rules.check(data).items():
+            errors.update({rules.labels[field]: field_errors})
+            errors_field.append(field)
 
     return errors, errors_field
 
 
-def _update_errors(forms, errors, errors_field):
-    for form in forms:
-        for field in form.errors:
-            errors.update({form[field].label: form.errors[field]})
-            errors_field.append(field)
-
-
 def _build_warning_from_errors_dict(errors):
     warning_message = gettext(
         "Your file is not submittable because you did not provide the following data : "
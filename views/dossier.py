@@ -0,0 +1,77 @@
+##############################################################################
+#
+#    OSIS stands for Open Student Information System. It's an application
+#    designed to manage the core business of higher education institutions,
+#    such as universities, faculties, institutes and professional schools.
+#    The core business involves the administration of students, teachers,
+#    courses, programs and so on.
+#
+#    Copyright (C) 2015-2018 Université catholique de Louvain (http://www.uclouvain.be)
+#
+#    This program is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    A copy of this license - GNU General Public License - is available
+#    at the root of the source code of this program.  If not,
+#    see http://www.gnu.org/licenses/.
+#
+##############################################################################
+import requests
+from django.http import Http404
+from django.utils.translation import gettext_lazy as _
+
+from continuing_education.services import osis_fetch
+from continuing_education.services.osis_fetch import Fetch
+from continuing_education.views import api
+from continuing_education.views.common import display_error_messages
+from continuing_education.views.file import FILES_URL, _fetch_files_list, _set_files_deletable
+
+
+def load_dossier(request, admission_uuid, with_admission=True):
+    """
+    Fetch the admission, the registration and the files of a dossier at once.
+    'admission' is None when OSIS has no admission for this uuid, any other error is raised as usual.
+    The files are only fetched once the admission is known to exist, as the detail is not rendered otherwise.
+    """
+    if not with_admission:
+        return complete_dossier(request, osis_fetch.run([
+            ('registration', Fetch(lambda: api.get_registration(request, admission_uuid))),
+            ('files', Fetch(lambda: _fetch_files_list_or_none(admission_uuid))),
+        ]))
+    return complete_dossier(request, osis_fetch.run([
+        ('admission', Fetch(lambda: _get_admission_or_none(request, admission_uuid))),
+        ('registration', Fetch(lambda: api.get_registration(request, admission_uuid))),
+        ('files', Fetch(
+            lambda admission: _fetch_files_list_or_none(admission_uuid) if admission is not None else [],
+            depends_on=('admission',)
+        )),
+    ]))
+
+
+def complete_dossier(request, dossier):
+    if dossier['files'] is None:
+        display_error_messages(request, _('An unexpected error occurred'))
+        dossier['files'] = []
+    _set_files_deletable(dossier.get('admission') or dossier['registration'], dossier['files'])
+    return dossier
+
+
+def _get_admission_or_none(request, admission_uuid):
+    try:
+        return api.get_admission(request, admission_uuid)
+    except Http404:
+        return None
+
+
+def _fetch_files_list_or_none(admission_uuid):
+    try:
+        return _fetch_files_list(FILES_URL % {'admission_uuid': str(admission_uuid)})
+    except (requests.exceptions.ConnectionError, requests.exceptions.Timeout):
+        return None
@@ -23,30 +23,36 @@
 #    see http://www.gnu.org/licenses/.
 #
 ##############################################################################
-import base64
-import io
-import json
 from mimetypes import MimeTypes
 
-import requests
 from dateutil import parser
 from django.conf import settings
 from django.contrib.auth.decorators import login_required
 from django.http import Http404
-from django.http import HttpResponse
+from django.http import HttpResponse, StreamingHttpResponse
 from django.shortcuts import redirect
+from django.template.defaultfilters import filesizeformat
 from django.utils.text import get_valid_filename
 from django.utils.translation import gettext_lazy as _
+from django.views.decorators.csrf import csrf_exempt, csrf_protect
 
+from continuing_education.business.file_download import FileDownload
+from continuing_education.services import json_decoder, osis_http
+from continuing_education.services.upload_relay import OsisRelayUploadHandler, MULTIPART_OVERHEAD
 from continuing_education.views.api import REQUEST_HEADER, get_admission, get_registration
 from continuing_education.views.common import display_error_messages, display_success_messages
+from frontoffice.settings.base import MAX_UPLOAD_SIZE
 
 FILES_URL = settings.URL_CONTINUING_EDUCATION_FILE_API + "admissions/%(admission_uuid)s/files/"
 
 
 @login_required
+@csrf_exempt
 def upload_file(request, admission_uuid):
-    admission_file = request.FILES['myfile'] if 'myfile' in request.FILES else None
+    # The upload handlers must be replaced before anything reads the request body, the CSRF check included:
+    # the check is done afterwards, by the csrf_protect view below
+    if int(request.META.get('CONTENT_LENGTH') or 0) > MAX_UPLOAD_SIZE + MULTIPART_OVERHEAD:
+        return _refuse_too_large_file(request)
     try:
         admission = get_admission(request, admission_uuid)
     except Http404:
@@ -55,45 +61,78 @@ def upload_file(request, admission_uuid):
     data = {
         'uploaded_by': person['uuid'],
     }
-    request_to_upload = requests.post(
-        FILES_URL % {'admission_uuid': str(admission_uuid)},
+    upload_handler = OsisRelayUploadHandler(
+        request,
+        url=FILES_URL % {'admission_uuid': str(admission_uuid)},
         headers=REQUEST_HEADER,
-        files={'path': admission_file},
-        data=data
+        fields=data,
+        file_field='myfile',
+        osis_file_field='path',
+        max_size=MAX_UPLOAD_SIZE
     )
-
-    if request_to_upload.status_code == 201:
+    request.upload_handlers = [upload_handler]
+    try:
+        return _relay_uploaded_file(request, upload_handler)
+    finally:
+        if not upload_handler.completed:
+            upload_handler.upload_interrupted()
+
+
+@csrf_protect
+def _relay_uploaded_file(request, upload_handler):
+    request.POST
+    upload_handler.complete()
+    if upload_handler.too_large:
+        return _refuse_too_large_file(request)
+
+    relay = upload_handler.relay
+    request_to_upload = relay.response if relay else None
+    if request_to_upload is not None and request_to_upload.status_code == 201:
         display_success_messages(request, _("The document is uploaded correctly"))
-    else:
+    elif request_to_upload is not None:
         display_error_messages(request, request_to_upload.json())
+    else:
+        display_error_messages(request, _('An unexpected error occurred'))
 
     return redirect(request.headers.get('referer') + '#documents')
 
 
+def _refuse_too_large_file(request):
+    display_error_messages(
+        request,
+        _("File is too large: maximum upload size allowed is %(max_size)s.") % {
+            'max_size': filesizeformat(MAX_UPLOAD_SIZE)
+        }
+    )
+    return redirect(request.headers.get('referer') + '#documents')
+
+
 @login_required
 def download_file(request, file_uuid, admission_uuid):
-    request_to_get = requests.get(
+    request_to_get = osis_http.get(
         FILES_URL % {'admission_uuid': str(admission_uuid)} + str(file_uuid),
-        headers=REQUEST_HEADER
+        headers=REQUEST_HEADER,
+        operation=osis_http.FILE,
+        stream=True
     )
     if request_to_get.status_code == 200:
-        stream = io.BytesIO(request_to_get.content)
-        admission_file = json.load(stream)
-        name = get_valid_filename(admission_file['name'])
-        mime_type = MimeTypes().guess_type(admission_file['name'])
-        response_file = base64.b64decode(admission_file['content'])
-        response = HttpResponse(response_file, mime_type)
+        admission_file = FileDownload(request_to_get)
+        name = get_valid_filename(admission_file.name)
+        mime_type, encoding = MimeTypes().guess_type(admission_file.name)
+        response = StreamingHttpResponse(admission_file.iter_content(), mime_type or 'application/octet-stream')
         response['Content-Disposition'] = "attachment; filename=%s" % name
         return response
     else:
+        request_to_get.close()
         return HttpResponse(status=404)
 
 
 @login_required
 def remove_file(request, file_uuid, admission_uuid):
-    request_to_delete = requests.delete(
+    request_to_delete = osis_http.delete(
         FILES_URL % {'admission_uuid': str(admission_uuid)} + str(file_uuid),
-        headers=REQUEST_HEADER
+        headers=REQUEST_HEADER,
+        operation=osis_http.FILE
     )
 
     if request_to_delete.status_code == 204:
@@ -103,26 +142,31 @@ def remove_file(request, file_uuid, admission_uuid):
     return redirect(request.headers.get('referer') + '#documents')
 
 
-def _get_files_list(request, admission, url_continuing_education_file_api):
+def _fetch_files_list(url_continuing_education_file_api):
     """
     Get files list of an admission with OSIS IUFC API
     """
+    response = osis_http.get(
+        url=url_continuing_education_file_api,
+        headers=REQUEST_HEADER,
+    )
+    return _files_list_from_response(response)
+
+
+def _files_list_from_response(response):
     files_list = []
-    try:
-        response = requests.get(
-            url=url_continuing_education_file_api,
-            headers=REQUEST_HEADER,
-        )
-        if response.status_code == 200:
-            stream = io.BytesIO(response.content)
-            files_list = json.load(stream)['results']
-            for file in files_list:
-                file['created_date'] = parser.parse(
-                    file['created_date']
-                )
-                file['is_deletable'] = _is_file_uploaded_by_admission_person(admission, file)
-    except requests.exceptions.ConnectionError:
-        display_error_messages(request, _('An unexpected error occurred'))
+    if response.status_code == 200:
+        files_list = json_decoder.loads(response.content)['results']
+        for file in files_list:
+            file['created_date'] = parser.parse(
+                file['created_date']
+            )
+    return files_list
+
+
+def _set_files_deletable(admission, files_list):
+    for file in files_list:
+        file['is_deletable'] = _is_file_uploaded_by_admission_person(admission, file)
     return files_list
 
 
@@ -32,6 +32,9 @@ from base.models import person as mdl_person
 from continuing_education.views import api
 from osis_common.middlewares.locale import LANGUAGE_SESSION_KEY
 
+# Fields of the admissions and registrations listed on the home page
+DOSSIER_LIST_FIELDS = ('uuid', 'state', 'formation')
+
 
 def formations_list(request):
     limit = 10
@@ -60,19 +63,29 @@ def main_view(request, acronym=None):
         request.session['acronym'] = acronym
     if request.user.is_authenticated:
         api.get_personal_token(request)
-        person = mdl_person.find_by_user(request.user)
-
         person_information = api.get_continuing_education_person(request)
-        admissions = api.get_admission_list(request, person_information['uuid'])['results']
-        registrations = api.get_registration_list(request, person_information['uuid'])['results']
-
-        return render(request, "continuing_education/home.html", locals())
+        return render_home(
+            request,
+            acronym,
+            person_information,
+            api.get_admission_list(request, person_information['uuid'], fields=DOSSIER_LIST_FIELDS)['results'],
+            api.get_registration_list(request, person_information['uuid'], fields=DOSSIER_LIST_FIELDS)['results']
+        )
     else:
-        if acronym:
-            training = api.get_continuing_education_training(request, acronym=acronym)
-            if not training['active']:
-                return redirect(reverse('prospect_form', kwargs={'acronym': acronym}))
-        return render(request, "authentication/login.html")
+        return render_login(request, acronym)
+
+
+def render_home(request, acronym, person_information, admissions, registrations):
+    person = mdl_person.find_by_user(request.user)
+    return render(request, "continuing_education/home.html", locals())
+
+
+def render_login(request, acronym):
+    if acronym:
+        training = api.get_continuing_education_training(request, acronym=acronym, fields=('active',))
+        if not training['active']:
+            return redirect(reverse('prospect_form', kwargs={'acronym': acronym}))
+    return render(request, "authentication/login.html")
 
 
 def set_language(request, ui_language):
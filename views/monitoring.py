@@ -0,0 +1,50 @@
+##############################################################################
+#
+#    OSIS stands for Open Student Information System. It's an application
+#    designed to manage the core business of higher education institutions,
+#    such as universities, faculties, institutes and professional schools.
+#    The core business involves the administration of students, teachers,
+#    courses, programs and so on.
+#
+#    Copyright (C) 2015-2018 Université catholique de Louvain (http://www.uclouvain.be)
+#
+#    This program is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    A copy of this license - GNU General Public License - is available
+#    at the root of the source code of this program.  If not,
+#    see http://www.gnu.org/licenses/.
+#
+##############################################################################
+from django.contrib.auth.decorators import user_passes_test
+from django.http import JsonResponse
+from django.views.decorators.http import require_GET
+
+from continuing_education.business import person_sync, postal_code_index, submission_check, training_index
+from continuing_education.services import conditional_get, osis_http, pdf_cache, single_flight, token_cache, \
+    training_cache, upload_relay
+
+
+@require_GET
+@user_passes_test(lambda user: user.is_staff)
+def osis_stats(request):
+    return JsonResponse(data={
+        'http_pool': osis_http.get_pool_stats(),
+        'training_cache': training_cache.get_stats(),
+        'training_index': training_index.get_stats(),
+        'uploads': upload_relay.get_stats(),
+        'registration_pdf': pdf_cache.get_stats(),
+        'tokens': token_cache.get_stats(),
+        'single_flight': single_flight.get_stats(),
+        'postal_codes': postal_code_index.get_stats(),
+        'submission_check': submission_check.get_stats(),
+        'person_sync': person_sync.get_stats(),
+        'conditional_get': conditional_get.get_stats(),
+    })
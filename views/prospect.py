@@ -10,7 +10,7 @@ from continuing_education.views.common import display_success_messages
 def prospect_form(request, acronym=None):
     cet = None
     if acronym:
-        cet = api.get_continuing_education_training(request, acronym)
+        cet = api.get_continuing_education_training(request, acronym, fields=('uuid', 'education_group'))
     form = ProspectForm(request.POST or None, ce_training=cet)
 
     if form.is_valid():
@@ -27,33 +27,40 @@ import itertools
 
 from django.contrib.auth.decorators import login_required
 from django.core.exceptions import PermissionDenied
-from django.http import HttpResponse
+from django.http import HttpResponse, HttpResponseNotModified
 from django.shortcuts import render, redirect
 from django.urls import reverse
+from django.utils.http import parse_etags
 from django.utils.text import get_valid_filename
 from django.utils.translation import gettext_lazy as _
 from django.views.decorators.http import require_http_methods
 
-from base.models import person as mdl_person
-from base.models.person import Person
 from base.views import common
-from continuing_education.business.pdf_filler import write_fillable_pdf, get_data
+from continuing_education.business import person_sync
+from continuing_education.business.pdf_filler import get_data
 from continuing_education.forms.account import ContinuingEducationPersonForm
 from continuing_education.forms.address import AddressForm
 from continuing_education.forms.person import PersonForm
 from continuing_education.forms.registration import RegistrationForm
 from continuing_education.models.enums import admission_state_choices
 from continuing_education.models.enums.admission_state_choices import REGISTRATION_SUBMITTED
+from continuing_education.services import pdf_cache
 from continuing_education.views import api
 from continuing_education.views.common import display_errors, get_submission_errors, _show_submit_warning, \
     add_informations_message_on_submittable_file, add_contact_for_edit_message, \
     add_remaining_tasks_message, format_formation_address
-from continuing_education.views.file import _get_files_list, FILES_URL
+from continuing_education.views.dossier import load_dossier
 
 
 @login_required
 def registration_detail(request, admission_uuid):
-    admission = api.get_registration(request, admission_uuid)
+    return render_registration_detail(
+        request, admission_uuid, load_dossier(request, admission_uuid, with_admission=False)
+    )
+
+
+def render_registration_detail(request, admission_uuid, dossier):
+    admission = dossier['registration']
     if admission['state'] == admission_state_choices.REGISTRATION_SUBMITTED:
         add_remaining_tasks_message(request, admission['formation'])
         add_contact_for_edit_message(request, formation=admission['formation'], is_registration=True)
@@ -68,11 +75,7 @@ def registration_detail(request, admission_uuid):
             _show_submit_warning(registration_submission_errors, request)
     else:
         registration_is_submittable = False
-    list_files = _get_files_list(
-        request,
-        admission,
-        FILES_URL % {'admission_uuid': str(admission_uuid)}
-    )
+    list_files = dossier['files']
     is_accepted = admission['state'] == admission_state_choices.ACCEPTED
     is_registration_submitted = admission['state'] == admission_state_choices.REGISTRATION_SUBMITTED
     can_upload = is_accepted
@@ -98,9 +101,18 @@ def registration_submit(request):
 @login_required
 def registration_edit(request, admission_uuid):
     registration = api.get_registration(request, admission_uuid)
+    check_registration_editable(registration)
+    return handle_registration_edit(
+        request, admission_uuid, registration, api.get_continuing_education_person(request)
+    )
+
+
+def check_registration_editable(registration):
     if registration and registration['state'] != admission_state_choices.ACCEPTED:
         raise PermissionDenied
 
+
+def handle_registration_edit(request, admission_uuid, registration, person_information):
     form = RegistrationForm(request.POST or None, initial=registration)
     billing_address_form = AddressForm(request.POST or None, initial=registration['billing_address'], prefix="billing")
     residence_address_form = AddressForm(
@@ -108,14 +120,8 @@ def registration_edit(request, admission_uuid):
         initial=registration['residence_address'],
         prefix="residence"
     )
-    person_information = api.get_continuing_education_person(request)
-    person_information.get('person').pop('uuid')
-    # exclude person birth_date field as it is not in osis-portal Person model
-    person_information.get('person').pop('birth_date')
-    Person.objects.filter(user=request.user).update(**person_information.get('person'))
-    base_person = mdl_person.find_by_user(user=request.user)
+    base_person = person_sync.sync_person(request.user, person_information.get('person'))
     id_form = PersonForm(request.POST or None, instance=base_person)
-    person_information = api.get_continuing_education_person(request)
     person_form = ContinuingEducationPersonForm(request.POST or None, initial=person_information)
     address = registration['address']
 
@@ -165,12 +171,23 @@ def generate_pdf_registration(request, admission_uuid):
         admission['formation']['education_group']['acronym'])
     )
 
-    result = write_fillable_pdf(get_data(admission))
+    data = get_data(admission)
+    etag = pdf_cache.etag(data)
+    # A submitted registration no longer changes: the copy the browser already has is still valid
+    if_none_match = parse_etags(request.META.get('HTTP_IF_NONE_MATCH', ''))
+    if etag in if_none_match or '*' in if_none_match:
+        response = HttpResponseNotModified()
+        response['ETag'] = etag
+        return response
+
+    result = pdf_cache.get_or_render(data)
     if result:
         # Creating http response
         response = HttpResponse(content_type='application/pdf;')
         response['Content-Disposition'] = 'attachment; filename={}.pdf'.format(pdf_filename)
         response['Content-Transfer-Encoding'] = 'binary'
+        response['ETag'] = etag
+        response['Cache-Control'] = 'private, no-cache'
         response.write(result)
         return response
     else: